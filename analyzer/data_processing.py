@@ -1,7 +1,10 @@
 import pandas as pd
+import numpy as np
 import re
 import logging
 
+from utils.metrics import timed_stage
+
 _log = logging.getLogger(__name__)
 
 def timecode_to_seconds(timecode_str: str) -> float:
@@ -30,6 +33,11 @@ def timecode_to_seconds(timecode_str: str) -> float:
         _log.warning(f"Could not convert timecode '{timecode_str}' to seconds: {e}. Returning 0.")
         return 0.0
 
+@timed_stage(
+    "enrich",
+    input_size=lambda parsed_data, *args, **kwargs: len(parsed_data),
+    output_counts=lambda df: {"rows": len(df), "segments": df['Segment'].nunique() if 'Segment' in df.columns else 0}
+)
 def process_parsed_data(parsed_data: list[dict], nominal_durations: dict[int, int]) -> pd.DataFrame:
     """
     Processes raw parsed data to add calculated fields:
@@ -44,6 +52,16 @@ def process_parsed_data(parsed_data: list[dict], nominal_durations: dict[int, in
     if not parsed_data:
         return pd.DataFrame()
 
+    df = add_segment_durations(convert_parsed_rows(parsed_data), nominal_durations)
+    _log.info("Processed parsed data with TimeInSeconds, NumSpeakersInSegment, and nominal SegmentDuration.")
+    return df
+
+def convert_parsed_rows(parsed_data: list[dict]) -> pd.DataFrame:
+    """
+    The row-wise part of process_parsed_data: a DataFrame of the rows with the 'Timecode', 'Segment'
+    and 'Speaker' columns ensured and 'TimeInSeconds' added. The frames of consecutive row batches
+    can be concatenated and passed to add_segment_durations.
+    """
     df = pd.DataFrame(parsed_data)
 
     # Ensure 'Timecode', 'Segment', and 'Speaker' columns exist
@@ -56,27 +74,62 @@ def process_parsed_data(parsed_data: list[dict], nominal_durations: dict[int, in
 
     # Convert Timecode to seconds (kept for reference, not for duration calculation)
     df['TimeInSeconds'] = df['Timecode'].apply(timecode_to_seconds)
+    return df
 
+def add_segment_durations(df: pd.DataFrame, nominal_durations: dict[int, int]) -> pd.DataFrame:
+    """
+    The segment-wise part of process_parsed_data: sets 'NumSpeakersInSegment' and the nominal
+    'SegmentDuration' of every row from the whole frame, replacing earlier values.
+    """
     # Calculate number of unique speakers per segment
     # Group by 'Segment' and count unique non-empty speakers
     segment_speaker_counts = df[df['Speaker'] != ''].groupby('Segment')['Speaker'].nunique()
     df['NumSpeakersInSegment'] = df['Segment'].map(segment_speaker_counts).fillna(0).astype(int)
 
     # Calculate SegmentDuration based on nominal durations
-    # Apply nominal duration based on NumSpeakersInSegment
-    def get_nominal_duration(row):
-        num_speakers = row['NumSpeakersInSegment']
+    # Apply nominal duration based on NumSpeakersInSegment, looked up once per distinct speaker count
+    def get_nominal_duration(num_speakers):
         if num_speakers >= 5: # Use the 5+ speakers value
             return nominal_durations.get(5, 200) # Default to 200 if not found
         elif num_speakers > 0:
             return nominal_durations.get(num_speakers, 60) # Default to 60 for 1-4 if not found
         return 0 # No speakers, no duration
 
-    df['SegmentDuration'] = df.apply(get_nominal_duration, axis=1)
-    
-    _log.info("Processed parsed data with TimeInSeconds, NumSpeakersInSegment, and nominal SegmentDuration.")
+    duration_by_count = {num_speakers: get_nominal_duration(num_speakers) for num_speakers in df['NumSpeakersInSegment'].unique()}
+    df['SegmentDuration'] = df['NumSpeakersInSegment'].map(duration_by_count)
     return df
 
+@timed_stage("matrix", input_size=lambda df: len(df), output_counts=lambda matrix: {"speakers": matrix.shape[0], "segments": matrix.shape[1]})
+def build_speaker_segment_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds the speaker x segment matrix: a cell holds the segment number if the speaker
+    appears in that segment, otherwise an empty string. Only rows with a speaker and a
+    positive numeric segment are used.
+    """
+    segments = df['Segment'].astype(str)
+    df_filtered = df[(df['Speaker'] != '') & segments.str.isdigit()].copy()
+    df_filtered['Segment'] = df_filtered['Segment'].astype(int)
+    df_filtered = df_filtered[df_filtered['Segment'] > 0]
+    if df_filtered.empty:
+        return pd.DataFrame()
+
+    speaker_matrix = pd.crosstab(index=df_filtered['Speaker'], columns=df_filtered['Segment'])
+    labels = np.where(speaker_matrix.to_numpy() > 0, speaker_matrix.columns.astype(str).to_numpy()[None, :], '')
+    return pd.DataFrame(labels, index=speaker_matrix.index, columns=speaker_matrix.columns, dtype=object)
+
+def build_segment_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Summarizes each segment: number of speakers, the speakers, lines and nominal duration."""
+    df_speakers = df[df['Speaker'] != '']
+    if df_speakers.empty:
+        return pd.DataFrame(columns=['Segment', 'NumSpeakers', 'Speakers', 'Lines', 'SegmentDuration'])
+    segment_table = df_speakers.groupby('Segment', sort=False).agg(
+        NumSpeakers=('Speaker', 'nunique'),
+        Speakers=('Speaker', lambda speakers: ", ".join(speakers.unique())),
+        Lines=('Speaker', 'size'),
+        SegmentDuration=('SegmentDuration', 'sum'),
+    ).reset_index()
+    return segment_table
+
 def get_unique_speakers(df: pd.DataFrame) -> list[str]:
     """Extracts a sorted list of unique speakers from the DataFrame."""
     if 'Speaker' not in df.columns:
@@ -1,3 +1,40 @@
-from .core import calculate_optimal_schedule
-from .calendar import generate_calendar_view
-from .summary import summarize_speaker_schedule
+import importlib
+
+# Public names are resolved on first access, so that importing one scheduler module
+# (e.g. analyzer.scheduler.availability) does not load the whole package
+_EXPORTS = {
+    "calculate_optimal_schedule": ".core",
+    "generate_calendar_view": ".calendar",
+    "AvailabilityIndex": ".calendar",
+    "CalendarWindowCache": ".calendar",
+    "summarize_speaker_schedule": ".summary",
+    "ScheduleResult": ".result",
+    "repair_schedule": ".repair",
+    "RecurrenceRule": ".availability",
+    "build_speaker_interval_sets": ".availability",
+    "validate_schedule": ".validation",
+    "CastIntersectionCache": ".intersection",
+    "FeasibilityMatrix": ".feasibility",
+    "estimate_schedule": ".estimates",
+}
+
+# Scheduler engines with the calculate_optimal_schedule signature, selectable by name: (module, function)
+_ENGINES = {
+    "greedy": (".core", "calculate_optimal_schedule"),
+    "bitmask": (".feasibility", "calculate_bitmask_schedule"),
+}
+
+__all__ = [*_EXPORTS, "SCHEDULER_ENGINES"]
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    elif name == "SCHEDULER_ENGINES":
+        value = {
+            engine_name: getattr(importlib.import_module(module_name, __name__), function_name)
+            for engine_name, (module_name, function_name) in _ENGINES.items()
+        }
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -0,0 +1,426 @@
+import csv
+import io
+import logging
+import re
+import calendar as month_calendar
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Iterator
+
+import pandas as pd
+
+from .utils import P_TIME_SLOT, parse_time_slots
+
+_log = logging.getLogger(__name__)
+
+WEEKDAY_NAMES = {
+    "mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6,
+    "po": 0, "ut": 1, "st": 2, "št": 3, "pi": 4, "so": 5, "ne": 6,
+}
+ICS_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+ALL_WEEKDAYS = (0, 1, 2, 3, 4, 5, 6)
+WORK_WEEKDAYS = (0, 1, 2, 3, 4)
+
+P_RULE_TEXT = re.compile(
+    r"^\s*(?P<days>.+?)\s+(?P<start>\d{1,2}:\d{2})\s*-\s*(?P<end>\d{1,2}:\d{2})"
+    r"(?:\s+(?:from|od)\s+(?P<from>\d{4}-\d{2}-\d{2}))?"
+    r"(?:\s+(?:until|do)\s+(?P<until>\d{4}-\d{2}-\d{2}|end of month|konca mesiaca))?\s*$",
+    re.IGNORECASE
+)
+
+P_GRID_RANGE = r"^(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})$"
+GRID_ERROR_COLUMNS = ["speaker", "day", "value"]
+
+class RecurrenceRule(NamedTuple):
+    """
+    Compact recurring availability of one speaker, expanded only for the queried horizon.
+    Times are minutes after midnight; an end before the start spans into the next day.
+    """
+    speaker: str
+    first_date: date
+    start_minute: int
+    end_minute: int
+    weekdays: tuple[int, ...] = ALL_WEEKDAYS
+    interval_weeks: int = 1
+    until: date | None = None
+    count: int | None = None
+
+def _occurrence_dates(rule: RecurrenceRule, first_date: date, last_date: date) -> Iterator[date]:
+    """Yields the dates in [first_date, last_date] the rule occurs on."""
+    occurrences = 0
+    # COUNT is counted from the rule's own first date, otherwise we can start at the horizon
+    current_date = rule.first_date if rule.count is not None else max(rule.first_date, first_date)
+    first_week_start = rule.first_date - timedelta(days=rule.first_date.weekday())
+    end_date = min(last_date, rule.until) if rule.until else last_date
+    while current_date <= end_date:
+        weeks_since_start = (current_date - first_week_start).days // 7
+        if current_date.weekday() in rule.weekdays and weeks_since_start % rule.interval_weeks == 0:
+            occurrences += 1
+            if rule.count is not None and occurrences > rule.count:
+                return
+            if current_date >= first_date:
+                yield current_date
+        current_date += timedelta(days=1)
+
+def expand_rule(rule: RecurrenceRule, horizon_start: date, horizon_end: date) -> list[tuple[datetime, datetime]]:
+    """Expands a rule into concrete (start, end) datetimes overlapping the days [horizon_start, horizon_end]."""
+    intervals = []
+    horizon_start_dt = datetime.combine(horizon_start, datetime.min.time())
+    # An overnight occurrence from the previous day can reach into the horizon
+    for occurrence_date in _occurrence_dates(rule, horizon_start - timedelta(days=1), horizon_end):
+        day_start = datetime.combine(occurrence_date, datetime.min.time())
+        start_dt = day_start + timedelta(minutes=rule.start_minute)
+        end_dt = day_start + timedelta(minutes=rule.end_minute)
+        if end_dt <= start_dt:
+            end_dt += timedelta(days=1)
+        if end_dt > horizon_start_dt:
+            intervals.append((start_dt, end_dt))
+    return intervals
+
+def merge_intervals(intervals: list[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """Sorts intervals and merges the overlapping or touching ones."""
+    merged = []
+    for start_dt, end_dt in sorted(intervals):
+        if merged and start_dt <= merged[-1][1]:
+            if end_dt > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end_dt)
+        else:
+            merged.append((start_dt, end_dt))
+    return merged
+
+def build_speaker_interval_sets(
+    speaker_availability: dict[str, list[str]],
+    availability_rules: list[RecurrenceRule],
+    horizon_start: date,
+    horizon_end: date
+) -> dict[str, list[tuple[datetime, datetime]]]:
+    """
+    Parses the slot strings once, expands the recurrence rules for the horizon only and
+    merges both into a sorted interval set per speaker.
+    """
+    intervals_by_speaker = {speaker: parse_time_slots(slots) for speaker, slots in speaker_availability.items()}
+    for rule in availability_rules:
+        intervals_by_speaker.setdefault(rule.speaker, []).extend(expand_rule(rule, horizon_start, horizon_end))
+    return {speaker: merge_intervals(intervals) for speaker, intervals in intervals_by_speaker.items()}
+
+def _parse_minutes(time_str: str) -> int:
+    hours, minutes = time_str.split(':')
+    if int(hours) > 24 or int(minutes) > 59:
+        raise ValueError(f"Invalid time '{time_str}'")
+    return int(hours) * 60 + int(minutes)
+
+def parse_rule_text(speaker: str, rule_text: str, today: date | None = None) -> RecurrenceRule | None:
+    """
+    Parses a textual rule such as "weekdays 09:00-17:00 until end of month",
+    "mon,wed 10:00-14:00 from 2026-11-02 until 2026-11-30" or "pracovné dni 09:00-17:00 do konca mesiaca".
+    """
+    match = P_RULE_TEXT.match(rule_text)
+    if not match:
+        _log.error(f"Invalid availability rule '{rule_text}'.")
+        return None
+
+    days_text = match.group("days").strip().lower()
+    if days_text in ("weekdays", "pracovné dni", "pracovne dni"):
+        weekdays = WORK_WEEKDAYS
+    elif days_text in ("daily", "every day", "denne", "každý deň"):
+        weekdays = ALL_WEEKDAYS
+    else:
+        day_names = [name.strip() for name in re.split(r"[,\s]+", days_text) if name.strip()]
+        if not day_names or any(name[:3] not in WEEKDAY_NAMES and name[:2] not in WEEKDAY_NAMES for name in day_names):
+            _log.error(f"Invalid weekdays '{days_text}' in availability rule '{rule_text}'.")
+            return None
+        weekdays = tuple(sorted({WEEKDAY_NAMES.get(name[:3], WEEKDAY_NAMES.get(name[:2])) for name in day_names}))
+
+    try:
+        first_date = date.fromisoformat(match.group("from")) if match.group("from") else (today or date.today())
+        start_minute = _parse_minutes(match.group("start"))
+        end_minute = _parse_minutes(match.group("end"))
+        until_text = match.group("until")
+        if not until_text:
+            until = None
+        elif until_text.lower() in ("end of month", "konca mesiaca"):
+            until = first_date.replace(day=month_calendar.monthrange(first_date.year, first_date.month)[1])
+        else:
+            until = date.fromisoformat(until_text)
+    except ValueError as e:
+        _log.error(f"Invalid availability rule '{rule_text}': {e}")
+        return None
+
+    return RecurrenceRule(speaker, first_date, start_minute, end_minute, weekdays, 1, until, None)
+
+def _normalize_slot(start_dt: datetime, end_dt: datetime) -> str:
+    return f"{start_dt.strftime('%Y-%m-%d %H:%M')}-{end_dt.strftime('%H:%M')}"
+
+CSV_COLUMN_ALIASES = {
+    "speaker": ("speaker", "rečník", "recnik"),
+    "slot": ("slot",),
+    "date": ("date", "dátum", "datum"),
+    "start": ("start", "od"),
+    "end": ("end", "do"),
+    "rule": ("rule", "pravidlo"),
+}
+
+def import_availability_csv(csv_text: str, today: date | None = None) -> tuple[dict[str, list[str]], list[RecurrenceRule]]:
+    """
+    Imports availability from CSV with a header row. Each row holds a speaker column and either
+    a 'slot' (YYYY-MM-DD HH:MM-HH:MM), 'date' + 'start' + 'end', or a textual 'rule'.
+
+    Returns:
+        (slots per speaker as normalized slot strings, recurrence rules)
+    """
+    header_line = csv_text.split('\n', 1)[0]
+    delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+    reader = csv.DictReader(io.StringIO(csv_text), delimiter=delimiter)
+    columns = {}
+    for field_name in reader.fieldnames or []:
+        for column, aliases in CSV_COLUMN_ALIASES.items():
+            if field_name.strip().lower() in aliases:
+                columns[column] = field_name
+    if "speaker" not in columns:
+        _log.error("CSV availability import requires a 'speaker' column.")
+        return {}, []
+
+    slots_by_speaker = {}
+    rules = []
+    for line_number, row in enumerate(reader, start=2):
+        speaker = (row.get(columns["speaker"]) or "").strip()
+        if not speaker:
+            continue
+        if "rule" in columns and (row.get(columns["rule"]) or "").strip():
+            rule = parse_rule_text(speaker, row[columns["rule"]], today)
+            if rule:
+                rules.append(rule)
+            continue
+        if "slot" in columns and (row.get(columns["slot"]) or "").strip():
+            slot_str = row[columns["slot"]].strip()
+        elif {"date", "start", "end"} <= columns.keys():
+            slot_str = f"{row[columns['date']].strip()} {row[columns['start']].strip()}-{row[columns['end']].strip()}"
+        else:
+            _log.warning(f"CSV line {line_number}: no slot, date/start/end or rule value, skipping.")
+            continue
+        parsed_slots = parse_time_slots([slot_str])
+        if parsed_slots:
+            slots_by_speaker.setdefault(speaker, []).append(_normalize_slot(*parsed_slots[0]))
+    return slots_by_speaker, rules
+
+def _unfold_ics_lines(ics_text: str) -> list[str]:
+    lines = []
+    for raw_line in ics_text.splitlines():
+        if raw_line[:1] in (" ", "\t") and lines:
+            lines[-1] += raw_line[1:]
+        elif raw_line.strip():
+            lines.append(raw_line.rstrip())
+    return lines
+
+def _parse_ics_datetime(value: str) -> datetime:
+    """Parses DATE or DATE-TIME values; time zones are ignored and times taken as local."""
+    value = value.rstrip("Z")
+    if "T" in value:
+        return datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    return datetime.strptime(value[:8], "%Y%m%d")
+
+def _parse_ics_duration(value: str) -> timedelta | None:
+    match = re.fullmatch(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?", value)
+    if not match:
+        return None
+    days, hours, minutes = (int(part) if part else 0 for part in match.groups())
+    return timedelta(days=days, hours=hours, minutes=minutes)
+
+def import_availability_ics(ics_text: str, default_speaker: str | None = None) -> tuple[dict[str, list[str]], list[RecurrenceRule]]:
+    """
+    Imports availability from an iCalendar file. Each VEVENT is one availability window of the
+    speaker named in its SUMMARY (or default_speaker); DAILY/WEEKLY RRULEs with BYDAY, INTERVAL,
+    UNTIL and COUNT become recurrence rules. EXDATE and time zones are not interpreted.
+
+    Returns:
+        (slots per speaker as normalized slot strings, recurrence rules)
+    """
+    slots_by_speaker = {}
+    rules = []
+    event = None
+    for line in _unfold_ics_lines(ics_text):
+        if line == "BEGIN:VEVENT":
+            event = {}
+            continue
+        if line == "END:VEVENT":
+            if event is not None:
+                _add_ics_event(event, default_speaker, slots_by_speaker, rules)
+            event = None
+            continue
+        if event is not None and ":" in line:
+            name_part, value = line.split(":", 1)
+            event[name_part.split(";", 1)[0].upper()] = value.strip()
+    return slots_by_speaker, rules
+
+def _add_ics_event(event: dict[str, str], default_speaker: str | None, slots_by_speaker: dict[str, list[str]], rules: list[RecurrenceRule]) -> None:
+    speaker = (event.get("SUMMARY") or default_speaker or "").strip()
+    if not speaker or "DTSTART" not in event:
+        _log.warning(f"Skipping iCalendar event without speaker or start: {event}")
+        return
+    try:
+        start_dt = _parse_ics_datetime(event["DTSTART"])
+        if "DTEND" in event:
+            end_dt = _parse_ics_datetime(event["DTEND"])
+        else:
+            duration = _parse_ics_duration(event.get("DURATION", ""))
+            if duration is None:
+                _log.warning(f"Skipping iCalendar event without end or duration for {speaker}.")
+                return
+            end_dt = start_dt + duration
+    except ValueError as e:
+        _log.warning(f"Skipping iCalendar event for {speaker}: {e}")
+        return
+
+    if end_dt <= start_dt or end_dt - start_dt > timedelta(days=1):
+        _log.warning(f"Skipping iCalendar event for {speaker} with unsupported length {start_dt} - {end_dt}.")
+        return
+    if end_dt - start_dt == timedelta(days=1):
+        end_dt -= timedelta(minutes=1) # All-day events are kept within their day
+
+    if "RRULE" not in event:
+        slots_by_speaker.setdefault(speaker, []).append(_normalize_slot(start_dt, end_dt))
+        return
+
+    rrule = dict(part.split("=", 1) for part in event["RRULE"].split(";") if "=" in part)
+    freq = rrule.get("FREQ", "").upper()
+    if freq not in ("DAILY", "WEEKLY"):
+        _log.warning(f"Skipping iCalendar rule with unsupported frequency '{freq}' for {speaker}.")
+        return
+    interval = int(rrule.get("INTERVAL", "1"))
+    if "BYDAY" in rrule:
+        weekdays = tuple(sorted({ICS_WEEKDAYS[day[-2:]] for day in rrule["BYDAY"].split(",") if day[-2:] in ICS_WEEKDAYS}))
+    else:
+        weekdays = ALL_WEEKDAYS if freq == "DAILY" else (start_dt.weekday(),)
+    if freq == "DAILY" and interval != 1:
+        _log.warning(f"Daily INTERVAL={interval} is not supported for {speaker}; treating it as every day.")
+    rules.append(RecurrenceRule(
+        speaker,
+        start_dt.date(),
+        start_dt.hour * 60 + start_dt.minute,
+        end_dt.hour * 60 + end_dt.minute,
+        weekdays,
+        interval if freq == "WEEKLY" else 1,
+        _parse_ics_datetime(rrule["UNTIL"]).date() if "UNTIL" in rrule else None,
+        int(rrule["COUNT"]) if "COUNT" in rrule else None
+    ))
+
+def rule_to_dict(rule: RecurrenceRule) -> dict:
+    """Converts a rule into a JSON-serializable dictionary."""
+    rule_dict = rule._asdict()
+    rule_dict["first_date"] = rule.first_date.isoformat()
+    rule_dict["until"] = rule.until.isoformat() if rule.until else None
+    rule_dict["weekdays"] = list(rule.weekdays)
+    return rule_dict
+
+def rule_from_dict(rule_dict: dict) -> RecurrenceRule:
+    """Restores a rule from rule_to_dict output."""
+    return RecurrenceRule(
+        rule_dict["speaker"],
+        date.fromisoformat(rule_dict["first_date"]),
+        int(rule_dict["start_minute"]),
+        int(rule_dict["end_minute"]),
+        tuple(rule_dict.get("weekdays", ALL_WEEKDAYS)),
+        int(rule_dict.get("interval_weeks", 1)),
+        date.fromisoformat(rule_dict["until"]) if rule_dict.get("until") else None,
+        rule_dict.get("count")
+    )
+
+def describe_rule(rule: RecurrenceRule) -> str:
+    """Human readable one-line description of a rule."""
+    day_labels = ["Po", "Ut", "St", "Št", "Pi", "So", "Ne"]
+    days = ",".join(day_labels[day] for day in rule.weekdays)
+    text = f"{days} {rule.start_minute // 60:02d}:{rule.start_minute % 60:02d}-{(rule.end_minute // 60) % 24:02d}:{rule.end_minute % 60:02d} od {rule.first_date.isoformat()}"
+    if rule.interval_weeks > 1:
+        text += f" každý {rule.interval_weeks}. týždeň"
+    if rule.until:
+        text += f" do {rule.until.isoformat()}"
+    if rule.count:
+        text += f" ({rule.count}x)"
+    return text
+
+def _grid_slot_mask(slots: pd.Series) -> pd.Series:
+    """Which slots the availability grid can show: exactly one "YYYY-MM-DD HH:MM-HH:MM" string each."""
+    return slots.map(lambda slot: isinstance(slot, str) and P_TIME_SLOT.fullmatch(slot) is not None).astype(bool)
+
+def ungridded_slots(speaker_availability: dict[str, list], speakers: list[str]) -> dict[str, list]:
+    """
+    The slots of the given speakers that slots_to_grid leaves out, e.g. parsed (start, end)
+    tuples or strings with other text around the time range. The grid cannot edit them, so
+    they are merged back into the slots of the committed grid.
+    """
+    hidden = {}
+    for speaker in speakers:
+        slots = pd.Series(speaker_availability.get(speaker, []), dtype=object)
+        if len(slots):
+            speaker_hidden = slots[~_grid_slot_mask(slots)].tolist()
+            if speaker_hidden:
+                hidden[speaker] = speaker_hidden
+    return hidden
+
+def slots_to_grid(speaker_availability: dict[str, list[str]], speakers: list[str], extra_days: list[str] | None = None) -> pd.DataFrame:
+    """
+    Lays out slot strings as a speaker x day grid for bulk editing. Slots the grid cannot show
+    are left out (see ungridded_slots).
+
+    Args:
+        speaker_availability: Speaker -> slots ("YYYY-MM-DD HH:MM-HH:MM").
+        speakers: Grid rows, in order.
+        extra_days: Days ("YYYY-MM-DD") shown as columns even without any slot.
+
+    Returns:
+        A DataFrame indexed by speaker with one column per day, sorted by date. Each cell holds
+        the comma separated time ranges of that day ("09:00-12:00, 13:00-17:00") or "".
+    """
+    slot_speakers = [speaker for speaker in speakers for _ in speaker_availability.get(speaker, [])]
+    slots = pd.Series([slot for speaker in speakers for slot in speaker_availability.get(speaker, [])], index=slot_speakers, dtype=object)
+    gridded = _grid_slot_mask(slots)
+    if not gridded.all():
+        _log.info(f"Slots not representable in the availability grid are kept outside it: {slots[~gridded].tolist()}")
+    parts = slots[gridded].astype(str).str.extract(P_TIME_SLOT.pattern)
+
+    ranges = parts[1].str.zfill(2) + ":" + parts[2] + "-" + parts[3].str.zfill(2) + ":" + parts[4]
+    cells = ranges.groupby([parts.index, parts[0]]).agg(", ".join)
+    days = sorted(set(parts[0]) | set(extra_days or []))
+    grid = cells.unstack() if not cells.empty else pd.DataFrame()
+    grid = grid.reindex(index=speakers, columns=days).astype(object).fillna("")
+    grid.index.name = "speaker"
+    grid.columns.name = None
+    return grid
+
+def grid_to_slots(grid: pd.DataFrame) -> tuple[dict[str, list[str]], pd.DataFrame]:
+    """
+    Validates an edited availability grid (see slots_to_grid) in one pass and converts it back to slots.
+
+    Returns:
+        (speaker -> slot strings for every grid row, invalid entries as a DataFrame with
+        GRID_ERROR_COLUMNS; the slots are only meaningful when it is empty)
+    """
+    slots_by_speaker = {speaker: [] for speaker in grid.index}
+    if grid.empty:
+        return slots_by_speaker, pd.DataFrame(columns=GRID_ERROR_COLUMNS)
+
+    cells = grid.astype(object).where(grid.notna(), "").astype(str)
+    cells.index.name = "speaker"
+    cells.columns.name = "day"
+    ranges = cells.stack().str.split(",").explode().str.strip()
+    ranges = ranges[ranges != ""]
+    if ranges.empty:
+        return slots_by_speaker, pd.DataFrame(columns=GRID_ERROR_COLUMNS)
+
+    parts = ranges.str.extract(P_GRID_RANGE)
+    numbers = parts.astype(float)
+    days = pd.Series(ranges.index.get_level_values("day"), index=ranges.index)
+    valid = (
+        parts.notna().all(axis=1)
+        & (numbers[0] <= 23) & (numbers[1] <= 59) & (numbers[2] <= 23) & (numbers[3] <= 59)
+        & ((numbers[0] != numbers[2]) | (numbers[1] != numbers[3]))
+        & pd.to_datetime(days, format="%Y-%m-%d", errors="coerce").notna()
+    )
+
+    errors = ranges[~valid].reset_index()
+    errors.columns = GRID_ERROR_COLUMNS
+
+    parts = parts[valid]
+    slot_strings = days[valid] + " " + parts[0].str.zfill(2) + ":" + parts[1] + "-" + parts[2].str.zfill(2) + ":" + parts[3]
+    for speaker, speaker_slots in slot_strings.groupby(level="speaker", sort=False):
+        slots_by_speaker[speaker] = speaker_slots.tolist()
+    return slots_by_speaker, errors
@@ -1,11 +1,162 @@
 import pandas as pd
+import numpy as np
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
-from .utils import parse_time_slot
+from .availability import RecurrenceRule, expand_rule
+from .utils import time_slots_to_minutes
+from utils.metrics import timed_stage
 
 _log = logging.getLogger(__name__)
 
+# One prefetch thread shared by every cache, so caches replaced on each availability change
+# (and those of ended sessions) leave no idle threads behind
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calendar-prefetch")
+
+class AvailabilityIndex:
+    """
+    Speaker availability and global recording slots parsed once into (n, 2) arrays of
+    start/end minutes since the epoch, reusable for any calendar window. Recurrence rules
+    are kept compact and expanded only for the window being queried.
+    """
+
+    def __init__(
+        self,
+        unique_speakers: list[str],
+        speaker_availability: dict[str, list[str]],
+        recording_days_times: list[str],
+        availability_rules: list[RecurrenceRule] | None = None
+    ):
+        self.columns = list(unique_speakers) + ['Recording Slots']
+        self.slot_minutes = [time_slots_to_minutes(speaker_availability.get(speaker, [])) for speaker in unique_speakers]
+        self.slot_minutes.append(time_slots_to_minutes(recording_days_times))
+        speaker_rows = {speaker: row for row, speaker in enumerate(unique_speakers)}
+        self.rules_by_row = {}
+        for rule in availability_rules or []:
+            if rule.speaker in speaker_rows:
+                self.rules_by_row.setdefault(speaker_rows[rule.speaker], []).append(rule)
+
+    def slots_in_range(self, row: int, range_start: int, range_end: int) -> np.ndarray:
+        """Returns the slots of one calendar column that overlap [range_start, range_end) minutes."""
+        slots = self.slot_minutes[row]
+        if row in self.rules_by_row:
+            first_day = date(1970, 1, 1) + timedelta(days=range_start // 1440)
+            last_day = date(1970, 1, 1) + timedelta(days=(range_end - 1) // 1440)
+            rule_intervals = [interval for rule in self.rules_by_row[row] for interval in expand_rule(rule, first_day, last_day)]
+            slots = np.concatenate((slots, time_slots_to_minutes(rule_intervals)))
+        return slots[(slots[:, 0] < range_end) & (slots[:, 1] > range_start)]
+
+def _fill_interval_mask(diff: np.ndarray, row: int, slots: np.ndarray, bin_starts: np.ndarray, bin_ends: np.ndarray) -> None:
+    """Marks in diff (row-wise +1/-1 boundaries) every bin overlapping one of the slots."""
+    if slots.size == 0:
+        return
+    # Bin i overlaps [start, end) iff bin_start_i < end and bin_end_i > start
+    first_bins = np.searchsorted(bin_ends, slots[:, 0], side='right')
+    last_bins = np.searchsorted(bin_starts, slots[:, 1], side='left')
+    valid = first_bins < last_bins
+    np.add.at(diff[row], first_bins[valid], 1)
+    np.add.at(diff[row], last_bins[valid], -1)
+
+@timed_stage(
+    "calendar",
+    input_size=lambda availability_index, *args, **kwargs: len(availability_index.columns),
+    output_counts=lambda calendar_df: {"time_bins": calendar_df.shape[0], "columns": calendar_df.shape[1]}
+)
+def build_calendar_window(
+    availability_index: AvailabilityIndex,
+    start_date: date,
+    num_days: int,
+    time_granularity_minutes: int = 30,
+    start_hour: int = 8,
+    end_hour: int = 20
+) -> pd.DataFrame:
+    """
+    Builds the calendar grid for the days [start_date, start_date + num_days) only.
+
+    The grid is built as a boolean matrix: each slot is mapped to its range of time bins with
+    searchsorted over the sorted bin edges and the ranges are filled via cumulative boundary counts.
+    """
+    dates = [start_date + timedelta(days=d_offset) for d_offset in range(num_days)]
+
+    # Bin edges in minutes since the epoch, sorted across all days
+    day_offsets = np.arange(start_hour * 60, end_hour * 60, time_granularity_minutes, dtype=np.int64)
+    day_minutes = np.array(dates, dtype='datetime64[D]').astype(np.int64) * 1440
+    bin_starts = (day_minutes[:, None] + day_offsets[None, :]).ravel()
+    bin_ends = bin_starts + time_granularity_minutes
+
+    offset_labels = [
+        f"{start // 60:02d}:{start % 60:02d}-{(end // 60) % 24:02d}:{end % 60:02d}"
+        for start, end in zip(day_offsets.tolist(), (day_offsets + time_granularity_minutes).tolist())
+    ]
+    date_labels = [current_date.strftime('%Y-%m-%d') for current_date in dates]
+    all_time_labels = [f"{date_label} {offset_label}" for date_label in date_labels for offset_label in offset_labels]
+
+    # One row per speaker plus the global recording slots row, one boundary column past the last bin
+    columns = availability_index.columns
+    diff = np.zeros((len(columns), len(bin_starts) + 1), dtype=np.int32)
+    if len(bin_starts):
+        window_start, window_end = int(bin_starts[0]), int(bin_ends[-1])
+        for row in range(len(columns)):
+            _fill_interval_mask(diff, row, availability_index.slots_in_range(row, window_start, window_end), bin_starts, bin_ends)
+    mask = np.cumsum(diff[:, :-1], axis=1) > 0
+
+    grid = np.full((len(bin_starts), len(columns)), '', dtype=object)
+    grid[:, :-1][mask[:-1].T] = "Dostupný" # Slovak for Available
+    grid[:, -1][mask[-1]] = "Nahrávanie" # Slovak for Recording
+    return pd.DataFrame(grid, index=all_time_labels, columns=columns, dtype=object)
+
+class CalendarWindowCache:
+    """
+    Serves calendar windows from one AvailabilityIndex, keeping the most recently used
+    windows and prefetching the neighbouring windows in the shared background thread.
+    """
+
+    def __init__(
+        self,
+        availability_index: AvailabilityIndex,
+        time_granularity_minutes: int = 30,
+        start_hour: int = 8,
+        end_hour: int = 20,
+        max_windows: int = 8
+    ):
+        self.availability_index = availability_index
+        self.time_granularity_minutes = time_granularity_minutes
+        self.start_hour = start_hour
+        self.end_hour = end_hour
+        self.max_windows = max_windows
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_window(self, start_date: date, num_days: int) -> pd.DataFrame:
+        """Returns the calendar window, computing it only if it is not cached yet."""
+        key = (start_date, num_days)
+        with self._lock:
+            if key in self._windows:
+                self._windows.move_to_end(key)
+                return self._windows[key]
+
+        window = build_calendar_window(
+            self.availability_index, start_date, num_days,
+            self.time_granularity_minutes, self.start_hour, self.end_hour
+        )
+        with self._lock:
+            self._windows[key] = window
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+        return window
+
+    def prefetch_neighbours(self, start_date: date, num_days: int) -> None:
+        """Schedules the previous and next windows of the same size for background computation."""
+        for neighbour_start in (start_date - timedelta(days=num_days), start_date + timedelta(days=num_days)):
+            with self._lock:
+                if (neighbour_start, num_days) in self._windows:
+                    continue
+            _prefetch_executor.submit(self.get_window, neighbour_start, num_days)
+
 def generate_calendar_view(
     unique_speakers: list[str], 
     speaker_availability: dict[str, list[str]],
@@ -13,7 +164,9 @@ def generate_calendar_view(
     time_granularity_minutes: int = 30,
     start_hour: int = 8,
     end_hour: int = 20,
-    num_days_to_show: int = 7 # Show a week by default
+    num_days_to_show: int = 7, # Show a week by default
+    start_date: date | None = None,
+    availability_rules: list[RecurrenceRule] | None = None
 ) -> pd.DataFrame:
     """
     Generates a DataFrame representing a calendar view of speaker availability and recording slots.
@@ -26,62 +179,21 @@ def generate_calendar_view(
         start_hour: The starting hour for the calendar view (e.g., 8 for 8:00).
         end_hour: The ending hour for the calendar view (e.g., 20 for 20:00).
         num_days_to_show: Number of days to display in the calendar.
+        start_date: First day of the calendar (defaults to today).
+        availability_rules: Recurring speaker availability, expanded for the shown days only.
         
     Returns:
         A Pandas DataFrame representing the calendar view.
     """
     _log.info("Generating calendar view...")
-    
-    all_time_labels = []
-    all_time_intervals = []
-    start_date = datetime.today().date() # Start from today
-
-    for d_offset in range(num_days_to_show):
-        current_date = start_date + timedelta(days=d_offset)
-        current_time = datetime.combine(current_date, datetime.min.time().replace(hour=start_hour))
-        end_time_limit = datetime.combine(current_date, datetime.min.time().replace(hour=end_hour))
-
-        while current_time < end_time_limit:
-            slot_end = current_time + timedelta(minutes=time_granularity_minutes)
-            label = f"{current_date.strftime('%Y-%m-%d')} {current_time.strftime('%H:%M')}-{slot_end.strftime('%H:%M')}"
-            all_time_labels.append(label)
-            all_time_intervals.append((current_time, slot_end))
-            current_time = slot_end
-
-    # Initialize calendar data with empty strings
-    calendar_data = {speaker: [''] * len(all_time_labels) for speaker in unique_speakers}
-    calendar_data['Recording Slots'] = [''] * len(all_time_labels) # Add column for global recording slots
-    calendar_df = pd.DataFrame(calendar_data, index=all_time_labels)
-    
-    # Parse speaker availability
-    parsed_speaker_availability = {}
-    for speaker, slots in speaker_availability.items():
-        parsed_slots = []
-        for slot_str in slots:
-            parsed_slot = parse_time_slot(slot_str)
-            if parsed_slot:
-                parsed_slots.append(parsed_slot)
-        parsed_speaker_availability[speaker] = parsed_slots
-
-    # Populate speaker availability
-    for speaker, slots in parsed_speaker_availability.items():
-        for start_dt, end_dt in slots:
-            for i, (interval_start_dt, interval_end_dt) in enumerate(all_time_intervals):
-                # Check for overlap
-                if max(start_dt, interval_start_dt) < min(end_dt, interval_end_dt):
-                    calendar_df.loc[all_time_labels[i], speaker] = "Dostupný" # Slovak for Available
-
-    # Parse and populate global recording slots
-    parsed_recording_slots = []
-    for slot_str in recording_days_times:
-        parsed_slot = parse_time_slot(slot_str)
-        if parsed_slot:
-            parsed_recording_slots.append(parsed_slot)
-
-    for start_dt, end_dt in parsed_recording_slots:
-        for i, (interval_start_dt, interval_end_dt) in enumerate(all_time_intervals):
-            if max(start_dt, interval_start_dt) < min(end_dt, interval_end_dt):
-                calendar_df.loc[all_time_labels[i], 'Recording Slots'] = "Nahrávanie" # Slovak for Recording
-
+    availability_index = AvailabilityIndex(unique_speakers, speaker_availability, recording_days_times, availability_rules)
+    calendar_df = build_calendar_window(
+        availability_index,
+        start_date or datetime.today().date(), # Start from today
+        num_days_to_show,
+        time_granularity_minutes,
+        start_hour,
+        end_hour
+    )
     _log.info("Calendar view generated.")
     return calendar_df
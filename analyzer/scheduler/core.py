@@ -2,49 +2,18 @@ import pandas as pd
 import logging
 from datetime import datetime, timedelta
 
-from .utils import parse_time_slot
+from .intersection import CastIntersectionCache
+from .utils import parse_time_slots
+from .result import ScheduleResult, DEFAULT_ROOM
+from utils.metrics import timed_stage
 
 _log = logging.getLogger(__name__)
 
-def calculate_optimal_schedule(
-    df_processed: pd.DataFrame, 
-    speaker_availability: dict[str, list[str]],
-    recording_days_times: list[str] # New parameter for global recording times
-) -> dict:
+def build_segments_to_schedule(df_processed: pd.DataFrame) -> list[dict]:
     """
-    Calculates an optimal recording schedule based on processed data, speaker availability,
-    and global recording slots.
-    
-    Args:
-        df_processed: DataFrame with processed segment data (including NumSpeakersInSegment, SegmentDuration).
-        speaker_availability: Dictionary where keys are speaker names and values are lists of time slot strings.
-                              e.g., {"ANDREJ": ["YYYY-MM-DD HH:MM-HH:MM", "YYYY-MM-DD HH:MM-HH:MM"]}
-        recording_days_times: List of global recording time slot strings (YYYY-MM-DD HH:MM-HH:MM).
-                                    
-    Returns:
-        A dictionary representing the proposed schedule.
+    Groups processed rows into schedulable segments (id, speakers, summed duration),
+    sorted multi-speaker first, then by duration descending.
     """
-    _log.info("Starting optimal schedule calculation...")
-
-    # 1. Parse all availability and recording slots into datetime objects
-    parsed_speaker_availability = {}
-    for speaker, slots in speaker_availability.items():
-        parsed_slots = []
-        for slot_str in slots:
-            parsed_slot = parse_time_slot(slot_str)
-            if parsed_slot:
-                parsed_slots.append(parsed_slot)
-        parsed_speaker_availability[speaker] = parsed_slots
-    _log.debug(f"Parsed speaker availability: {parsed_speaker_availability}")
-
-    parsed_recording_slots = []
-    for slot_str in recording_days_times:
-        parsed_slot = parse_time_slot(slot_str)
-        if parsed_slot:
-            parsed_recording_slots.append(parsed_slot)
-    _log.debug(f"Parsed global recording slots: {parsed_recording_slots}")
-
-    # 2. Group segments and prepare for scheduling
     segments_to_schedule = []
     # Get unique segments and their total duration and speakers
     segment_groups = df_processed[df_processed['Speaker'] != ''].groupby('Segment')
@@ -64,71 +33,117 @@ def calculate_optimal_schedule(
     
     # Sort segments for scheduling (e.g., multi-speaker first, then by duration descending)
     segments_to_schedule.sort(key=lambda x: (x['num_speakers'], x['duration']), reverse=True)
-    _log.info(f"Segments to schedule (sorted by num_speakers, then duration): {segments_to_schedule}")
+    return segments_to_schedule
+
+def assign_segments(
+    segments_to_schedule: list[dict],
+    available_recording_slots: list[tuple[datetime, datetime]],
+    parsed_speaker_availability: dict[str, list[tuple[datetime, datetime]]],
+    bookings: list[dict],
+    unassigned_segments: list[str],
+    intersection_cache: CastIntersectionCache | None = None
+) -> None:
+    """
+    Greedily assigns segments to the free recording slots. Each segment starts at the earliest
+    time within a slot at which its whole cast is available for the full duration; the booked
+    time is cut out of the slot, leaving the time before and after it free.
+    Appends booking records (ScheduleResult columns) to bookings and unplaceable segment ids to
+    unassigned_segments, and updates available_recording_slots in place.
+
+    Args:
+        intersection_cache: Common cast availability to reuse across calls; built from
+                            parsed_speaker_availability when not given.
+    """
+    if intersection_cache is None:
+        intersection_cache = CastIntersectionCache(parsed_speaker_availability)
+    available_recording_slots.sort(key=lambda x: x[0]) # Sort by start time
 
-    # 3. Implement Basic Greedy Scheduling Logic
-    schedule = {
-        "status": "Generated Schedule",
-        "details": [],
-        "unassigned_segments": []
-    }
-    
-    # Create a mutable copy of recording slots to track used time
-    available_recording_slots = sorted(parsed_recording_slots, key=lambda x: x[0]) # Sort by start time
-    
     for segment in segments_to_schedule:
         _log.debug(f"Attempting to schedule segment {segment['segment_id']} (Speakers: {segment['speakers']}, Duration: {segment['duration']:.2f}s)")
-        
+        segment_duration = timedelta(seconds=float(segment['duration']))
+        cast = frozenset(segment['speakers'])
+
         assigned = False
         for rec_slot_idx, (rec_start, rec_end) in enumerate(available_recording_slots):
             # Check if segment duration fits within the current recording slot
-            if (rec_end - rec_start).total_seconds() >= segment['duration']:
-                # Check if all speakers are available within this recording slot
-                all_speakers_available = True
-                for speaker in segment['speakers']:
-                    speaker_has_slot = False
-                    if speaker in parsed_speaker_availability:
-                        for sp_start, sp_end in parsed_speaker_availability[speaker]:
-                            # Check for overlap between speaker's slot and current recording slot
-                            if max(rec_start, sp_start) < min(rec_end, sp_end):
-                                speaker_has_slot = True
-                                break
-                    if not speaker_has_slot:
-                        all_speakers_available = False
-                        _log.debug(f"  Speaker {speaker} not available in recording slot {rec_start.strftime('%H:%M')}-{rec_end.strftime('%H:%M')}")
-                        break
-                
-                if all_speakers_available:
-                    # Assign segment to this slot (simplified: just take the start of the recording slot)
-                    assigned_start_time = rec_start
-                    assigned_end_time = rec_start + timedelta(seconds=float(segment['duration']))
-                    schedule["details"].append({
-                        "segment_id": segment['segment_id'],
-                        "speakers": segment['speakers'],
-                        "duration": segment['duration'],
-                        "assigned_start_time": assigned_start_time.strftime('%Y-%m-%d %H:%M'),
-                        "assigned_end_time": assigned_end_time.strftime('%Y-%m-%d %H:%M'),
-                        "status": "Assigned"
-                    })
-                    assigned = True
-                    _log.info(f"  Segment {segment['segment_id']} assigned to {assigned_start_time.strftime('%Y-%m-%d %H:%M')}")
-                    
-                    # Update the available recording slot (simple greedy: consume from start)
-                    # In a real scheduler, this would split the slot or manage a timeline.
-                    # For now, we'll just reduce the current slot or remove it if fully consumed.
-                    new_rec_start = rec_start + timedelta(seconds=float(segment['duration']))
-                    if new_rec_start < rec_end:
-                        available_recording_slots[rec_slot_idx] = (new_rec_start, rec_end)
-                    else:
-                        available_recording_slots.pop(rec_slot_idx) # Slot fully consumed
-                    
-                    # Re-sort to keep track of available slots
-                    available_recording_slots.sort(key=lambda x: x[0])
-                    break # Move to next segment
-        
+            if rec_end - rec_start < segment_duration:
+                continue
+            assigned_start_time = intersection_cache.earliest_common_start(cast, rec_start, rec_end, segment['duration'])
+            if assigned_start_time is None:
+                continue
+            assigned_end_time = assigned_start_time + segment_duration
+            bookings.append({
+                "segment_id": segment['segment_id'],
+                "room": DEFAULT_ROOM,
+                "start": assigned_start_time,
+                "end": assigned_end_time,
+                "duration": segment['duration'],
+                "speakers": segment['speakers']
+            })
+            assigned = True
+            _log.info(f"  Segment {segment['segment_id']} assigned to {assigned_start_time.strftime('%Y-%m-%d %H:%M')}")
+
+            # Split the slot around the booking; the remaining parts stay in start order
+            remaining_slots = [
+                (free_start, free_end)
+                for free_start, free_end in ((rec_start, assigned_start_time), (assigned_end_time, rec_end))
+                if free_start < free_end
+            ]
+            available_recording_slots[rec_slot_idx:rec_slot_idx + 1] = remaining_slots
+            break # Move to next segment
+
         if not assigned:
-            schedule["unassigned_segments"].append(segment['segment_id'])
+            unassigned_segments.append(segment['segment_id'])
             _log.warning(f"  Segment {segment['segment_id']} could not be assigned.")
+    _log.debug(f"Cast availability cache: {intersection_cache.stats()}")
+
+@timed_stage(
+    "schedule",
+    input_size=lambda df_processed, *args, **kwargs: len(df_processed),
+    output_counts=lambda schedule: {"bookings": len(schedule.bookings), "unassigned_segments": len(schedule.unassigned_segments)}
+)
+def calculate_optimal_schedule(
+    df_processed: pd.DataFrame, 
+    speaker_availability: dict[str, list[str]],
+    recording_days_times: list[str] # New parameter for global recording times
+) -> ScheduleResult:
+    """
+    Calculates an optimal recording schedule based on processed data, speaker availability,
+    and global recording slots.
+    
+    Args:
+        df_processed: DataFrame with processed segment data (including NumSpeakersInSegment, SegmentDuration).
+        speaker_availability: Dictionary where keys are speaker names and values are lists of time slot strings.
+                              e.g., {"ANDREJ": ["YYYY-MM-DD HH:MM-HH:MM", "YYYY-MM-DD HH:MM-HH:MM"]}
+                              Already parsed (start, end) datetime tuples, e.g. from
+                              build_speaker_interval_sets, are accepted as well.
+        recording_days_times: List of global recording time slot strings (YYYY-MM-DD HH:MM-HH:MM).
+                                    
+    Returns:
+        A ScheduleResult with the proposed bookings and the unassigned segment ids.
+    """
+    _log.info("Starting optimal schedule calculation...")
+
+    # 1. Parse all availability and recording slots into datetime objects
+    parsed_speaker_availability = {
+        speaker: parse_time_slots(slots) for speaker, slots in speaker_availability.items()
+    }
+    _log.debug(f"Parsed speaker availability: {parsed_speaker_availability}")
+
+    parsed_recording_slots = parse_time_slots(recording_days_times)
+    _log.debug(f"Parsed global recording slots: {parsed_recording_slots}")
+
+    # 2. Group segments and prepare for scheduling
+    segments_to_schedule = build_segments_to_schedule(df_processed)
+    _log.info(f"Segments to schedule (sorted by num_speakers, then duration): {segments_to_schedule}")
+
+    # 3. Implement Basic Greedy Scheduling Logic
+    bookings = []
+    unassigned_segments = []
+    
+    # Create a mutable copy of recording slots to track used time
+    available_recording_slots = list(parsed_recording_slots)
+    assign_segments(segments_to_schedule, available_recording_slots, parsed_speaker_availability, bookings, unassigned_segments)
 
     _log.info("Optimal schedule calculation completed.")
-    return schedule
+    return ScheduleResult.from_records(bookings, unassigned_segments, "Generated Schedule")
@@ -0,0 +1,139 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .availability import merge_intervals
+from .intersection import CastIntersectionCache, intersect_intervals
+from .utils import parse_time_slots
+from utils.metrics import timed_stage
+
+_log = logging.getLogger(__name__)
+
+SPEAKER_LOAD_COLUMNS = ["speaker", "required_seconds", "available_seconds", "shortfall_seconds"]
+UNSCHEDULABLE_COLUMNS = ["segment_id", "speakers", "duration", "longest_window_seconds"]
+
+@dataclass
+class ScheduleEstimate:
+    """
+    Lower bounds for a scheduling instance, computed without running a scheduler.
+
+    min_days is the least number of studio days that can hold the recording time (None when even
+    all days cannot); min_slots the least number of studio slots, counting segments longer than
+    half of the longest slot as needing a slot each. speaker_load compares the time each speaker
+    must record with their availability during studio time; unschedulable lists the segments
+    whose cast never shares a studio window as long as the segment.
+    """
+    required_seconds: float = 0.0
+    studio_seconds: float = 0.0
+    studio_days: int = 0
+    studio_slots: int = 0
+    min_days: int | None = 0
+    min_slots: int | None = 0
+    speaker_load: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=SPEAKER_LOAD_COLUMNS))
+    unschedulable: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=UNSCHEDULABLE_COLUMNS))
+
+    @property
+    def overloaded_speakers(self) -> pd.DataFrame:
+        return self.speaker_load[self.speaker_load["shortfall_seconds"] > 0]
+
+    @property
+    def fits(self) -> bool:
+        """Whether no bound rules out scheduling every segment; a full scheduler run may still fail."""
+        return self.min_days is not None and self.min_slots is not None and self.overloaded_speakers.empty and self.unschedulable.empty
+
+def _min_bins(capacities: np.ndarray, demand: float) -> int | None:
+    """Least number of the largest capacities whose sum reaches demand, or None."""
+    if demand <= 0:
+        return 0
+    cumulative = np.cumsum(np.sort(capacities)[::-1])
+    if not len(cumulative) or cumulative[-1] < demand:
+        return None
+    return int(np.searchsorted(cumulative, demand) + 1)
+
+def _total_seconds(intervals: list[tuple[datetime, datetime]]) -> float:
+    return sum((end_dt - start_dt).total_seconds() for start_dt, end_dt in intervals)
+
+@timed_stage(
+    "schedule_estimate",
+    input_size=lambda df_processed, *args, **kwargs: len(df_processed),
+    output_counts=lambda estimate: {"unschedulable_segments": len(estimate.unschedulable), "overloaded_speakers": len(estimate.overloaded_speakers)}
+)
+def estimate_schedule(
+    df_processed: pd.DataFrame,
+    speaker_availability: dict[str, list],
+    recording_days_times: list
+) -> ScheduleEstimate:
+    """
+    Computes bin-packing lower bounds on the studio days and slots, the per-speaker required
+    versus available time, and the segments that can never be scheduled. Segments are grouped
+    with vectorized pandas operations and every distinct cast is intersected once.
+
+    Args:
+        df_processed: Processed script DataFrame (Segment, Speaker, SegmentDuration).
+        speaker_availability: Speaker -> availability slot strings or (start, end) tuples.
+        recording_days_times: Global recording slot strings or (start, end) tuples.
+
+    Returns:
+        A ScheduleEstimate.
+    """
+    spoken = df_processed[df_processed["Speaker"] != ""]
+    segment_durations = spoken.groupby("Segment")["SegmentDuration"].sum()
+    segment_durations = segment_durations[segment_durations > 0].astype(float)
+    cast_rows = spoken[spoken["Segment"].isin(segment_durations.index)][["Segment", "Speaker"]].drop_duplicates()
+
+    studio_slots = merge_intervals(parse_time_slots(recording_days_times))
+    slot_seconds = np.array([(end_dt - start_dt).total_seconds() for start_dt, end_dt in studio_slots], dtype=float)
+    day_seconds = pd.Series(slot_seconds, index=[start_dt.date() for start_dt, _ in studio_slots], dtype=float).groupby(level=0).sum()
+    required_seconds = float(segment_durations.sum())
+
+    # Segments longer than half of the longest slot cannot share a slot with each other
+    longest_slot = slot_seconds.max() if len(slot_seconds) else 0.0
+    large_segments = int((segment_durations > longest_slot / 2).sum())
+    capacity_slots = _min_bins(slot_seconds, required_seconds)
+    min_slots = None if capacity_slots is None or large_segments > len(slot_seconds) else max(capacity_slots, large_segments)
+    min_days = _min_bins(day_seconds.to_numpy(), required_seconds)
+
+    # Availability clipped to studio time once per speaker; cast intersections then yield studio windows directly
+    studio_availability = {
+        speaker: intersect_intervals([merge_intervals(parse_time_slots(slots)), studio_slots])
+        for speaker, slots in speaker_availability.items()
+    }
+    speaker_required = cast_rows["Segment"].map(segment_durations).groupby(cast_rows["Speaker"]).sum()
+    speaker_load = pd.DataFrame({
+        "speaker": speaker_required.index,
+        "required_seconds": speaker_required.to_numpy(dtype=float),
+        "available_seconds": [_total_seconds(studio_availability.get(speaker, [])) for speaker in speaker_required.index],
+    })
+    speaker_load["shortfall_seconds"] = (speaker_load["required_seconds"] - speaker_load["available_seconds"]).clip(lower=0)
+    speaker_load = speaker_load.sort_values("shortfall_seconds", ascending=False, kind="stable").reset_index(drop=True)
+
+    cast_sets = {}
+    for segment_id, speaker in zip(cast_rows["Segment"], cast_rows["Speaker"]):
+        cast_sets.setdefault(segment_id, set()).add(speaker)
+    casts = pd.Series({segment_id: frozenset(cast) for segment_id, cast in cast_sets.items()}, dtype=object)
+    intersection_cache = CastIntersectionCache(studio_availability)
+    longest_windows = {
+        cast: max(((end_dt - start_dt).total_seconds() for start_dt, end_dt in intersection_cache.common_availability(cast)), default=0.0)
+        for cast in set(casts)
+    }
+    longest_window_seconds = casts.map(longest_windows).astype(float)
+    never_fits = longest_window_seconds < segment_durations.reindex(casts.index)
+    unschedulable = pd.DataFrame({
+        "segment_id": casts.index[never_fits].astype(str),
+        "speakers": [sorted(cast) for cast in casts[never_fits]],
+        "duration": segment_durations.reindex(casts.index)[never_fits].to_numpy(dtype=float),
+        "longest_window_seconds": longest_window_seconds[never_fits].to_numpy(dtype=float),
+    }, columns=UNSCHEDULABLE_COLUMNS)
+
+    estimate = ScheduleEstimate(
+        required_seconds, float(slot_seconds.sum()), len(day_seconds), len(studio_slots),
+        min_days, min_slots, speaker_load, unschedulable
+    )
+    _log.info(
+        f"Schedule estimate: {required_seconds / 3600:.1f} h required, {estimate.studio_seconds / 3600:.1f} h studio time, "
+        f"min days {min_days}/{estimate.studio_days}, {len(estimate.overloaded_speakers)} overloaded speakers, {len(unschedulable)} unschedulable segments."
+    )
+    return estimate
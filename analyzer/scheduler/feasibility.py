@@ -0,0 +1,325 @@
+import logging
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .core import build_segments_to_schedule
+from .repair import diff_speaker_availability
+from .result import ScheduleResult, DEFAULT_ROOM
+from .utils import time_slots_to_minutes
+from utils.metrics import timed_stage
+
+_log = logging.getLogger(__name__)
+
+# Quarter-hour bins keep a multi-week horizon small; slots off the quarter hours are rounded inwards,
+# so the matrix never reports a time as feasible that the interval-based scheduler would reject
+FEASIBILITY_BIN_MINUTES = 15
+
+# Reasons returned by FeasibilityMatrix.explain, from the most to the least fundamental
+UNKNOWN_SEGMENT = "unknown_segment"
+SPEAKER_WITHOUT_AVAILABILITY = "speaker_without_availability"
+NO_COMMON_AVAILABILITY = "no_common_availability"
+NO_COMMON_STUDIO_TIME = "no_common_studio_time"
+WINDOW_TOO_SHORT = "window_too_short"
+FEASIBLE = "feasible" # The segment fits on its own; other bookings took its time
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _merge_minute_intervals(rows: np.ndarray, intervals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Merges overlapping or touching (start, end) minute intervals per row id; returns (rows, intervals)."""
+    if not len(intervals):
+        return rows, intervals
+    order = np.lexsort((intervals[:, 0], rows))
+    rows, intervals = rows[order], intervals[order]
+    # Offsetting each row past the previous one lets a single running maximum of the ends
+    # serve all rows; a new interval starts after that maximum or in a new row
+    row_offsets = rows * (int(intervals.max()) - int(intervals.min()) + 1)
+    running_end = np.maximum.accumulate(intervals[:, 1] + row_offsets) - row_offsets
+    new_interval = np.r_[True, (rows[1:] != rows[:-1]) | (intervals[1:, 0] > running_end[:-1])]
+    starts = np.flatnonzero(new_interval)
+    merged = np.column_stack((intervals[starts, 0], np.maximum.reduceat(intervals[:, 1], starts)))
+    return rows[starts], merged
+
+def _bitmaps(rows: np.ndarray, intervals: np.ndarray, num_rows: int, horizon_start: int, num_bins: int, bin_minutes: int) -> np.ndarray:
+    """(num_rows, num_bins) bool matrix of the bins fully covered by each row's minute intervals."""
+    rows, intervals = _merge_minute_intervals(rows, intervals)
+    diff = np.zeros((num_rows, num_bins + 1), dtype=np.int32)
+    if len(intervals):
+        first_bins = np.clip(-((horizon_start - intervals[:, 0]) // bin_minutes), 0, num_bins) # Ceil: partly covered bins are not usable
+        last_bins = np.clip((intervals[:, 1] - horizon_start) // bin_minutes, 0, num_bins)
+        keep = first_bins < last_bins
+        np.add.at(diff, (rows[keep], first_bins[keep]), 1)
+        np.add.at(diff, (rows[keep], last_bins[keep]), -1)
+    return np.cumsum(diff[:, :-1], axis=1) > 0
+
+def _availability_arrays(speaker_availability: dict[str, list], speakers: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Row ids and (n, 2) minute intervals of the given speakers' availability."""
+    row_ids = []
+    intervals = []
+    for row, speaker in enumerate(speakers):
+        speaker_minutes = time_slots_to_minutes(speaker_availability.get(speaker, []))
+        row_ids.append(np.full(len(speaker_minutes), row, dtype=np.int64))
+        intervals.append(speaker_minutes)
+    if not intervals:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 2), dtype=np.int64)
+    return np.concatenate(row_ids), np.concatenate(intervals)
+
+def _run_starts(bins: np.ndarray, run_length: int) -> np.ndarray:
+    """Indices where run_length consecutive True bins begin."""
+    if run_length <= 0 or run_length > len(bins):
+        return np.zeros(0, dtype=np.int64)
+    running_count = np.r_[0, np.cumsum(bins, dtype=np.int64)]
+    return np.flatnonzero(running_count[run_length:] - running_count[:-run_length] == run_length)
+
+def _longest_run(bins: np.ndarray) -> int:
+    padded = np.r_[False, bins, False].astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max()) if len(edges) else 0
+
+class FeasibilityMatrix:
+    """
+    Packed segment x time-bin feasibility over the recording horizon: bit t of a segment's row is
+    set when every speaker of the segment and the studio are available for the whole bin t.
+    Rows are the AND of the speakers' availability bitmaps and the studio bitmap, all kept packed
+    with np.packbits (one bit per bin). Availability changes update only the affected rows.
+    """
+
+    def __init__(
+        self,
+        segments: list[dict],
+        speaker_availability: dict[str, list],
+        recording_days_times: list,
+        bin_minutes: int = FEASIBILITY_BIN_MINUTES
+    ):
+        """
+        Args:
+            segments: Segments as returned by build_segments_to_schedule (segment_id, speakers, duration).
+            speaker_availability: Speaker -> availability slot strings or (start, end) tuples.
+            recording_days_times: Global recording slot strings or (start, end) tuples; they define the horizon.
+            bin_minutes: Length of one time bin.
+        """
+        self.bin_minutes = bin_minutes
+        self.segment_ids = [str(segment['segment_id']) for segment in segments]
+        self.segment_index = {segment_id: row for row, segment_id in enumerate(self.segment_ids)}
+        self.segment_speakers = [list(segment['speakers']) for segment in segments]
+        self.segment_durations = np.array([float(segment['duration']) for segment in segments], dtype=float)
+        self.speakers = sorted({speaker for speakers in self.segment_speakers for speaker in speakers})
+        self.speaker_index = {speaker: row for row, speaker in enumerate(self.speakers)}
+        self.speaker_availability = {speaker: list(speaker_availability.get(speaker, [])) for speaker in self.speakers}
+        self.recording_days_times = list(recording_days_times)
+
+        # Speaker rows of each segment, padded with an all-ones row for casts smaller than the largest one
+        max_cast = max((len(speakers) for speakers in self.segment_speakers), default=0)
+        self._cast_rows = np.full((len(segments), max_cast), len(self.speakers), dtype=np.int64)
+        for row, speakers in enumerate(self.segment_speakers):
+            self._cast_rows[row, :len(speakers)] = [self.speaker_index[speaker] for speaker in speakers]
+        self._segments_by_speaker = {speaker: [] for speaker in self.speakers}
+        for row, speakers in enumerate(self.segment_speakers):
+            for speaker in speakers:
+                self._segments_by_speaker[speaker].append(row)
+
+        self._build_horizon()
+        self._build_speaker_bits(self.speakers)
+        self._build_segment_bits()
+
+    def _build_horizon(self) -> None:
+        studio_minutes = time_slots_to_minutes(self.recording_days_times)
+        if len(studio_minutes):
+            self.horizon_start = int(studio_minutes[:, 0].min()) // self.bin_minutes * self.bin_minutes
+            self.num_bins = math.ceil((int(studio_minutes[:, 1].max()) - self.horizon_start) / self.bin_minutes)
+        else:
+            self.horizon_start, self.num_bins = 0, 0
+        self._horizon_end = self.horizon_start + self.num_bins * self.bin_minutes
+        studio = _bitmaps(np.zeros(len(studio_minutes), dtype=np.int64), studio_minutes, 1, self.horizon_start, self.num_bins, self.bin_minutes)
+        self.studio_bits = np.packbits(studio, axis=1)[0]
+        # Row len(speakers) is the all-ones padding row of _cast_rows
+        self.speaker_bits = np.full((len(self.speakers) + 1, self.studio_bits.size), 0xFF, dtype=np.uint8)
+
+    def _build_speaker_bits(self, speakers: list[str]) -> None:
+        if not speakers:
+            return
+        rows, intervals = _availability_arrays(self.speaker_availability, speakers)
+        bitmaps = _bitmaps(rows, intervals, len(speakers), self.horizon_start, self.num_bins, self.bin_minutes)
+        self.speaker_bits[[self.speaker_index[speaker] for speaker in speakers]] = np.packbits(bitmaps, axis=1).reshape(len(speakers), -1)
+
+    def _build_segment_bits(self, rows: np.ndarray | list[int] | None = None) -> None:
+        cast_rows = self._cast_rows if rows is None else self._cast_rows[rows]
+        bits = np.repeat(self.studio_bits[None, :], len(cast_rows), axis=0)
+        # One cast column at a time: indexing all columns at once would materialize segments x cast x bytes
+        for column in range(cast_rows.shape[1]):
+            bits &= self.speaker_bits[cast_rows[:, column]]
+        if rows is None:
+            self.bits = bits
+        elif len(rows):
+            self.bits[rows] = bits
+
+    def update_speaker_availability(self, speaker: str, slots: list) -> None:
+        """Replaces one speaker's availability and recomputes only the rows of the segments they appear in."""
+        if speaker not in self.speaker_index:
+            return
+        self.speaker_availability[speaker] = list(slots)
+        self._build_speaker_bits([speaker])
+        self._build_segment_bits(self._segments_by_speaker[speaker])
+
+    def _set_recording_slots(self, recording_days_times: list) -> None:
+        self.recording_days_times = list(recording_days_times)
+        studio_minutes = time_slots_to_minutes(self.recording_days_times)
+        if len(studio_minutes) and (studio_minutes[:, 0].min() < self.horizon_start or studio_minutes[:, 1].max() > self._horizon_end):
+            self._build_horizon()
+            self._build_speaker_bits(self.speakers)
+        else:
+            studio = _bitmaps(np.zeros(len(studio_minutes), dtype=np.int64), studio_minutes, 1, self.horizon_start, self.num_bins, self.bin_minutes)
+            self.studio_bits = np.packbits(studio, axis=1)[0]
+
+    def update_recording_slots(self, recording_days_times: list) -> None:
+        """Replaces the studio slots; the horizon (and with it every bitmap) is rebuilt only when it grows."""
+        self._set_recording_slots(recording_days_times)
+        self._build_segment_bits()
+
+    def update(self, speaker_availability: dict[str, list], recording_days_times: list) -> set[str]:
+        """
+        Brings the matrix up to date with new inputs, touching only what changed.
+
+        Returns:
+            The speakers whose availability changed.
+        """
+        changed_speakers = diff_speaker_availability(self.speaker_availability, {
+            speaker: speaker_availability.get(speaker, []) for speaker in self.speakers
+        })
+        for speaker in changed_speakers:
+            self.speaker_availability[speaker] = list(speaker_availability.get(speaker, []))
+        recording_slots_changed = set(recording_days_times) != set(self.recording_days_times)
+        if recording_slots_changed:
+            self._set_recording_slots(recording_days_times)
+        self._build_speaker_bits(sorted(changed_speakers))
+        if recording_slots_changed:
+            self._build_segment_bits()
+        else:
+            self._build_segment_bits(sorted({row for speaker in changed_speakers for row in self._segments_by_speaker[speaker]}))
+        _log.info(f"Feasibility matrix updated: {len(changed_speakers)} changed speakers, recording slots changed: {recording_slots_changed}.")
+        return changed_speakers
+
+    def has_segments(self, segments: list[dict]) -> bool:
+        """Whether the matrix was built for the same segments (ids, casts and durations)."""
+        return (
+            [str(segment['segment_id']) for segment in segments] == self.segment_ids
+            and [list(segment['speakers']) for segment in segments] == self.segment_speakers
+            and np.array_equal([float(segment['duration']) for segment in segments], self.segment_durations)
+        )
+
+    def bin_start(self, bin_idx: int) -> datetime:
+        return _EPOCH + timedelta(minutes=self.horizon_start + int(bin_idx) * self.bin_minutes)
+
+    def required_bins(self, segment_id: str) -> int:
+        return math.ceil(self.segment_durations[self.segment_index[str(segment_id)]] / 60 / self.bin_minutes)
+
+    def segment_bins(self, segment_id: str) -> np.ndarray:
+        """Bool array of the bins in which the segment can be recorded."""
+        return np.unpackbits(self.bits[self.segment_index[str(segment_id)]], count=self.num_bins).astype(bool)
+
+    def feasible_starts(self, segment_id: str, occupied: np.ndarray | None = None) -> list[datetime]:
+        """Start times (bin starts) at which the whole segment fits, optionally avoiding occupied bins."""
+        bins = self.segment_bins(segment_id)
+        if occupied is not None:
+            bins &= ~occupied
+        return [self.bin_start(bin_idx) for bin_idx in _run_starts(bins, self.required_bins(segment_id))]
+
+    def explain(self, segment_id: str) -> dict:
+        """
+        Diagnoses why a segment cannot be recorded, from its speakers' bitmaps.
+
+        Returns:
+            A dictionary with 'reason' (one of the reason constants), 'required_bins',
+            'longest_run_bins' (longest feasible run), 'common_bins' (bins with the whole cast
+            available, ignoring the studio) and 'speakers': a DataFrame with per-speaker bins of
+            availability, of availability during studio time, and of studio time shared with the cast.
+        """
+        segment_id = str(segment_id)
+        if segment_id not in self.segment_index:
+            return {"reason": UNKNOWN_SEGMENT, "required_bins": 0, "longest_run_bins": 0, "common_bins": 0, "speakers": pd.DataFrame()}
+        row = self.segment_index[segment_id]
+        speakers = self.segment_speakers[row]
+        speaker_rows = [self.speaker_index[speaker] for speaker in speakers]
+        speaker_bins = np.unpackbits(self.speaker_bits[speaker_rows], axis=1, count=self.num_bins).astype(bool)
+        studio = np.unpackbits(self.studio_bits, count=self.num_bins).astype(bool)
+        common = speaker_bins.all(axis=0)
+        feasible = self.segment_bins(segment_id)
+        # Bins a speaker shares with the rest of the cast in studio time, to spot the one who blocks it
+        others_common = [np.delete(speaker_bins, idx, axis=0).all(axis=0) & studio for idx in range(len(speakers))]
+        speaker_table = pd.DataFrame({
+            "speaker": speakers,
+            "available_bins": speaker_bins.sum(axis=1),
+            "available_in_studio_bins": (speaker_bins & studio).sum(axis=1),
+            "shared_with_cast_bins": [int((speaker_bins[idx] & others_common[idx]).sum()) for idx in range(len(speakers))],
+        })
+
+        required_bins = self.required_bins(segment_id)
+        longest_run = _longest_run(feasible)
+        if (speaker_table["available_in_studio_bins"] == 0).any():
+            reason = SPEAKER_WITHOUT_AVAILABILITY
+        elif not common.any():
+            reason = NO_COMMON_AVAILABILITY
+        elif not feasible.any():
+            reason = NO_COMMON_STUDIO_TIME
+        elif longest_run < required_bins:
+            reason = WINDOW_TOO_SHORT
+        else:
+            reason = FEASIBLE
+        return {
+            "reason": reason,
+            "required_bins": required_bins,
+            "longest_run_bins": longest_run,
+            "common_bins": int(common.sum()),
+            "speakers": speaker_table,
+        }
+
+    @classmethod
+    def from_processed(cls, df_processed: pd.DataFrame, speaker_availability: dict[str, list], recording_days_times: list, bin_minutes: int = FEASIBILITY_BIN_MINUTES) -> "FeasibilityMatrix":
+        return cls(build_segments_to_schedule(df_processed), speaker_availability, recording_days_times, bin_minutes)
+
+@timed_stage(
+    "schedule",
+    input_size=lambda df_processed, *args, **kwargs: len(df_processed),
+    output_counts=lambda schedule: {"bookings": len(schedule.bookings), "unassigned_segments": len(schedule.unassigned_segments)}
+)
+def calculate_bitmask_schedule(
+    df_processed: pd.DataFrame,
+    speaker_availability: dict[str, list[str]],
+    recording_days_times: list[str]
+) -> ScheduleResult:
+    """
+    Greedy scheduler over the FeasibilityMatrix: segments are taken in the order of
+    build_segments_to_schedule and booked in the first run of free feasible bins, so bookings
+    start on bin boundaries and keep the rest of their last bin free of other bookings. Same
+    signature and result as calculate_optimal_schedule.
+    """
+    _log.info("Starting bitmask schedule calculation...")
+    segments = build_segments_to_schedule(df_processed)
+    matrix = FeasibilityMatrix(segments, speaker_availability, recording_days_times)
+    occupied = np.zeros(matrix.num_bins, dtype=bool)
+
+    bookings = []
+    unassigned_segments = []
+    for segment in segments:
+        segment_id = str(segment['segment_id'])
+        required_bins = matrix.required_bins(segment_id)
+        run_starts = _run_starts(matrix.segment_bins(segment_id) & ~occupied, required_bins)
+        if not len(run_starts):
+            unassigned_segments.append(segment['segment_id'])
+            continue
+        start_bin = int(run_starts[0])
+        occupied[start_bin:start_bin + required_bins] = True
+        start_dt = matrix.bin_start(start_bin)
+        bookings.append({
+            "segment_id": segment['segment_id'],
+            "room": DEFAULT_ROOM,
+            "start": start_dt,
+            "end": start_dt + timedelta(seconds=float(segment['duration'])),
+            "duration": segment['duration'],
+            "speakers": segment['speakers']
+        })
+
+    _log.info(f"Bitmask schedule calculation completed: {len(bookings)} bookings, {len(unassigned_segments)} unassigned.")
+    return ScheduleResult.from_records(bookings, unassigned_segments, "Generated Schedule")
@@ -0,0 +1,100 @@
+import heapq
+import logging
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from .availability import merge_intervals
+
+_log = logging.getLogger(__name__)
+
+# Sweep event types; ends sort before starts at the same instant, so touching intervals of
+# different speakers do not produce an empty common window
+_END = 0
+_START = 1
+
+def intersect_intervals(interval_lists: list[list[tuple[datetime, datetime]]]) -> list[tuple[datetime, datetime]]:
+    """
+    Intersects k sorted lists of disjoint intervals in one k-way sweep: the start and end events
+    of all lists are merged with a heap, and the common intervals are where every list is open.
+
+    Args:
+        interval_lists: One list of merged (start, end) intervals per speaker.
+
+    Returns:
+        The sorted, disjoint intervals contained in one interval of every list.
+    """
+    if not interval_lists or any(not intervals for intervals in interval_lists):
+        return []
+    if len(interval_lists) == 1:
+        return list(interval_lists[0])
+
+    events = heapq.merge(*(
+        ((time_point, event_type) for start_dt, end_dt in intervals for time_point, event_type in ((start_dt, _START), (end_dt, _END)))
+        for intervals in interval_lists
+    ))
+    common = []
+    open_lists = 0
+    common_start = None
+    for time_point, event_type in events:
+        if event_type == _START:
+            open_lists += 1
+            if open_lists == len(interval_lists):
+                common_start = time_point
+        else:
+            if open_lists == len(interval_lists) and time_point > common_start:
+                common.append((common_start, time_point))
+            open_lists -= 1
+    return common
+
+class CastIntersectionCache:
+    """
+    Common availability of a cast, computed once per distinct set of speakers. Segments with
+    the same cast share one entry; the per-speaker intervals are merged on first use.
+    """
+
+    def __init__(self, parsed_speaker_availability: dict[str, list[tuple[datetime, datetime]]]):
+        self.parsed_speaker_availability = parsed_speaker_availability
+        self._merged = {}
+        self._common = {}
+        self._common_starts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _speaker_intervals(self, speaker: str) -> list[tuple[datetime, datetime]]:
+        if speaker not in self._merged:
+            self._merged[speaker] = merge_intervals(self.parsed_speaker_availability.get(speaker, []))
+        return self._merged[speaker]
+
+    def common_availability(self, speakers: Iterable[str]) -> list[tuple[datetime, datetime]]:
+        """Sorted intervals in which every speaker of the cast is available."""
+        cast = frozenset(speakers)
+        if cast in self._common:
+            self.hits += 1
+            return self._common[cast]
+        self.misses += 1
+        common = intersect_intervals([self._speaker_intervals(speaker) for speaker in cast])
+        self._common[cast] = common
+        self._common_starts[cast] = [start_dt for start_dt, _ in common]
+        return common
+
+    def earliest_common_start(self, speakers: Iterable[str], window_start: datetime, window_end: datetime, duration: float) -> datetime | None:
+        """
+        Earliest start within [window_start, window_end] at which the whole cast is available for
+        duration seconds, or None. The common intervals are searched from the last one starting
+        at or before window_start.
+        """
+        cast = frozenset(speakers)
+        common = self.common_availability(cast)
+        required = timedelta(seconds=float(duration))
+        idx = max(bisect_right(self._common_starts[cast], window_start) - 1, 0)
+        for common_start, common_end in common[idx:]:
+            if common_start >= window_end:
+                break
+            start_dt = max(common_start, window_start)
+            if start_dt + required <= min(common_end, window_end):
+                return start_dt
+        return None
+
+    def stats(self) -> dict[str, int]:
+        return {"casts": len(self._common), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,171 @@
+import pandas as pd
+import logging
+from bisect import bisect_right
+from datetime import datetime
+
+from .availability import merge_intervals
+from .core import build_segments_to_schedule, assign_segments
+from .result import BOOKING_COLUMNS, ScheduleResult
+from .utils import parse_time_slots
+from .validation import outside_intervals
+from utils.metrics import timed_stage
+
+_log = logging.getLogger(__name__)
+
+def diff_speaker_availability(
+    previous_availability: dict[str, list[str]],
+    speaker_availability: dict[str, list[str]]
+) -> set[str]:
+    """Returns the speakers whose set of availability slots differs between the two inputs."""
+    changed_speakers = set()
+    for speaker in set(previous_availability) | set(speaker_availability):
+        if set(previous_availability.get(speaker, [])) != set(speaker_availability.get(speaker, [])):
+            changed_speakers.add(speaker)
+    return changed_speakers
+
+def _subtract_bookings(
+    recording_slots: list[tuple[datetime, datetime]],
+    bookings: list[tuple[datetime, datetime]]
+) -> list[tuple[datetime, datetime]]:
+    """
+    Removes booked intervals from the recording slots, returning the remaining free intervals.
+    The bookings are merged once; each slot is cut only by the merged bookings overlapping it,
+    the first of which is found by binary search.
+    """
+    merged_bookings = merge_intervals(bookings)
+    booking_ends = [book_end for _, book_end in merged_bookings]
+    free_slots = []
+    for rec_start, rec_end in sorted(recording_slots):
+        cursor = rec_start
+        booking_idx = bisect_right(booking_ends, rec_start)
+        while booking_idx < len(merged_bookings) and merged_bookings[booking_idx][0] < rec_end:
+            book_start, book_end = merged_bookings[booking_idx]
+            if book_start > cursor:
+                free_slots.append((cursor, book_start))
+            cursor = max(cursor, book_end)
+            booking_idx += 1
+        if cursor < rec_end:
+            free_slots.append((cursor, rec_end))
+    return free_slots
+
+def _changed_segment_bookings(bookings: pd.DataFrame, speaker_rows: pd.DataFrame, segment_durations: pd.Series) -> pd.Series:
+    """Whether the segment of each booking now has a different duration or cast."""
+    current_casts = speaker_rows[["Segment", "Speaker"]].drop_duplicates()
+    booking_casts = bookings["speakers"].explode().dropna()
+    booked_pairs = pd.MultiIndex.from_arrays([bookings.loc[booking_casts.index, "segment_id"], booking_casts])
+    cast_kept = pd.Series(booked_pairs.isin(pd.MultiIndex.from_frame(current_casts)), index=booking_casts.index).groupby(level=0).all()
+    booked_cast_size = booking_casts.groupby(level=0).nunique().reindex(bookings.index, fill_value=0)
+    same_cast = cast_kept.reindex(bookings.index, fill_value=True) & (booked_cast_size == bookings["segment_id"].map(current_casts.groupby("Segment").size()))
+    return (bookings["duration"] != bookings["segment_id"].map(segment_durations)) | ~same_cast
+
+@timed_stage(
+    "schedule_repair",
+    input_size=lambda previous_schedule, df_processed, *args, **kwargs: len(df_processed),
+    output_counts=lambda schedule: {"bookings": len(schedule.bookings), "repaired_segments": len(schedule.repaired_segments)}
+)
+def repair_schedule(
+    previous_schedule: ScheduleResult,
+    df_processed: pd.DataFrame,
+    previous_availability: dict[str, list[str]],
+    speaker_availability: dict[str, list[str]],
+    previous_recording_days_times: list[str],
+    recording_days_times: list[str]
+) -> ScheduleResult:
+    """
+    Incrementally repairs a previously calculated schedule after availability changes.
+
+    Only bookings invalidated by the change (no longer fully inside a speaker's availability or
+    a recording slot, segment duration changed) are unassigned; they are reinserted
+    together with previously unassigned segments that may now fit. Every other booking keeps
+    its time.
+
+    Args:
+        previous_schedule: ScheduleResult returned by calculate_optimal_schedule (or a previous repair).
+        df_processed: DataFrame with processed segment data.
+        previous_availability: Speaker availability the previous schedule was calculated with.
+        speaker_availability: Current speaker availability.
+        previous_recording_days_times: Global recording slots the previous schedule was calculated with.
+        recording_days_times: Current global recording slots.
+
+    Returns:
+        A ScheduleResult with the repaired schedule; the segment ids that were (re)inserted
+        are listed in repaired_segments.
+    """
+    _log.info("Starting incremental schedule repair...")
+
+    changed_speakers = diff_speaker_availability(previous_availability, speaker_availability)
+    removed_recording_slots = parse_time_slots(sorted(set(previous_recording_days_times) - set(recording_days_times)))
+    recording_slots_added = bool(set(recording_days_times) - set(previous_recording_days_times))
+    _log.info(f"Changed speakers: {sorted(changed_speakers)}, removed recording slots: {len(removed_recording_slots)}, recording slots added: {recording_slots_added}")
+
+    # The segments are compared column-wise; segment dictionaries are only built for the reinserted ones
+    speaker_rows = df_processed[df_processed['Speaker'] != '']
+    segment_durations = speaker_rows.groupby('Segment')['SegmentDuration'].sum()
+    segment_durations = segment_durations[segment_durations > 0]
+    speaker_rows = speaker_rows[speaker_rows['Segment'].isin(segment_durations.index)]
+
+    previous_bookings = previous_schedule.bookings.reset_index(drop=True)
+    existing = previous_bookings['segment_id'].isin(segment_durations.index)
+    if not existing.all():
+        _log.info(f"  Dropping the bookings of {int((~existing).sum())} segments that no longer exist.")
+    previous_bookings = previous_bookings[existing]
+    invalidated = _changed_segment_bookings(previous_bookings, speaker_rows, segment_durations)
+
+    parsed_recording_slots = parse_time_slots(recording_days_times)
+    # Only a removed or changed slot can leave a booking outside the studio time
+    if removed_recording_slots:
+        invalidated |= outside_intervals(previous_bookings, parsed_recording_slots)
+
+    # Only the bookings of speakers whose availability changed are checked, found through a speaker index;
+    # each must still lie fully inside the speaker's availability, the containment test of validate_schedule
+    booked_speakers = previous_bookings['speakers'].explode().dropna()
+    bookings_by_speaker = booked_speakers.index.groupby(booked_speakers.to_numpy())
+    parsed_speaker_availability = {}
+    for speaker in changed_speakers.intersection(bookings_by_speaker):
+        parsed_speaker_availability[speaker] = parse_time_slots(speaker_availability.get(speaker, []))
+        speaker_bookings = previous_bookings.loc[bookings_by_speaker[speaker]]
+        outside = outside_intervals(speaker_bookings, parsed_speaker_availability[speaker])
+        invalidated.loc[outside.index[outside]] = True
+
+    kept_bookings = previous_bookings[~invalidated]
+    affected_segment_ids = set(previous_bookings.loc[invalidated, 'segment_id'])
+
+    # Previously unassigned segments get another chance when their cast or the studio gained time
+    previously_unassigned = speaker_rows[speaker_rows['Segment'].isin(previous_schedule.unassigned_segments)]
+    if recording_slots_added:
+        affected_segment_ids.update(previously_unassigned['Segment'])
+    else:
+        affected_segment_ids.update(previously_unassigned.loc[previously_unassigned['Speaker'].isin(changed_speakers), 'Segment'])
+
+    # Segments that appeared since the previous schedule are inserted as well
+    known_segment_ids = set(previous_schedule.bookings['segment_id'])
+    known_segment_ids.update(previous_schedule.unassigned_segments)
+    affected_segment_ids.update(segment_id for segment_id in segment_durations.index if segment_id not in known_segment_ids)
+
+    new_bookings = []
+    unassigned_segments = [
+        segment_id for segment_id in previous_schedule.unassigned_segments
+        if segment_id in segment_durations.index and segment_id not in affected_segment_ids
+    ]
+    repaired_segments = []
+
+    if affected_segment_ids:
+        segments_to_reinsert = build_segments_to_schedule(df_processed[df_processed['Segment'].isin(affected_segment_ids)])
+        for segment in segments_to_reinsert:
+            for speaker in segment['speakers']:
+                if speaker not in parsed_speaker_availability:
+                    parsed_speaker_availability[speaker] = parse_time_slots(speaker_availability.get(speaker, []))
+
+        free_recording_slots = _subtract_bookings(
+            parsed_recording_slots,
+            list(zip(kept_bookings['start'].dt.to_pydatetime(), kept_bookings['end'].dt.to_pydatetime()))
+        )
+        assign_segments(segments_to_reinsert, free_recording_slots, parsed_speaker_availability, new_bookings, unassigned_segments)
+        repaired_segments = [segment['segment_id'] for segment in segments_to_reinsert]
+
+    _log.info(f"Schedule repair completed. Kept {len(kept_bookings)} bookings, reinserted {len(affected_segment_ids)} segments.")
+    bookings = pd.concat(
+        [kept_bookings, ScheduleResult.from_records(new_bookings, [], "").bookings],
+        ignore_index=True
+    ) if new_bookings else kept_bookings.reset_index(drop=True)
+    return ScheduleResult(bookings[BOOKING_COLUMNS], unassigned_segments, "Repaired Schedule", repaired_segments)
@@ -0,0 +1,50 @@
+import pandas as pd
+from dataclasses import dataclass, field
+
+# Only one recording studio is modelled; the column keeps the layout ready for more rooms
+DEFAULT_ROOM = "Štúdio"
+
+BOOKING_COLUMNS = ["segment_id", "room", "start", "end", "duration", "speakers"]
+
+def _empty_bookings() -> pd.DataFrame:
+    return pd.DataFrame({
+        "segment_id": pd.Series(dtype=object),
+        "room": pd.Series(dtype=object),
+        "start": pd.Series(dtype='datetime64[ns]'),
+        "end": pd.Series(dtype='datetime64[ns]'),
+        "duration": pd.Series(dtype=float),
+        "speakers": pd.Series(dtype=object),
+    })
+
+@dataclass
+class ScheduleResult:
+    """
+    Columnar result of a scheduler run.
+
+    bookings has one row per assigned segment: segment_id, room, start/end (datetime64),
+    duration (seconds) and speakers (list of speaker names). Formatting for display is left to the UI.
+    """
+    bookings: pd.DataFrame = field(default_factory=_empty_bookings)
+    unassigned_segments: list[str] = field(default_factory=list)
+    status: str = "Generated Schedule"
+    repaired_segments: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_records(cls, records: list[dict], unassigned_segments: list[str], status: str, repaired_segments: list[str] | None = None) -> "ScheduleResult":
+        """Builds a result from booking dictionaries with the BOOKING_COLUMNS keys."""
+        if records:
+            bookings = pd.DataFrame.from_records(records, columns=BOOKING_COLUMNS)
+            bookings["segment_id"] = bookings["segment_id"].astype(object)
+            bookings["room"] = bookings["room"].astype(object)
+            bookings["start"] = pd.to_datetime(bookings["start"]).astype('datetime64[ns]')
+            bookings["end"] = pd.to_datetime(bookings["end"]).astype('datetime64[ns]')
+            bookings["duration"] = bookings["duration"].astype(float)
+        else:
+            bookings = _empty_bookings()
+        return cls(bookings, list(unassigned_segments), status, list(repaired_segments or []))
+
+    @property
+    def speaker_bookings(self) -> pd.DataFrame:
+        """Bookings exploded to one row per (segment, speaker), with the speaker in the 'speaker' column."""
+        exploded = self.bookings.explode("speakers", ignore_index=True).rename(columns={"speakers": "speaker"})
+        return exploded[exploded["speaker"].notna()]
@@ -0,0 +1,103 @@
+import pandas as pd
+import logging
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
+
+from analyzer.data_processing import process_parsed_data
+from .core import calculate_optimal_schedule
+from .summary import summarize_speaker_schedule
+
+_log = logging.getLogger(__name__)
+
+def build_scenario_grid(
+    nominal_duration_variants: list[tuple[str, dict[int, int]]],
+    recording_slot_variants: list[tuple[str, list[str]]],
+    availability_override_variants: list[tuple[str, dict[str, list[str]]]] | None = None
+) -> list[dict]:
+    """
+    Builds the cartesian product of named parameter variants.
+
+    Args:
+        nominal_duration_variants: (name, nominal_durations) pairs.
+        recording_slot_variants: (name, recording_days_times) pairs.
+        availability_override_variants: (name, {speaker: slots}) pairs replacing the availability of the listed speakers.
+
+    Returns:
+        A list of scenario dictionaries accepted by run_scenario_sweep.
+    """
+    if not availability_override_variants:
+        availability_override_variants = [("", {})]
+
+    scenarios = []
+    for (nominal_name, nominal_durations), (slots_name, recording_days_times), (override_name, overrides) in itertools.product(
+        nominal_duration_variants, recording_slot_variants, availability_override_variants
+    ):
+        scenarios.append({
+            "name": " | ".join(name for name in (nominal_name, slots_name, override_name) if name),
+            "nominal_durations": nominal_durations,
+            "recording_days_times": recording_days_times,
+            "availability_overrides": overrides
+        })
+    return scenarios
+
+def evaluate_scenario(parsed_data: list[dict], speaker_availability: dict[str, list[str]], scenario: dict) -> dict:
+    """Runs processing, scheduling and summary for one scenario and returns its comparison metrics."""
+    df_processed = process_parsed_data(parsed_data, scenario["nominal_durations"])
+    availability = {**speaker_availability, **scenario.get("availability_overrides", {})}
+    schedule = calculate_optimal_schedule(df_processed, availability, scenario["recording_days_times"])
+
+    bookings = schedule.bookings
+    speaker_summary_df = summarize_speaker_schedule(schedule)
+    return {
+        "Scenario": scenario["name"],
+        "DaysUsed": int(bookings["start"].dt.normalize().nunique()),
+        "AssignedSegments": len(bookings),
+        "UnassignedSegments": len(schedule.unassigned_segments),
+        "TotalRecordingTime": float(bookings["duration"].sum()),
+        "IdleTime": float(speaker_summary_df["IdleTime"].sum()) if not speaker_summary_df.empty else 0.0
+    }
+
+def run_scenario_sweep(
+    parsed_data: list[dict],
+    speaker_availability: dict[str, list[str]],
+    scenarios: list[dict],
+    max_workers: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None
+) -> pd.DataFrame:
+    """
+    Evaluates every scenario in a process pool.
+
+    Args:
+        parsed_data: Raw parsed rows (as returned by the parser).
+        speaker_availability: Base speaker availability, overridden per scenario.
+        scenarios: Scenario dictionaries, e.g. from build_scenario_grid.
+        max_workers: Size of the process pool (defaults to the number of CPUs).
+        on_progress: Called with (finished, total) after every evaluated scenario; an exception
+                     it raises (e.g. JobCancelled) cancels the scenarios not started yet.
+
+    Returns:
+        A DataFrame with one row per scenario: days used, assigned/unassigned segments,
+        total recording time and speaker idle time (seconds).
+    """
+    if not scenarios:
+        return pd.DataFrame()
+
+    _log.info(f"Running scenario sweep with {len(scenarios)} scenarios...")
+    results = [None] * len(scenarios)
+    # The sweep runs in a worker thread of a multithreaded server; forking it could copy locks held by other threads
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        futures = {
+            executor.submit(evaluate_scenario, parsed_data, speaker_availability, scenario): scenario_idx
+            for scenario_idx, scenario in enumerate(scenarios)
+        }
+        for finished, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if on_progress is not None:
+                on_progress(finished, len(scenarios))
+    finally:
+        executor.shutdown(cancel_futures=True)
+    _log.info("Scenario sweep completed.")
+    return pd.DataFrame(results)
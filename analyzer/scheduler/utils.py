@@ -1,6 +1,10 @@
 import logging
+import re
+import numpy as np
 from datetime import datetime, timedelta
 
+P_TIME_SLOT = re.compile(r"\s*(\d{4}-\d{2}-\d{2})\s+(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*")
+
 _log = logging.getLogger(__name__)
 
 def parse_time_slot(time_str: str) -> tuple[datetime, datetime] | None:
@@ -22,3 +26,58 @@ def parse_time_slot(time_str: str) -> tuple[datetime, datetime] | None:
     except ValueError as e:
         _log.error(f"Invalid time slot format '{time_str}': {e}. Expected 'YYYY-MM-DD HH:MM-HH:MM'.")
         return None
+
+def parse_time_slots(slot_strings: list[str | tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """Parses a list of time slot strings, skipping invalid entries. Already parsed (start, end) tuples are kept as they are."""
+    parsed_slots = []
+    for slot_str in slot_strings:
+        if isinstance(slot_str, tuple):
+            parsed_slots.append(slot_str)
+            continue
+        parsed_slot = parse_time_slot(slot_str)
+        if parsed_slot:
+            parsed_slots.append(parsed_slot)
+    return parsed_slots
+
+def time_slots_to_minutes(slot_strings: list[str | tuple[datetime, datetime]]) -> np.ndarray:
+    """
+    Parses time slot strings into an (n, 2) int64 array of start/end minutes since the epoch.
+    Invalid entries are skipped; overnight slots are extended into the next day.
+    Already parsed (start, end) tuples are converted directly.
+    """
+    dates, start_minutes, end_minutes = [], [], []
+    parsed_intervals = []
+    for slot_str in slot_strings:
+        if isinstance(slot_str, tuple):
+            parsed_intervals.append(slot_str)
+            continue
+        match = P_TIME_SLOT.fullmatch(slot_str)
+        if match:
+            date_part, start_h, start_m, end_h, end_m = match.groups()
+            start_h, start_m, end_h, end_m = int(start_h), int(start_m), int(end_h), int(end_m)
+        if not match or start_h > 23 or end_h > 23 or start_m > 59 or end_m > 59:
+            _log.error(f"Invalid time slot format '{slot_str}'. Expected 'YYYY-MM-DD HH:MM-HH:MM'.")
+            continue
+        dates.append(date_part)
+        start_minutes.append(start_h * 60 + start_m)
+        end_minutes.append(end_h * 60 + end_m)
+
+    interval_minutes = np.array(
+        [[_datetime_to_minutes(start_dt), _datetime_to_minutes(end_dt)] for start_dt, end_dt in parsed_intervals],
+        dtype=np.int64
+    ).reshape(-1, 2)
+    if not dates:
+        return interval_minutes
+
+    try:
+        day_minutes = np.array(dates, dtype='datetime64[D]').astype(np.int64) * 1440
+    except ValueError as e:
+        _log.error(f"Invalid date in time slots: {e}. Falling back to per-slot parsing.")
+        return time_slots_to_minutes(parse_time_slots(slot_strings))
+    start = day_minutes + np.array(start_minutes, dtype=np.int64)
+    end = day_minutes + np.array(end_minutes, dtype=np.int64)
+    end = np.where(end < start, end + 1440, end) # Overnight slots
+    return np.concatenate((np.column_stack((start, end)), interval_minutes))
+
+def _datetime_to_minutes(dt: datetime) -> int:
+    return int(np.datetime64(dt, 'm').astype(np.int64))
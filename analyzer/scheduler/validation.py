@@ -0,0 +1,141 @@
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .availability import merge_intervals
+from .result import BOOKING_COLUMNS
+from .utils import parse_time_slots
+
+_log = logging.getLogger(__name__)
+
+VIOLATION_COLUMNS = ["kind", "segment_id", "speaker", "room", "start", "end", "detail"]
+
+# Violation kinds, in the order they are reported
+INVALID_BOOKING = "invalid_booking" # Missing or non-positive time range
+SPEAKER_DOUBLE_BOOKING = "speaker_double_booking"
+ROOM_OVERLAP = "room_overlap" # Two bookings in the same studio at the same time
+OUTSIDE_RECORDING_SLOTS = "outside_recording_slots" # Studio-slot overflow
+OUTSIDE_AVAILABILITY = "outside_availability"
+DROPPED_SEGMENT = "dropped_segment"
+DUPLICATE_SEGMENT = "duplicate_segment"
+UNKNOWN_SEGMENT = "unknown_segment"
+
+def _violations(kind: str, rows: pd.DataFrame, detail: pd.Series | str) -> pd.DataFrame:
+    return pd.DataFrame({
+        "kind": kind,
+        "segment_id": rows["segment_id"].astype(str),
+        "speaker": rows["speaker"] if "speaker" in rows else None,
+        "room": rows["room"],
+        "start": rows["start"],
+        "end": rows["end"],
+        "detail": detail,
+    }, columns=VIOLATION_COLUMNS)
+
+def _find_overlaps(intervals: pd.DataFrame, key: str) -> pd.DataFrame:
+    """
+    Sweep over the intervals sorted by key and start: an interval overlaps an earlier one of the
+    same key when it starts before the latest end seen so far. Adds the 'overlaps_segment' column
+    (the earlier segment holding that end) and returns the overlapping rows. A segment booked
+    twice is reported as a duplicate instead, not as overlapping itself.
+    """
+    intervals = intervals.sort_values([key, "start"], kind="stable")
+    groups = intervals.groupby(key, sort=False)
+    running_end = groups["end"].cummax()
+    # Segment whose end is the running maximum, carried forward within the key
+    running_segment = intervals["segment_id"].astype(str).where(intervals["end"] == running_end)
+    previous_end = running_end.groupby(intervals[key], sort=False).shift()
+    previous_segment = running_segment.groupby(intervals[key], sort=False).ffill().groupby(intervals[key], sort=False).shift()
+    overlapping = (intervals["start"] < previous_end) & (previous_segment != intervals["segment_id"].astype(str))
+    return intervals[overlapping].assign(overlaps_segment=previous_segment[overlapping])
+
+def outside_intervals(bookings: pd.DataFrame, allowed: list[tuple[datetime, datetime]]) -> pd.Series:
+    """
+    Whether each booking is not contained in one of the allowed intervals: the merged intervals
+    are searched for the last one starting at or before the booking start.
+    """
+    merged = merge_intervals(allowed)
+    if not merged:
+        return pd.Series(True, index=bookings.index)
+    starts = np.array([start for start, _ in merged], dtype="datetime64[ns]")
+    ends = np.array([end for _, end in merged], dtype="datetime64[ns]")
+    candidate = np.searchsorted(starts, bookings["start"].to_numpy(dtype="datetime64[ns]"), side="right") - 1
+    contained = (candidate >= 0) & (bookings["end"].to_numpy(dtype="datetime64[ns]") <= ends[np.maximum(candidate, 0)])
+    return pd.Series(~contained, index=bookings.index)
+
+def required_segment_ids(df_processed: pd.DataFrame) -> set[str]:
+    """Ids of the segments build_segments_to_schedule would schedule: with a speaker and a positive duration."""
+    segment_durations = df_processed[df_processed["Speaker"] != ""].groupby("Segment")["SegmentDuration"].sum()
+    return set(segment_durations.index[segment_durations > 0].astype(str))
+
+def validate_schedule(
+    bookings: pd.DataFrame,
+    df_processed: pd.DataFrame,
+    speaker_availability: dict[str, list],
+    recording_days_times: list
+) -> pd.DataFrame:
+    """
+    Checks a generated, hand-edited or imported schedule in O(n log n): the bookings are sorted
+    once per check and swept, and containment is checked by binary search over merged intervals.
+
+    Args:
+        bookings: Bookings with the ScheduleResult columns (segment_id, room, start, end, speakers).
+        df_processed: Processed script DataFrame, defining the segments that must be scheduled.
+        speaker_availability: Speaker -> availability slot strings or (start, end) tuples.
+        recording_days_times: Global recording slot strings or (start, end) tuples.
+
+    Returns:
+        One row per violation with the VIOLATION_COLUMNS; empty when the schedule is valid.
+    """
+    bookings = bookings.reindex(columns=BOOKING_COLUMNS).reset_index(drop=True)
+    bookings["start"] = pd.to_datetime(bookings["start"], errors="coerce")
+    bookings["end"] = pd.to_datetime(bookings["end"], errors="coerce")
+    violations = []
+
+    invalid = bookings["start"].isna() | bookings["end"].isna() | (bookings["end"] <= bookings["start"])
+    if invalid.any():
+        violations.append(_violations(INVALID_BOOKING, bookings[invalid], "Chýba začiatok/koniec alebo koniec nie je po začiatku."))
+    timed = bookings[~invalid]
+
+    speaker_bookings = timed.explode("speakers", ignore_index=True).rename(columns={"speakers": "speaker"})
+    speaker_bookings = speaker_bookings[speaker_bookings["speaker"].notna() & (speaker_bookings["speaker"] != "")]
+
+    double_bookings = _find_overlaps(speaker_bookings, "speaker")
+    if not double_bookings.empty:
+        violations.append(_violations(SPEAKER_DOUBLE_BOOKING, double_bookings, "Prekrýva sa so segmentom " + double_bookings["overlaps_segment"]))
+
+    room_overlaps = _find_overlaps(timed.assign(room=timed["room"].fillna("")), "room")
+    if not room_overlaps.empty:
+        violations.append(_violations(ROOM_OVERLAP, room_overlaps, "Štúdio je v tom čase obsadené segmentom " + room_overlaps["overlaps_segment"]))
+
+    outside_slots = outside_intervals(timed, parse_time_slots(recording_days_times))
+    if outside_slots.any():
+        violations.append(_violations(OUTSIDE_RECORDING_SLOTS, timed[outside_slots], "Presahuje časy nahrávania štúdia."))
+
+    outside_availability = pd.concat([
+        outside_intervals(rows, parse_time_slots(speaker_availability.get(speaker, [])))
+        for speaker, rows in speaker_bookings.groupby("speaker", sort=False)
+    ]) if not speaker_bookings.empty else pd.Series(dtype=bool)
+    unavailable = speaker_bookings.loc[outside_availability[outside_availability].index]
+    if not unavailable.empty:
+        violations.append(_violations(OUTSIDE_AVAILABILITY, unavailable, unavailable["speaker"] + " nie je v tomto čase dostupný."))
+
+    booked_ids = bookings["segment_id"].astype(str)
+    required_ids = required_segment_ids(df_processed)
+    dropped_ids = sorted(required_ids - set(booked_ids), key=lambda segment_id: (len(segment_id), segment_id))
+    if dropped_ids:
+        dropped = pd.DataFrame({"segment_id": dropped_ids, "room": None, "start": pd.NaT, "end": pd.NaT})
+        violations.append(_violations(DROPPED_SEGMENT, dropped, "Segment nie je naplánovaný."))
+    duplicated = booked_ids.duplicated(keep="first")
+    if duplicated.any():
+        violations.append(_violations(DUPLICATE_SEGMENT, bookings[duplicated], "Segment je naplánovaný viackrát."))
+    unknown = ~booked_ids.isin(required_ids)
+    if unknown.any():
+        violations.append(_violations(UNKNOWN_SEGMENT, bookings[unknown], "Segment sa v scenári nenachádza."))
+
+    if not violations:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    result = pd.concat(violations, ignore_index=True)
+    _log.info(f"Schedule validation found {len(result)} violations in {len(bookings)} bookings.")
+    return result
@@ -0,0 +1,107 @@
+import pandas as pd
+import numpy as np
+import logging
+
+_log = logging.getLogger(__name__)
+
+class ScriptTableIndex:
+    """
+    Row indexes over the parsed script table, built once per parsed document, so that
+    filtering by speaker, segment range or scene costs time proportional to the result
+    instead of a scan of every row.
+
+    - speaker -> sorted row ids
+    - segment number -> row range, via binary search over the segment numbers in row order
+    - scene -> row range from its scene marker row up to the next scene marker
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.num_rows = len(df)
+
+        speakers = df['Speaker'].astype(str).to_numpy() if 'Speaker' in df.columns else np.full(self.num_rows, '', dtype=object)
+        speaker_order = np.argsort(speakers, kind='stable')
+        sorted_speakers = speakers[speaker_order]
+        boundaries = np.flatnonzero(sorted_speakers[1:] != sorted_speakers[:-1]) + 1
+        self.speaker_rows = {
+            speaker: rows for speaker, rows in zip(
+                sorted_speakers[np.r_[0, boundaries]] if self.num_rows else [],
+                np.split(speaker_order, boundaries) if self.num_rows else []
+            ) if speaker
+        }
+
+        # Segments are numbered in document order, so rows are normally already sorted by segment
+        segments = pd.to_numeric(df['Segment'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64) if 'Segment' in df.columns else np.full(self.num_rows, -1, dtype=np.int64)
+        if np.all(segments[1:] >= segments[:-1]):
+            self._segment_order = None
+            self._sorted_segments = segments
+        else:
+            _log.warning("Segments are not in document order, segment filtering falls back to a sorted copy.")
+            self._segment_order = np.argsort(segments, kind='stable')
+            self._sorted_segments = segments[self._segment_order]
+
+        scene_markers = df['Scene Marker'].astype(str).to_numpy() if 'Scene Marker' in df.columns else np.full(self.num_rows, '', dtype=object)
+        self.scene_starts = np.flatnonzero(scene_markers != '')
+        self.scene_labels = [f"{row + 1}: {scene_markers[row]}" for row in self.scene_starts]
+        _log.info(f"Built script table index: {self.num_rows} rows, {len(self.speaker_rows)} speakers, {len(self.scene_starts)} scenes.")
+
+    @property
+    def speakers(self) -> list[str]:
+        return sorted(self.speaker_rows)
+
+    @property
+    def segment_bounds(self) -> tuple[int, int]:
+        """(lowest, highest) segment number, ignoring rows without a numeric segment."""
+        valid_segments = self._sorted_segments[np.searchsorted(self._sorted_segments, 0):]
+        if not len(valid_segments):
+            return 0, 0
+        return int(valid_segments[0]), int(valid_segments[-1])
+
+    def _segment_rows(self, first_segment: int, last_segment: int) -> tuple[int, int] | np.ndarray:
+        """Rows of the segment range, as a [start, stop) row range when rows are in segment order."""
+        start = np.searchsorted(self._sorted_segments, first_segment, side='left')
+        stop = np.searchsorted(self._sorted_segments, last_segment, side='right')
+        if self._segment_order is None:
+            return int(start), int(stop)
+        return np.sort(self._segment_order[start:stop])
+
+    def _scene_range(self, scene_idx: int) -> tuple[int, int]:
+        start = int(self.scene_starts[scene_idx])
+        stop = int(self.scene_starts[scene_idx + 1]) if scene_idx + 1 < len(self.scene_starts) else self.num_rows
+        return start, stop
+
+    def query(self, speakers: list[str] | None = None, segment_range: tuple[int, int] | None = None, scene_idx: int | None = None) -> np.ndarray:
+        """
+        Returns the sorted row ids matching all given filters.
+
+        Args:
+            speakers: Rows of any of these speakers (None or empty for no speaker filter).
+            segment_range: Inclusive (first, last) segment numbers.
+            scene_idx: Position of the scene in scene_labels.
+        """
+        row_start, row_stop = 0, self.num_rows
+        row_subset = None
+        if segment_range is not None:
+            segment_rows = self._segment_rows(*segment_range)
+            if isinstance(segment_rows, tuple):
+                row_start, row_stop = segment_rows
+            else:
+                row_subset = segment_rows
+        if scene_idx is not None:
+            scene_start, scene_stop = self._scene_range(scene_idx)
+            row_start, row_stop = max(row_start, scene_start), min(row_stop, scene_stop)
+
+        if speakers:
+            speaker_rows = [self.speaker_rows[speaker] for speaker in speakers if speaker in self.speaker_rows]
+            rows = np.sort(np.concatenate(speaker_rows)) if speaker_rows else np.empty(0, dtype=np.int64)
+            if row_subset is not None:
+                rows = np.intersect1d(rows, row_subset, assume_unique=True)
+        elif row_subset is not None:
+            rows = row_subset
+        else:
+            return np.arange(row_start, max(row_start, row_stop))
+        return rows[np.searchsorted(rows, row_start):np.searchsorted(rows, row_stop)]
+
+def page_rows(row_ids: np.ndarray, page: int, page_size: int) -> np.ndarray:
+    """Row ids of one 1-based page."""
+    start = (page - 1) * page_size
+    return row_ids[start:start + page_size]
@@ -0,0 +1,125 @@
+import pandas as pd
+import numpy as np
+import bisect
+import logging
+import re
+import unicodedata
+
+_log = logging.getLogger(__name__)
+
+P_TOKEN = re.compile(r"\w+")
+P_QUERY_CLAUSE = re.compile(r'"([^"]*)"|(\S+)')
+
+HIT_COLUMNS = ["Episode", "Row", "Segment", "Speaker", "Timecode", "TimecodeMs", "Text"]
+
+def normalize_text(text: str) -> str:
+    """Case-folds text and strips diacritics, so that 'Žena', 'zena' and 'ŽENA' compare equal."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+def tokenize(text: str) -> list[str]:
+    return P_TOKEN.findall(normalize_text(text))
+
+class TextIndex:
+    """
+    Positional inverted index over the dialogue text of one episode.
+
+    Query syntax (all clauses must match the same row):
+    - word       rows containing the token
+    - word*      rows containing a token starting with the prefix
+    - "a b c"    rows containing the tokens as a phrase (tokens may end with * too)
+    """
+
+    def __init__(self, df: pd.DataFrame, episode: str = ""):
+        self.episode = episode
+        self.num_rows = len(df)
+        column = lambda name: df[name].astype(str).to_numpy() if name in df.columns else np.full(self.num_rows, '', dtype=object)
+        self.texts = column('Text')
+        self.speakers = column('Speaker')
+        self.segments = column('Segment')
+        self.timecodes = column('Timecode')
+        self.segment_numbers = pd.to_numeric(pd.Series(self.segments), errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+
+        # Lines without a timecode inherit the last timecode above them
+        seconds = df['TimeInSeconds'] if 'TimeInSeconds' in df.columns else pd.Series(0.0, index=df.index)
+        seconds = seconds.where(pd.Series(self.timecodes, index=df.index) != '').ffill()
+        self.timecodes_ms = (seconds * 1000).round().astype('Int64').to_numpy()
+
+        self.postings: dict[str, dict[int, list[int]]] = {}
+        for row, text in enumerate(self.texts):
+            for position, token in enumerate(tokenize(text)):
+                self.postings.setdefault(token, {}).setdefault(row, []).append(position)
+        self.vocabulary = sorted(self.postings)
+        _log.info(f"Built text index for '{episode}': {self.num_rows} rows, {len(self.vocabulary)} distinct tokens.")
+
+    def _token_postings(self, token: str) -> list[dict[int, list[int]]]:
+        """Postings of a token, or of every vocabulary token with the prefix if it ends with '*'."""
+        if not token.endswith('*'):
+            return [self.postings[token]] if token in self.postings else []
+        prefix = token[:-1]
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        # Tokens sharing the prefix form one contiguous run of the sorted vocabulary
+        stop = bisect.bisect_left(self.vocabulary, prefix + '\U0010ffff', lo=start)
+        return [self.postings[candidate] for candidate in self.vocabulary[start:stop]]
+
+    def _match_clause(self, tokens: list[str]) -> set[int]:
+        """Rows containing the tokens at consecutive positions."""
+        token_postings = [self._token_postings(token) for token in tokens]
+        rows = set.intersection(*(set().union(*postings) for postings in token_postings))
+        if len(tokens) == 1 or not rows:
+            return rows
+
+        def positions(postings: list[dict[int, list[int]]], row: int) -> set[int]:
+            return {position for posting in postings for position in posting.get(row, ())}
+
+        phrase_rows = set()
+        for row in rows:
+            token_positions = [positions(postings, row) for postings in token_postings]
+            if any(all(start + offset in token_positions[offset] for offset in range(1, len(tokens))) for start in token_positions[0]):
+                phrase_rows.add(row)
+        return phrase_rows
+
+    def search(self, query: str, speakers: list[str] | None = None, segment_range: tuple[int, int] | None = None) -> pd.DataFrame:
+        """
+        Finds the rows matching a query, optionally limited to some speakers and an inclusive segment range.
+
+        Returns:
+            A DataFrame with HIT_COLUMNS in row order; TimecodeMs is the row's (or the last preceding) timecode in milliseconds.
+        """
+        rows = None
+        for phrase, word in P_QUERY_CLAUSE.findall(query):
+            # Keep a trailing '*' through normalization, it marks a prefix query
+            tokens = [token + ('*' if raw.endswith('*') else '') for raw in (phrase or word).split() for token in tokenize(raw)]
+            if not tokens:
+                continue
+            clause_rows = self._match_clause(tokens)
+            rows = clause_rows if rows is None else rows & clause_rows
+            if not rows:
+                break
+        if not rows:
+            return pd.DataFrame(columns=HIT_COLUMNS)
+
+        row_ids = np.array(sorted(rows), dtype=np.int64)
+        if speakers:
+            row_ids = row_ids[np.isin(self.speakers[row_ids], speakers)]
+        if segment_range is not None:
+            segment_numbers = self.segment_numbers[row_ids]
+            row_ids = row_ids[(segment_numbers >= segment_range[0]) & (segment_numbers <= segment_range[1])]
+
+        return pd.DataFrame({
+            "Episode": self.episode,
+            "Row": row_ids,
+            "Segment": self.segments[row_ids],
+            "Speaker": self.speakers[row_ids],
+            "Timecode": self.timecodes[row_ids],
+            "TimecodeMs": self.timecodes_ms[row_ids],
+            "Text": self.texts[row_ids],
+        }, columns=HIT_COLUMNS)
+
+def search_episodes(indexes: list[TextIndex], query: str, speakers: list[str] | None = None, segment_range: tuple[int, int] | None = None) -> pd.DataFrame:
+    """Runs a query over several episodes (e.g. a season) and concatenates the hits in episode order."""
+    hits = [index.search(query, speakers, segment_range) for index in indexes]
+    hits = [episode_hits for episode_hits in hits if not episode_hits.empty]
+    if not hits:
+        return pd.DataFrame(columns=HIT_COLUMNS)
+    return pd.concat(hits, ignore_index=True)
@@ -0,0 +1,350 @@
+"""
+Local HTTP API for studio tools: script parsing, the speaker-segment matrix and scheduling.
+
+Work runs as jobs on the shared JobQueue, so the API and the Streamlit UI (when the API is
+started inside the app) share the worker pool, the conversion slot and the artifact cache.
+Clients submit a job, poll it and download its tables as streamed JSON or Arrow IPC.
+
+    POST   /jobs/parse?episode=E01&durations=1:60,2:90   body: DOCX bytes      -> 202 job
+    POST   /jobs/schedule   body: {"parse_job_id", "speaker_availability", "recording_slots"} -> 202 job
+    GET    /jobs/<id>                                      job status and result summary
+    DELETE /jobs/<id>                                      cancel
+    GET    /jobs/<id>/rows|matrix|bookings?format=json|arrow
+    GET    /health                                         queue and cache statistics
+
+Usage (from the repository root):
+    python -m api.server --port 8600
+"""
+import argparse
+import io
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from pipeline import apply_nominal_durations, run_schedule_job, run_script_pipeline
+from utils.artifact_cache import ArtifactCache, content_hash, get_artifact_cache
+from utils.job_queue import Job, JobQueue, QueueFullError, get_job_queue
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_NOMINAL_DURATIONS = {1: 60, 2: 90, 3: 120, 4: 150, 5: 200}
+MAX_UPLOAD_BYTES = 200 * 2**20
+STREAM_BATCH_ROWS = 5_000
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# Downloadable tables per job kind: name -> function of the job result
+RESULT_TABLES = {
+    "script": {
+        "rows": lambda result: result["df_processed"],
+        "matrix": lambda result: result["speaker_matrix"].rename_axis("Speaker").reset_index(),
+    },
+    "schedule": {
+        "bookings": lambda result: result.bookings,
+    },
+}
+
+class ApiError(Exception):
+    """Raised by request handlers; becomes a JSON error response with the given status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def parse_durations(value: str | None) -> dict[int, int]:
+    """Parses nominal durations given as "1:60,2:90,..."; missing speaker counts keep their defaults."""
+    durations = dict(DEFAULT_NOMINAL_DURATIONS)
+    if not value:
+        return durations
+    try:
+        for item in value.split(","):
+            num_speakers, seconds = item.split(":")
+            durations[int(num_speakers)] = int(seconds)
+    except ValueError:
+        raise ApiError(400, f"Invalid durations '{value}', expected e.g. '1:60,2:90'.")
+    return durations
+
+def _is_slot_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(slot, str) for slot in value)
+
+def _run_parse_job(job: Job, file_bytes: bytes, nominal_durations: dict[int, int], episode: str, artifact_cache: ArtifactCache) -> dict:
+    """Parse job of the API: reuses artifacts of a script already processed by the UI or the API."""
+    upload_key = content_hash(file_bytes)
+    artifacts = artifact_cache.get(upload_key)
+    if artifacts is None:
+        artifacts = run_script_pipeline(job, file_bytes, nominal_durations, episode)
+        artifact_cache.put(upload_key, artifacts)
+    return apply_nominal_durations(artifacts, nominal_durations)
+
+def job_summary(job: Job, job_queue: JobQueue) -> dict:
+    """Status of a job as returned by GET /jobs/<id>."""
+    summary = {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "queue_position": job_queue.queue_position(job.id),
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if job.status != "done":
+        return summary
+    summary["links"] = {name: f"/jobs/{job.id}/{name}" for name in RESULT_TABLES.get(job.kind, {})}
+    if job.kind == "script":
+        summary["result"] = {
+            "rows": len(job.result["df_processed"]),
+            "speakers": len(job.result["speaker_matrix"]),
+            "chunks": job.result["num_chunks"],
+            "stage_timings": job.result.get("stage_timings", []),
+        }
+    elif job.kind == "schedule":
+        summary["result"] = {
+            "status": job.result.status,
+            "bookings": len(job.result.bookings),
+            "unassigned_segments": job.result.unassigned_segments,
+        }
+    return summary
+
+class _ChunkedResponseStream(io.RawIOBase):
+    """Write-only file object sending everything written as chunks of a chunked HTTP response."""
+
+    def __init__(self, handler: "ApiRequestHandler"):
+        self._handler = handler
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._handler._write_chunk(bytes(data))
+        return len(data)
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Needed for chunked responses
+    server: "ApiServer"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        self._response_started = False
+        try:
+            self._check_token()
+            if method == "GET" and parts == ["health"]:
+                self._send_json(200, {"queue": self.server.job_queue.stats(), "artifact_cache": self.server.artifact_cache.stats()})
+            elif method == "POST" and parts == ["jobs", "parse"]:
+                self._submit_parse(query)
+            elif method == "POST" and parts == ["jobs", "schedule"]:
+                self._submit_schedule()
+            elif method == "GET" and len(parts) == 2 and parts[0] == "jobs":
+                self._send_json(200, job_summary(self._get_job(parts[1]), self.server.job_queue))
+            elif method == "DELETE" and len(parts) == 2 and parts[0] == "jobs":
+                job = self._get_job(parts[1])
+                self.server.job_queue.cancel(job.id)
+                self._send_json(202, job_summary(job, self.server.job_queue))
+            elif method == "GET" and len(parts) == 3 and parts[0] == "jobs":
+                self._send_result_table(self._get_job(parts[1]), parts[2], query.get("format", "json"))
+            else:
+                raise ApiError(404, f"No endpoint {method} {url.path}.")
+        except ApiError as e:
+            self.close_connection = True # A rejected request body may not have been read
+            self._send_json(e.status, {"error": str(e)})
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)})
+        except Exception as e:
+            _log.exception(f"API {method} {url.path} failed: {e}")
+            self.close_connection = True
+            if not self._response_started: # A streamed response cannot change its status any more
+                self._send_json(500, {"error": f"Internal error: {type(e).__name__}."})
+
+    def _check_token(self) -> None:
+        if self.server.token and self.headers.get("Authorization") != f"Bearer {self.server.token}":
+            raise ApiError(401, "Missing or invalid bearer token.")
+
+    def _read_body(self) -> bytes:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError(400, f"Invalid Content-Length '{self.headers.get('Content-Length')}'.")
+        if length < 0:
+            raise ApiError(400, f"Invalid Content-Length '{length}'.")
+        if length > MAX_UPLOAD_BYTES:
+            raise ApiError(413, f"Request body exceeds {MAX_UPLOAD_BYTES // 2**20} MB.")
+        return self.rfile.read(length)
+
+    def _get_job(self, job_id: str) -> Job:
+        job = self.server.job_queue.get(job_id)
+        if job is None:
+            raise ApiError(404, f"Unknown job {job_id}.")
+        return job
+
+    def _submit_parse(self, query: dict[str, str]) -> None:
+        file_bytes = self._read_body()
+        if not file_bytes:
+            raise ApiError(400, "Send the DOCX file as the request body.")
+        nominal_durations = parse_durations(query.get("durations"))
+        job = self.server.job_queue.submit(
+            "script", _run_parse_job, file_bytes, nominal_durations, query.get("episode", ""), self.server.artifact_cache,
+            dedup_key=f"api:{content_hash(file_bytes)}:{sorted(nominal_durations.items())}", conversion=True
+        )
+        self._send_json(202, job_summary(job, self.server.job_queue))
+
+    def _submit_schedule(self) -> None:
+        try:
+            request = json.loads(self._read_body() or b"{}")
+        except json.JSONDecodeError as e:
+            raise ApiError(400, f"Invalid JSON body: {e}")
+        if not isinstance(request, dict):
+            raise ApiError(400, "Expected a JSON object as the request body.")
+        parse_job = self._get_job(str(request.get("parse_job_id", "")))
+        if parse_job.kind != "script" or parse_job.status != "done":
+            raise ApiError(409, f"Parse job {parse_job.id} is {parse_job.status}, a finished parse job is required.")
+        speaker_availability = request.get("speaker_availability")
+        recording_slots = request.get("recording_slots")
+        if not isinstance(speaker_availability, dict) or not _is_slot_list(recording_slots) or not all(
+            _is_slot_list(slots) for slots in speaker_availability.values()
+        ):
+            raise ApiError(400, "Expected 'speaker_availability' (speaker -> list of slot strings) and 'recording_slots' (list of slot strings).")
+        job = self.server.job_queue.submit(
+            "schedule", run_schedule_job, parse_job.result["df_processed"], speaker_availability, recording_slots
+        )
+        self._send_json(202, job_summary(job, self.server.job_queue))
+
+    def _send_result_table(self, job: Job, table_name: str, output_format: str) -> None:
+        tables = RESULT_TABLES.get(job.kind, {})
+        if table_name not in tables:
+            raise ApiError(404, f"Job {job.id} ({job.kind}) has no table '{table_name}', available: {', '.join(tables)}.")
+        if job.status != "done":
+            raise ApiError(409, f"Job {job.id} is {job.status}.")
+        table = tables[table_name](job.result)
+        table = table.set_axis(table.columns.astype(str), axis=1) # The result is shared, so it is not renamed in place
+        if output_format == "json":
+            self._stream_json_table(table)
+        elif output_format == "arrow":
+            self._stream_arrow_table(table)
+        else:
+            raise ApiError(400, f"Unknown format '{output_format}', use 'json' or 'arrow'.")
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self._response_started = True
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_chunked(self, content_type: str) -> None:
+        self._response_started = True
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _end_chunked(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _stream_json_table(self, table: pd.DataFrame) -> None:
+        """Streams {"columns": [...], "rows": [{...}, ...]} in batches, so large tables are never serialized at once."""
+        self._start_chunked("application/json; charset=utf-8")
+        self._write_chunk(f'{{"columns": {json.dumps(list(table.columns), ensure_ascii=False)}, "rows": ['.encode("utf-8"))
+        for batch_start in range(0, len(table), STREAM_BATCH_ROWS):
+            batch = table.iloc[batch_start:batch_start + STREAM_BATCH_ROWS].to_json(orient="records", date_format="iso", force_ascii=False)
+            self._write_chunk(((", " if batch_start else "") + batch[1:-1]).encode("utf-8"))
+        self._write_chunk(b"]}")
+        self._end_chunked()
+
+    def _stream_arrow_table(self, table: pd.DataFrame) -> None:
+        """Streams the table as Arrow IPC record batches (requires pyarrow)."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ApiError(406, "pyarrow is not installed, use format=json.")
+        # Converted before the response starts, so a table Arrow cannot represent still gets an error status
+        try:
+            arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ApiError(406, f"The table cannot be converted to Arrow ({e}), use format=json.")
+        self._start_chunked(ARROW_CONTENT_TYPE)
+        # pyarrow issues many small writes per batch, the buffer turns them into one chunk per ~1 MB
+        with io.BufferedWriter(_ChunkedResponseStream(self), buffer_size=2**20) as stream:
+            with pa.ipc.new_stream(stream, arrow_table.schema) as writer:
+                for batch in arrow_table.to_batches(max_chunksize=STREAM_BATCH_ROWS):
+                    writer.write_batch(batch)
+        self._end_chunked()
+
+    def log_message(self, format, *args):
+        _log.info(f"API {self.address_string()}: {format % args}")
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], job_queue: JobQueue, artifact_cache: ArtifactCache, token: str | None = None):
+        super().__init__(address, ApiRequestHandler)
+        self.job_queue = job_queue
+        self.artifact_cache = artifact_cache
+        self.token = token
+
+_api_server = None
+_api_server_lock = threading.Lock()
+
+def start_api_server(port: int, job_queue: JobQueue, artifact_cache: ArtifactCache, host: str = "127.0.0.1", token: str | None = None) -> None:
+    """Serves the API from a daemon thread of the calling process (e.g. the Streamlit app); later calls are no-ops."""
+    global _api_server
+    with _api_server_lock:
+        if _api_server is not None:
+            return
+        try:
+            _api_server = ApiServer((host, port), job_queue, artifact_cache, token)
+        except OSError as e:
+            _log.error(f"Could not start the API on {host}:{port}: {e}")
+            return
+        threading.Thread(target=_api_server.serve_forever, name="api-server", daemon=True).start()
+        _log.info(f"API listening on http://{host}:{port}")
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Local HTTP API for script parsing and scheduling")
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8600)
+    argument_parser.add_argument("--token", help="Optional bearer token required from clients")
+    argument_parser.add_argument("--workers", type=int, default=4)
+    argument_parser.add_argument("--max-concurrent-conversions", type=int, default=1)
+    argument_parser.add_argument("--max-pending-jobs", type=int, default=20)
+    argument_parser.add_argument("--cache-mb", type=int, default=512)
+    args = argument_parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    job_queue = get_job_queue(
+        max_workers=args.workers,
+        max_concurrent_conversions=args.max_concurrent_conversions,
+        max_pending_jobs=args.max_pending_jobs
+    )
+    server = ApiServer((args.host, args.port), job_queue, get_artifact_cache(args.cache_mb * 2**20), args.token)
+    _log.info(f"API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,9 @@
 import streamlit as st
-from components.ui_components import display_main_app_ui
 
 # Import from new files
+# The UI components (pandas, analyzers, docling) are imported only after login, so the login form renders fast
 from config import _log, VALID_USERNAME, VALID_PASSWORD
 from utils.auth import check_login, logout
-from utils.excel_export import to_excel
 from utils.session_state_manager import initialize_session_state
 
 # --- Main App UI and Logic ---
@@ -22,9 +21,12 @@ if not st.session_state.logged_in:
 
 # --- Main Application (Protected by Login) ---
 else:
+    from components.ui_components import display_main_app_ui, display_admin_panel
+
     # Add logout button to the sidebar or top
     with st.sidebar:
         st.write(f"Prihlásený ako: {VALID_USERNAME}") # Slovak Status
         st.button("Odhlásiť", on_click=logout) # Slovak Button
+        display_admin_panel()
     
     display_main_app_ui()
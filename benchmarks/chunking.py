@@ -0,0 +1,87 @@
+"""
+Chunking mode benchmark.
+
+Converts and chunks real DOCX scripts in every chunking mode of convert_and_chunk,
+records wall time and peak traced memory, and checks whether the parser produces
+the same rows from the chunks of each mode.
+
+Usage (from the repository root):
+    python -m benchmarks.chunking scripts/E01.docx scripts/E02.docx --repeats 3
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from converter import CHUNKING_MODES, convert_and_chunk
+from parser.core_parsing import parse_chunks_to_structured_data
+
+_log = logging.getLogger(__name__)
+
+def measure_mode(source_path: Path, mode: str) -> tuple[dict, list[dict]]:
+    """
+    Runs convert_and_chunk in the given mode untraced for the wall time, then under tracemalloc for
+    the peak memory; returns the measurements and the parsed rows.
+    """
+    start = time.perf_counter()
+    chunks = convert_and_chunk(source_path, mode=mode)
+    wall_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        convert_and_chunk(source_path, mode=mode)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rows = parse_chunks_to_structured_data(chunks or [])
+    return {
+        "file": source_path.name,
+        "mode": mode,
+        "wall_time_s": wall_time,
+        "peak_memory_mb": peak_bytes / 2**20,
+        "chunks": len(chunks or []),
+        "rows": len(rows),
+    }, rows
+
+def run_benchmark(source_paths: list[Path], modes: list[str], repeats: int = 3) -> pd.DataFrame:
+    results = []
+    for source_path in source_paths:
+        rows_by_mode = {}
+        for repeat in range(repeats):
+            for mode in modes:
+                metrics, rows_by_mode[mode] = measure_mode(source_path, mode)
+                results.append({**metrics, "repeat": repeat})
+                _log.info(f"{source_path.name} {mode} repeat={repeat}: {metrics['wall_time_s']:.2f}s, {metrics['peak_memory_mb']:.1f} MB, {metrics['chunks']} chunks")
+        reference_mode = modes[0]
+        for mode in modes[1:]:
+            if rows_by_mode[mode] == rows_by_mode[reference_mode]:
+                _log.info(f"{source_path.name}: parser output of '{mode}' is identical to '{reference_mode}'.")
+            else:
+                differing = sum(row_a != row_b for row_a, row_b in zip(rows_by_mode[mode], rows_by_mode[reference_mode]))
+                _log.warning(
+                    f"{source_path.name}: parser output of '{mode}' differs from '{reference_mode}' "
+                    f"({len(rows_by_mode[mode])} vs {len(rows_by_mode[reference_mode])} rows, {differing} differing positions)."
+                )
+    return pd.DataFrame(results)
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Chunking mode benchmark")
+    argument_parser.add_argument("files", type=Path, nargs="+", help="DOCX scripts to convert")
+    argument_parser.add_argument("--modes", default=",".join(CHUNKING_MODES))
+    argument_parser.add_argument("--repeats", type=int, default=3)
+    argument_parser.add_argument("--output-dir", type=Path, default=Path("benchmark_results"))
+    args = argument_parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    results = run_benchmark(args.files, args.modes.split(","), args.repeats)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = args.output_dir / "chunking.csv"
+    results.to_csv(csv_path, index=False)
+    _log.info(f"Results written to {csv_path}")
+    print(results.groupby(["file", "mode"])[["wall_time_s", "peak_memory_mb", "chunks", "rows"]].median().to_string())
+
+if __name__ == '__main__':
+    main()
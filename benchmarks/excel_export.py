@@ -0,0 +1,46 @@
+"""
+Excel export benchmark.
+
+Builds a synthetic parsed script of the given size and measures the time, file size and
+peak resident memory of the streaming multi-sheet workbook export.
+
+Usage (from the repository root):
+    python -m benchmarks.excel_export --rows 100000
+"""
+import argparse
+import logging
+import resource
+import time
+
+from analyzer.data_processing import process_parsed_data, build_speaker_segment_matrix, build_segment_table
+from benchmarks.synthetic import generate_instance
+from utils.excel_export import build_workbook_sheets, to_excel_workbook
+
+DEFAULT_NOMINAL_DURATIONS = {1: 60, 2: 90, 3: 120, 4: 150, 5: 200}
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Excel export benchmark")
+    argument_parser.add_argument("--rows", type=int, default=100000, help="Approximate number of parsed script rows")
+    argument_parser.add_argument("--cast-size", type=int, default=80)
+    argument_parser.add_argument("--seed", type=int, default=0)
+    args = argument_parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    # Two lines per speaker and ~2.2 speakers per segment on average
+    parsed_data, _, _ = generate_instance(args.cast_size, max(1, args.rows // 4), seed=args.seed)
+    df_processed = process_parsed_data(parsed_data, DEFAULT_NOMINAL_DURATIONS)
+    sheets = build_workbook_sheets(df_processed, build_speaker_segment_matrix(df_processed), build_segment_table(df_processed))
+
+    rss_before_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    workbook_bytes = to_excel_workbook(sheets)
+    elapsed = time.perf_counter() - start
+    rss_after_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"Rows: {len(df_processed)}, matrix: {sheets['Matica_Rečník_Segment'].shape}")
+    print(f"Export time: {elapsed:.2f} s")
+    print(f"File size: {len(workbook_bytes) / 2**20:.2f} MB")
+    print(f"Peak RSS: {rss_after_mb:.0f} MB (before export {rss_before_mb:.0f} MB)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Cold-start import-time report.
+
+Measures, in fresh interpreters, how long the app takes until the login form is
+rendered (Streamlit's AppTest runs app.py once, without a browser), and which
+modules dominate the imports of that first run. With --compare-ref the same is
+measured for another git revision (e.g. the commit before lazy loading) so both
+can be compared side by side.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time --repeats 5 --compare-ref HEAD~1
+"""
+import argparse
+import io
+import json
+import logging
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+_log = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Run in a fresh interpreter; prints one JSON line with the time to the rendered login form
+MEASURE_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_imported = time.perf_counter()
+app_test = AppTest.from_file("app.py", default_timeout=600).run()
+finished = time.perf_counter()
+print(json.dumps({
+    "time_to_login_form_s": finished - start,
+    "app_run_s": finished - streamlit_imported,
+    "login_form_rendered": [text_input.label for text_input in app_test.text_input] == ["Meno", "Heslo"],
+    "exception": app_test.exception[0].message if app_test.exception else None,
+}))
+"""
+
+P_IMPORT_TIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+def measure_cold_start(app_dir: Path) -> tuple[dict, list[tuple[str, float]]]:
+    """Runs one cold start of the app in app_dir; returns the measurement and (module, cumulative seconds) of top-level imports."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", MEASURE_SCRIPT],
+        cwd=app_dir, capture_output=True, text=True, check=True
+    )
+    measurement = json.loads(completed.stdout.strip().splitlines()[-1])
+    module_times = []
+    for line in completed.stderr.splitlines():
+        match = P_IMPORT_TIME.match(line)
+        # Only modules imported directly (not as dependencies of another import) are listed
+        if match and len(match.group(3)) == 1:
+            module_times.append((match.group(4), int(match.group(2)) / 1e6))
+    return measurement, module_times
+
+def export_git_ref(ref: str, target_dir: Path) -> None:
+    """Writes the tree of a git revision into target_dir."""
+    archive = subprocess.run(["git", "archive", "--format=tar", ref], cwd=REPO_ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target_dir, filter="data")
+
+def report(label: str, app_dir: Path, repeats: int, top_modules: int) -> dict:
+    measurements = []
+    module_times = []
+    for _ in range(repeats):
+        measurement, module_times = measure_cold_start(app_dir)
+        measurements.append(measurement)
+    times = [measurement["time_to_login_form_s"] for measurement in measurements]
+    summary = {
+        "label": label,
+        "median_time_to_login_form_s": statistics.median(times),
+        "min_time_to_login_form_s": min(times),
+        "median_app_run_s": statistics.median(measurement["app_run_s"] for measurement in measurements),
+        "login_form_rendered": all(measurement["login_form_rendered"] for measurement in measurements),
+        "exception": measurements[-1]["exception"],
+    }
+    print(f"\n== {label} ({app_dir})")
+    print(f"time to login form: median {summary['median_time_to_login_form_s']:.3f} s, min {summary['min_time_to_login_form_s']:.3f} s "
+          f"(app run {summary['median_app_run_s']:.3f} s, {repeats} cold starts)")
+    print(f"login form rendered: {summary['login_form_rendered']}")
+    if summary["exception"]:
+        print(f"app raised: {summary['exception']}")
+    print("slowest top-level imports of the last run:")
+    for module, seconds in sorted(module_times, key=lambda item: item[1], reverse=True)[:top_modules]:
+        print(f"  {seconds:8.3f} s  {module}")
+    return summary
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Cold-start time-to-login-form report")
+    argument_parser.add_argument("--repeats", type=int, default=5)
+    argument_parser.add_argument("--compare-ref", help="Git revision to measure as the baseline, e.g. HEAD~1")
+    argument_parser.add_argument("--top-modules", type=int, default=10)
+    argument_parser.add_argument("--output", type=Path, help="Optional JSON file for the summaries")
+    args = argument_parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    summaries = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.compare_ref:
+            baseline_dir = Path(tmp_dir) / "baseline"
+            baseline_dir.mkdir()
+            export_git_ref(args.compare_ref, baseline_dir)
+            summaries.append(report(f"baseline {args.compare_ref}", baseline_dir, args.repeats, args.top_modules))
+        summaries.append(report("working tree", REPO_ROOT, args.repeats, args.top_modules))
+
+    if len(summaries) == 2:
+        before, after = (summary["median_time_to_login_form_s"] for summary in summaries)
+        print(f"\nmedian time to login form: {before:.3f} s -> {after:.3f} s ({before - after:+.3f} s saved)")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(summaries, indent=2))
+        _log.info(f"Summaries written to {args.output}")
+
+if __name__ == '__main__':
+    main()
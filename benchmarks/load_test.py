@@ -0,0 +1,348 @@
+"""
+Multi-user load test.
+
+Simulates N concurrent coordinators with Streamlit's headless AppTest: every session
+logs in, uploads its own synthetic DOCX script, enters the speaker availability in the
+availability grid, calculates the schedule and prepares the Excel export.
+
+AppTest replaces process-global runtime state on every run, so two AppTests cannot run
+in one interpreter at the same time. Every session therefore runs in its own worker
+process; the workers set up, wait for a common start signal and then run their flows
+at the same time, so the sessions' script runs and jobs overlap. Unlike on a server,
+where all sessions share one process, the sessions do not contend for one GIL and each
+has its own job queue and artifact cache: --shared-script gives every session the same
+work but no cross-session cache hits. AppTest does not run the progress fragment's timer either: while a job runs,
+the session waits on the job itself and reruns the app once it has finished, like a
+browser picking up the result on its next poll.
+
+Usage (from the repository root):
+    python -m benchmarks.load_test --sessions 1,2,4,8 --num-segments 200
+"""
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+ACTIONS = ["login", "upload", "edit_availability", "schedule", "export"]
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+JOB_POLL_INTERVAL_SECONDS = 0.1
+LATENCY_PERCENTILES = [0.5, 0.9, 0.99]
+
+# Printed by a worker once it is set up; it then waits for a line on stdin before starting
+WORKER_READY = "ready"
+
+PROCESS_NOTE = (
+    "Note: every session ran in its own process, so the sessions overlapped without sharing the GIL, "
+    "the job queue or the artifact cache; peak_rss_total_mb sums the peaks of all session processes."
+)
+
+class LoadTestError(Exception):
+    """An action of a simulated session did not reach its expected state."""
+
+@contextmanager
+def _timed_action(records: list[dict], session: int, action: str):
+    """Records the wall time of one action; a failure is recorded and ends the session."""
+    start = time.perf_counter()
+    record = {"session": session, "action": action, "ok": True, "error": None}
+    try:
+        yield
+    except Exception as e:
+        record.update(ok=False, error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        records.append(record)
+
+def _run(app_test, timeout: float, widget_states=None) -> None:
+    if widget_states is None:
+        app_test.run(timeout=timeout)
+    else:
+        app_test._run(widget_states, timeout=timeout)
+    if app_test.exception:
+        raise LoadTestError(app_test.exception[0].message)
+
+def _click(app_test, label: str, timeout: float) -> None:
+    buttons = [button for button in app_test.button if button.label == label]
+    if not buttons:
+        raise LoadTestError(f"Button '{label}' is not rendered.")
+    buttons[0].click()
+    _run(app_test, timeout)
+
+def _wait_for_job(app_test, job_state_key: str, timeout: float) -> None:
+    """Waits until the job referenced by the session state key has finished, then reruns the app."""
+    from utils.job_queue import get_job_queue
+
+    job_state = app_test.session_state[job_state_key] if job_state_key in app_test.session_state else None
+    if job_state is None:
+        return
+    job = get_job_queue().get(job_state["job_id"])
+    deadline = time.perf_counter() + timeout
+    while job is not None and not job.finished:
+        if time.perf_counter() > deadline:
+            raise LoadTestError(f"Job {job.id} ({job.kind}) did not finish within {timeout:.0f} s.")
+        time.sleep(JOB_POLL_INTERVAL_SECONDS)
+    _run(app_test, timeout)
+
+def _submit_availability_grid(app_test, speaker_availability: dict[str, list[str]], timeout: float) -> None:
+    """
+    Types the availability into the speaker x day grid and submits its form. AppTest has no
+    st.data_editor interaction, so the changed cells are sent in the editor's own wire format
+    (edited_rows by row position and column) together with the state of the other widgets.
+    This is the only use of AppTest internals (_tree, _run) and may need updating with Streamlit.
+    """
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    from analyzer.scheduler.availability import slots_to_grid
+
+    grid_key = f"availability_grid_{app_test.session_state['availability_grid_version']}"
+    editors = [element for element in app_test.dataframe if element.key == grid_key]
+    if not editors:
+        raise LoadTestError("Availability grid is not rendered.")
+    grid = editors[0].value
+    target = slots_to_grid(speaker_availability, list(grid.index), list(grid.columns)).reindex(columns=grid.columns, fill_value="")
+    edited_rows = {}
+    for row_position, speaker in enumerate(grid.index):
+        changed = {day: value for day, value in target.loc[speaker].items() if value != grid.at[speaker, day]}
+        if changed:
+            edited_rows[str(row_position)] = changed
+
+    buttons = [button for button in app_test.button if button.label == "Uložiť Dostupnosť"]
+    if not buttons:
+        raise LoadTestError("Availability form submit button is not rendered.")
+    buttons[0].click()
+    widget_states = app_test._tree.get_widget_states()
+    widget_states.widgets.append(WidgetState(
+        id=editors[0].proto.id,
+        string_value=json.dumps({"edited_rows": edited_rows, "added_rows": [], "deleted_rows": []})
+    ))
+    _run(app_test, timeout, widget_states)
+
+def _require(app_test, condition: Callable, message: str) -> None:
+    if not condition(app_test):
+        errors = [error.value for error in app_test.error]
+        raise LoadTestError(f"{message}{': ' + '; '.join(errors) if errors else ''}")
+
+def run_session(session: int, scenario: dict, credentials: tuple[str, str], records: list[dict], timeout: float) -> None:
+    """Runs one coordinator's flow through the app; actions after a failed one are skipped."""
+    from streamlit.testing.v1 import AppTest
+
+    app_test = AppTest.from_file(str(REPO_ROOT / "app.py"), default_timeout=timeout)
+    username, password = credentials
+    try:
+        with _timed_action(records, session, "login"):
+            _run(app_test, timeout)
+            app_test.text_input(key="username").set_value(username)
+            app_test.text_input(key="password").set_value(password)
+            _run(app_test, timeout)
+            _require(app_test, lambda app: app.session_state["logged_in"], "Login failed")
+
+        with _timed_action(records, session, "upload"):
+            app_test.file_uploader[0].set_value((scenario["file_name"], scenario["docx"], DOCX_MIME))
+            _run(app_test, timeout)
+            _wait_for_job(app_test, "upload_job", timeout)
+            _require(app_test, lambda app: app.session_state["upload_result"] is not None, "Upload was not processed")
+
+        # Setup, not measured: the studio's recording days decide which day columns the grid shows
+        app_test.session_state["recording_slots"] = scenario["recording_slots"]
+        _run(app_test, timeout)
+
+        with _timed_action(records, session, "edit_availability"):
+            grid_version = app_test.session_state["availability_grid_version"]
+            _submit_availability_grid(app_test, scenario["speaker_availability"], timeout)
+            _require(app_test, lambda app: app.session_state["availability_grid_version"] > grid_version, "Availability grid was not saved")
+
+        with _timed_action(records, session, "schedule"):
+            _click(app_test, "Vypočítať Optimálny Plán Nahrávania", timeout)
+            _wait_for_job(app_test, "schedule_job", timeout)
+            _require(app_test, lambda app: app.session_state["last_schedule"] is not None, "No schedule was calculated")
+
+        with _timed_action(records, session, "export"):
+            _click(app_test, "Pripraviť Excel Export", timeout)
+            _require(app_test, lambda app: app.session_state["excel_export"] is not None, "No workbook was exported")
+    except Exception as e:
+        _log.warning(f"Session {session} stopped: {e}")
+
+def build_scenario(session: int, cast_size: int, num_segments: int, shared_script: bool, seed: int) -> dict:
+    """The synthetic script, availability and recording slots of one session (the same for all with shared_script)."""
+    from benchmarks.synthetic import generate_instance, generate_script_docx
+
+    instance_seed = seed if shared_script else seed + session
+    parsed_data, speaker_availability, recording_slots = generate_instance(cast_size, num_segments, seed=instance_seed)
+    return {
+        "file_name": f"load_test_{instance_seed}.docx",
+        "docx": generate_script_docx(parsed_data),
+        "speaker_availability": speaker_availability,
+        "recording_slots": recording_slots,
+    }
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+def run_worker(session: int, cast_size: int, num_segments: int, shared_script: bool, seed: int, credentials: tuple[str, str], timeout: float) -> dict:
+    """
+    Runs one session in this process once the start signal arrives on stdin; returns its
+    action records and process totals. Scenario generation and imports happen before the
+    signal and are not measured, as a running server has the app's modules imported already.
+    """
+    import components.ui_components # noqa: F401
+
+    scenario = build_scenario(session, cast_size, num_segments, shared_script, seed)
+    print(WORKER_READY, flush=True)
+    sys.stdin.readline()
+
+    records = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    run_session(session, scenario, credentials, records, timeout)
+    return {
+        "session": session,
+        "wall_time_s": time.perf_counter() - wall_start,
+        "cpu_time_s": time.process_time() - cpu_start,
+        "peak_rss_mb": _peak_rss_mb(),
+        "records": records,
+    }
+
+def measure_level(num_sessions: int, args: argparse.Namespace) -> dict:
+    """Runs num_sessions sessions at the same time, one worker process each, and combines their results."""
+    workers = []
+    for session in range(num_sessions):
+        command = [
+            sys.executable, "-m", "benchmarks.load_test", "--worker", str(session),
+            "--cast-size", str(args.cast_size), "--num-segments", str(args.num_segments),
+            "--seed", str(args.seed), "--timeout", str(args.timeout),
+        ]
+        if args.shared_script:
+            command.append("--shared-script")
+        if args.username:
+            command += ["--username", args.username, "--password", args.password or ""]
+        # stderr goes to a file, a full pipe would block a worker that logs a lot
+        stderr_file = tempfile.TemporaryFile(mode="w+")
+        process = subprocess.Popen(command, cwd=REPO_ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+        workers.append((session, process, stderr_file))
+
+    def worker_error(session: int, process: subprocess.Popen, stderr_file) -> RuntimeError:
+        process.kill()
+        stderr_file.seek(0)
+        return RuntimeError(f"Load test worker for session {session} failed:\n{stderr_file.read()[-4000:]}")
+
+    try:
+        for session, process, stderr_file in workers:
+            if process.stdout.readline().strip() != WORKER_READY:
+                raise worker_error(session, process, stderr_file)
+
+        wall_start = time.perf_counter()
+        for _, process, _ in workers:
+            process.stdin.write("start\n")
+            process.stdin.close()
+        results = []
+        for session, process, stderr_file in workers:
+            stdout = process.stdout.read()
+            if process.wait() != 0 or not stdout.strip():
+                raise worker_error(session, process, stderr_file)
+            results.append(json.loads(stdout.strip().splitlines()[-1]))
+        wall_time = time.perf_counter() - wall_start
+    finally:
+        for _, process, stderr_file in workers:
+            if process.poll() is None:
+                process.kill()
+            stderr_file.close()
+
+    return {
+        "sessions": num_sessions,
+        "wall_time_s": wall_time,
+        "cpu_time_s": sum(result["cpu_time_s"] for result in results),
+        "peak_rss_total_mb": sum(result["peak_rss_mb"] for result in results),
+        "peak_rss_per_session_mb": max(result["peak_rss_mb"] for result in results),
+        "records": [record for result in results for record in result["records"]],
+    }
+
+def summarize(levels: list[dict]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Per session count and action latency percentiles, and per session count process totals."""
+    actions = pd.DataFrame([
+        {"sessions": level["sessions"], **record} for level in levels for record in level["records"]
+    ], columns=["sessions", "session", "action", "ok", "error", "seconds"])
+    succeeded = actions[actions["ok"].astype(bool)]
+    latency = succeeded.groupby(["sessions", "action"])["seconds"].quantile(LATENCY_PERCENTILES).unstack()
+    latency.columns = [f"p{int(percentile * 100)}_s" for percentile in latency.columns]
+    latency["max_s"] = succeeded.groupby(["sessions", "action"])["seconds"].max()
+    counts = actions.groupby(["sessions", "action"])["ok"].agg(count="size", failed=lambda ok: int((~ok.astype(bool)).sum()))
+    latency = counts.join(latency).reset_index()
+    latency["action"] = pd.Categorical(latency["action"], categories=ACTIONS, ordered=True)
+    latency = latency.sort_values(["sessions", "action"]).reset_index(drop=True)
+
+    completed_sessions = actions[actions["action"] == ACTIONS[-1]].groupby("sessions")["ok"].sum()
+    totals = pd.DataFrame([{
+        "sessions": level["sessions"],
+        "completed_sessions": int(completed_sessions.get(level["sessions"], 0)),
+        "wall_time_s": level["wall_time_s"],
+        "cpu_time_s": level["cpu_time_s"],
+        "cpu_per_session_s": level["cpu_time_s"] / level["sessions"],
+        # Busy cores on average, may exceed 1 as the sessions run in parallel processes
+        "cpu_utilization": level["cpu_time_s"] / level["wall_time_s"] if level["wall_time_s"] else 0.0,
+        "peak_rss_total_mb": level["peak_rss_total_mb"],
+        "peak_rss_per_session_mb": level["peak_rss_per_session_mb"],
+    } for level in levels])
+    return latency, totals
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Multi-user load test of the Streamlit app")
+    argument_parser.add_argument("--sessions", default="1,2,4,8", help="Comma separated numbers of concurrent sessions")
+    argument_parser.add_argument("--cast-size", type=int, default=30)
+    argument_parser.add_argument("--num-segments", type=int, default=200)
+    argument_parser.add_argument("--shared-script", action="store_true", help="All sessions upload the same script")
+    argument_parser.add_argument("--seed", type=int, default=0)
+    argument_parser.add_argument("--timeout", type=float, default=600.0, help="Seconds one app run or job may take")
+    argument_parser.add_argument("--username", help="Login name (defaults to the configured credentials)")
+    argument_parser.add_argument("--password")
+    argument_parser.add_argument("--output-dir", type=Path, default=Path("benchmark_results"))
+    argument_parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = argument_parser.parse_args()
+
+    if args.worker is not None:
+        # Configured before the app imports config, so the app's INFO logging stays out of the measurements
+        logging.basicConfig(level=logging.WARNING)
+        if args.username:
+            credentials = (args.username, args.password or "")
+        else:
+            from config import VALID_USERNAME, VALID_PASSWORD
+            credentials = (VALID_USERNAME, VALID_PASSWORD)
+        result = run_worker(args.worker, args.cast_size, args.num_segments, args.shared_script, args.seed, credentials, args.timeout)
+        print(json.dumps(result))
+        return
+
+    logging.basicConfig(level=logging.INFO)
+    levels = []
+    for num_sessions in (int(value) for value in args.sessions.split(",")):
+        _log.info(f"Running {num_sessions} concurrent sessions...")
+        levels.append(measure_level(num_sessions, args))
+    latency, totals = summarize(levels)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    latency.to_csv(args.output_dir / "load_test_latency.csv", index=False)
+    totals.to_csv(args.output_dir / "load_test_totals.csv", index=False)
+    _log.info(f"Results written to {args.output_dir}")
+    print(PROCESS_NOTE)
+    print(latency.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+    print()
+    print(totals.to_string(index=False, float_format=lambda value: f"{value:.2f}"))
+    failures = pd.DataFrame([record for level in levels for record in level["records"] if not record["ok"]])
+    if not failures.empty:
+        print("\nFailed actions:")
+        print(failures.groupby(["action", "error"]).size().to_string())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Scheduler scaling benchmark.
+
+Runs every engine in SCHEDULER_ENGINES over seeded synthetic instances while one
+parameter (cast size, segment count, availability density or horizon length) is
+varied, and records wall time, peak memory and schedule quality.
+
+Usage (from the repository root):
+    python -m benchmarks.scheduler_scaling --axis num_segments --values 50,100,200,400
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from analyzer.data_processing import process_parsed_data
+from analyzer.scheduler import SCHEDULER_ENGINES
+from benchmarks.synthetic import generate_instance
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_NOMINAL_DURATIONS = {1: 60, 2: 90, 3: 120, 4: 150, 5: 200}
+
+DEFAULT_PARAMETERS = {
+    "cast_size": 30,
+    "num_segments": 200,
+    "availability_density": 0.6,
+    "horizon_days": 10,
+}
+
+AXIS_TYPES = {
+    "cast_size": int,
+    "num_segments": int,
+    "availability_density": float,
+    "horizon_days": int,
+}
+
+def measure_engine(engine_name: str, df_processed: pd.DataFrame, speaker_availability: dict[str, list[str]], recording_days_times: list[str]) -> dict:
+    """
+    Runs one engine twice: an untraced run for the wall time and quality metrics, and a run under
+    tracemalloc for the peak memory, so the timing does not include the tracing overhead.
+    """
+    engine = SCHEDULER_ENGINES[engine_name]
+    start = time.perf_counter()
+    schedule = engine(df_processed, speaker_availability, recording_days_times)
+    wall_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        engine(df_processed, speaker_availability, recording_days_times)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    bookings = schedule.bookings
+    return {
+        "engine": engine_name,
+        "wall_time_s": wall_time,
+        "peak_memory_mb": peak_bytes / 2**20,
+        "assigned_segments": len(bookings),
+        "unassigned_segments": len(schedule.unassigned_segments),
+        "days_used": int(bookings["start"].dt.normalize().nunique()),
+        "scheduled_seconds": float(bookings["duration"].sum()),
+    }
+
+def run_benchmark(axis: str, values: list, engines: list[str], repeats: int = 3, seed: int = 0) -> pd.DataFrame:
+    """Benchmarks the engines over the given values of one axis, other parameters at their defaults."""
+    results = []
+    for value in values:
+        parameters = {**DEFAULT_PARAMETERS, axis: value}
+        for repeat in range(repeats):
+            parsed_data, speaker_availability, recording_days_times = generate_instance(**parameters, seed=seed + repeat)
+            df_processed = process_parsed_data(parsed_data, DEFAULT_NOMINAL_DURATIONS)
+            for engine_name in engines:
+                metrics = measure_engine(engine_name, df_processed, speaker_availability, recording_days_times)
+                results.append({**parameters, "repeat": repeat, **metrics})
+                _log.info(f"{axis}={value} repeat={repeat} {engine_name}: {metrics['wall_time_s']:.3f}s, {metrics['peak_memory_mb']:.1f} MB")
+    return pd.DataFrame(results)
+
+def plot_scaling_curves(results: pd.DataFrame, axis: str, output_path: Path) -> None:
+    """Plots median wall time and peak memory per engine against the varied axis."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        _log.warning("matplotlib is not installed, skipping scaling plot.")
+        return
+
+    medians = results.groupby(["engine", axis])[["wall_time_s", "peak_memory_mb"]].median().reset_index()
+    fig, (ax_time, ax_memory) = plt.subplots(1, 2, figsize=(12, 5))
+    for engine_name, group in medians.groupby("engine"):
+        ax_time.plot(group[axis], group["wall_time_s"], marker="o", label=engine_name)
+        ax_memory.plot(group[axis], group["peak_memory_mb"], marker="o", label=engine_name)
+    ax_time.set(xlabel=axis, ylabel="wall time (s)", title="Scheduler wall time")
+    ax_memory.set(xlabel=axis, ylabel="peak memory (MB)", title="Scheduler peak memory")
+    ax_time.legend()
+    ax_memory.legend()
+    fig.tight_layout()
+    fig.savefig(output_path)
+    _log.info(f"Scaling plot written to {output_path}")
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description="Scheduler scaling benchmark")
+    argument_parser.add_argument("--axis", choices=sorted(AXIS_TYPES), default="num_segments")
+    argument_parser.add_argument("--values", default="50,100,200,400", help="Comma separated values of the varied axis")
+    argument_parser.add_argument("--engines", default=",".join(SCHEDULER_ENGINES), help="Comma separated engine names")
+    argument_parser.add_argument("--repeats", type=int, default=3)
+    argument_parser.add_argument("--seed", type=int, default=0)
+    argument_parser.add_argument("--output-dir", type=Path, default=Path("benchmark_results"))
+    args = argument_parser.parse_args()
+
+    # Keep the scheduler's per-segment logging out of the measurements
+    logging.basicConfig(level=logging.WARNING)
+    _log.setLevel(logging.INFO)
+
+    values = [AXIS_TYPES[args.axis](value) for value in args.values.split(',')]
+    engines = [engine.strip() for engine in args.engines.split(',')]
+    results = run_benchmark(args.axis, values, engines, repeats=args.repeats, seed=args.seed)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = args.output_dir / f"scheduler_scaling_{args.axis}.csv"
+    results.to_csv(csv_path, index=False)
+    _log.info(f"Results written to {csv_path}")
+    print(results.groupby(["engine", args.axis])[["wall_time_s", "peak_memory_mb", "assigned_segments", "unassigned_segments", "days_used"]].median().to_string())
+    plot_scaling_curves(results, args.axis, args.output_dir / f"scheduler_scaling_{args.axis}.png")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import io
+import random
+from datetime import datetime, timedelta
+
+DEFAULT_SPEAKERS_PER_SEGMENT_WEIGHTS = {1: 0.35, 2: 0.35, 3: 0.15, 4: 0.1, 5: 0.05}
+
+def speaker_name(index: int) -> str:
+    """Synthetic speaker name; letters instead of a number keep it parseable (and sorted like the index)."""
+    letters = ""
+    for _ in range(3):
+        index, remainder = divmod(index, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return f"POSTAVA{letters}"
+
+def generate_instance(
+    cast_size: int,
+    num_segments: int,
+    availability_density: float = 0.6,
+    horizon_days: int = 10,
+    speakers_per_segment_weights: dict[int, float] | None = None,
+    lines_per_speaker: int = 2,
+    start_date: datetime | None = None,
+    seed: int = 0
+) -> tuple[list[dict], dict[str, list[str]], list[str]]:
+    """
+    Generates a seeded synthetic scheduling instance.
+
+    Args:
+        cast_size: Number of distinct speakers.
+        num_segments: Number of script segments.
+        availability_density: Probability that a speaker is available on a given day of the horizon.
+        horizon_days: Number of consecutive recording days.
+        speakers_per_segment_weights: Relative weights of 1..N speakers per segment.
+        lines_per_speaker: Dialogue lines per speaker within each segment.
+        start_date: First day of the horizon (defaults to 2030-01-07).
+        seed: Random seed, so every instance is reproducible.
+
+    Returns:
+        (parsed_data, speaker_availability, recording_days_times) in the formats
+        produced by the parser and the availability inputs.
+    """
+    rng = random.Random(seed)
+    weights = speakers_per_segment_weights or DEFAULT_SPEAKERS_PER_SEGMENT_WEIGHTS
+    start_date = start_date or datetime(2030, 1, 7)
+    cast = [speaker_name(i) for i in range(cast_size)]
+
+    parsed_data = []
+    for segment in range(1, num_segments + 1):
+        num_speakers = min(cast_size, rng.choices(list(weights), weights=list(weights.values()))[0])
+        for speaker in rng.sample(cast, num_speakers):
+            for line in range(lines_per_speaker):
+                minutes, seconds = divmod(segment * 30 + line, 60)
+                parsed_data.append({
+                    "Segment": str(segment),
+                    "Speaker": speaker,
+                    "Timecode": f"00:{minutes % 60:02d}:{seconds:02d}",
+                    "Text": f"Replika {line} segmentu {segment}",
+                    "Scene Marker": "",
+                    "Segment Marker": str(segment) if line == 0 else ""
+                })
+
+    days = [(start_date + timedelta(days=d)).strftime('%Y-%m-%d') for d in range(horizon_days)]
+    recording_days_times = [f"{day} 09:00-17:00" for day in days]
+
+    speaker_availability = {}
+    for speaker in cast:
+        slots = []
+        for day in days:
+            if rng.random() < availability_density:
+                start_hour = rng.randint(8, 12)
+                end_hour = min(20, start_hour + rng.randint(4, 8))
+                slots.append(f"{day} {start_hour:02d}:00-{end_hour:02d}:00")
+        speaker_availability[speaker] = slots
+
+    return parsed_data, speaker_availability, recording_days_times
+
+def generate_script_docx(parsed_data: list[dict]) -> bytes:
+    """
+    Renders generated rows as a DOCX script: a 'Postavy:' list, then a dash line starting
+    each segment and one 'timecode<TAB>speaker<TAB>text' paragraph per line.
+    """
+    from docx import Document
+
+    document = Document()
+    document.add_paragraph("Postavy:")
+    for speaker in sorted({row["Speaker"] for row in parsed_data}):
+        document.add_paragraph(speaker)
+    document.add_paragraph("")
+    for row in parsed_data:
+        if row["Segment Marker"]:
+            document.add_paragraph("-" * 20)
+        document.add_paragraph(f"{row['Timecode']}\t{row['Speaker']}\t{row['Text']}")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
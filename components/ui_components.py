@@ -1,134 +1,331 @@
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-import tempfile
 import json
+import time
 import re
 from datetime import datetime, timedelta
 
-from converter import convert_and_chunk
-from parser.core_parsing import parse_chunks_to_structured_data
-from analyzer.data_processing import process_parsed_data, get_unique_speakers
+from analyzer.data_processing import get_unique_speakers, build_segment_table
+from analyzer.table_index import page_rows
+from analyzer.text_index import search_episodes
 from analyzer.calculations import calculate_segment_times_by_speaker_count, calculate_total_speaker_time
-from analyzer.scheduler.core import calculate_optimal_schedule
-from analyzer.scheduler.calendar import generate_calendar_view
-from analyzer.scheduler.summary import summarize_speaker_schedule
+from analyzer.scheduler.availability import (
+    build_speaker_interval_sets, describe_rule, grid_to_slots, import_availability_csv, import_availability_ics,
+    parse_rule_text, rule_from_dict, rule_to_dict, slots_to_grid, ungridded_slots
+)
 
-from config import _log
-from utils.excel_export import to_excel
+from config import (
+    _log, MAX_JOB_WORKERS, MAX_CONCURRENT_CONVERSIONS, MAX_PENDING_JOBS, JOB_POLL_INTERVAL_SECONDS, ARTIFACT_CACHE_MAX_BYTES,
+    METRICS_HTTP_PORT, METRICS_FILE_PATH, METRICS_FILE_INTERVAL_SECONDS, API_HTTP_PORT, API_TOKEN
+)
+from pipeline import apply_nominal_durations, run_script_pipeline, run_schedule_job, run_scenario_sweep_job
+from utils.job_queue import QueueFullError, get_job_queue
+from utils.artifact_cache import content_hash, get_artifact_cache
+from utils.metrics import REGISTRY, start_metrics_file_writer, start_metrics_server
+
+def _get_job_queue():
+    return get_job_queue(
+        max_workers=MAX_JOB_WORKERS,
+        max_concurrent_conversions=MAX_CONCURRENT_CONVERSIONS,
+        max_pending_jobs=MAX_PENDING_JOBS
+    )
+
+def _get_artifact_cache():
+    return get_artifact_cache(ARTIFACT_CACHE_MAX_BYTES)
+
+def _cancel_job(job_id: str):
+    _get_job_queue().cancel(job_id)
+
+@st.fragment(run_every=JOB_POLL_INTERVAL_SECONDS)
+def display_job_progress(job_id: str):
+    """Polls a background job, showing its stage, progress, queue position and a cancel button; reruns the app once it ends."""
+    job_queue = _get_job_queue()
+    job = job_queue.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+
+    st.progress(job.progress, text=job.stage)
+    queue_position = job_queue.queue_position(job_id)
+    if queue_position is not None:
+        st.caption(f"Pozícia v poradí: {queue_position}")
+    else:
+        st.caption(f"Beží {time.time() - (job.started_at or job.created_at):.0f} s")
+    st.button("Zrušiť", key=f"cancel_{job_id}", on_click=_cancel_job, args=(job_id,), disabled=job.cancel_requested)
+    partial = job.partial
+    if partial is not None:
+        display_partial_result(partial)
+
+PREVIEW_TABLE_ROWS = 200
+
+def display_partial_result(partial: dict):
+    """Shows what a running upload job has parsed so far: the speaker list, the latest rows, the matrix and speaker totals."""
+    st.subheader("Priebežné výsledky")
+    st.caption(f"Spracovaných {partial['chunks_done']} častí. Posledný segment ešte nemusí byť úplný.")
+    if partial["speakers"]:
+        st.markdown(f"**Postavy ({len(partial['speakers'])}):** {', '.join(partial['speakers'])}")
+    if "df_processed" not in partial:
+        return
+    df_preview = partial["df_processed"]
+    table_tab, matrix_tab, totals_tab = st.tabs(["Scenár", "Matica Rečník-Segment", "Celkový čas rečníkov"])
+    with table_tab:
+        st.dataframe(df_preview.tail(PREVIEW_TABLE_ROWS).rename(columns=PARSED_TABLE_COLUMN_LABELS), use_container_width=True)
+        st.caption(f"Posledných {min(PREVIEW_TABLE_ROWS, len(df_preview))} z {len(df_preview)} doteraz spracovaných riadkov.")
+    with matrix_tab:
+        st.dataframe(partial["speaker_matrix"], use_container_width=True)
+    with totals_tab:
+        total_speaker_times = calculate_total_speaker_time(df_preview)
+        st.dataframe(pd.Series(total_speaker_times, name="Sekundy").rename_axis("Rečník"), use_container_width=True)
 
 def process_uploaded_file(uploaded_file):
-    """Processes the uploaded DOCX file and returns processed data."""
-    st.info(f"Spracováva sa súbor: {uploaded_file.name}")
+    """
+    Processes the uploaded DOCX file in a background job and returns processed data once
+    it is done, or None while the job is queued or running. When profiling was requested
+    from the admin panel, the file is processed again under the profiler.
+    """
+    file_bytes = uploaded_file.getvalue()
+    upload_key = content_hash(file_bytes)
+    upload_job = st.session_state.upload_job
+    job_pending = upload_job is not None and upload_job["key"] == upload_key
+    profile_run = st.session_state.profile_next_upload and not job_pending
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_file_path = Path(tmp_file.name)
+    upload_result = st.session_state.upload_result
+    if not job_pending and not profile_run and upload_result is not None and upload_result["key"] == upload_key:
+        # Only the enrichment and the indexes built from it are repeated when the nominal durations change
+        if upload_result["nominal_durations"] != st.session_state.nominal_durations:
+            upload_result = apply_nominal_durations(upload_result, st.session_state.nominal_durations)
+            st.session_state.upload_result = upload_result
+            st.session_state.season_text_indexes[upload_key] = upload_result["text_index"]
+        return upload_result["df_processed"]
 
-    try:
-        with st.spinner("Konvertujem a rozdeľujem dokument..."):
-            chunks = convert_and_chunk(tmp_file_path)
+    # Artifacts of a script already processed by any session are shared read-only
+    artifact_cache = _get_artifact_cache()
+    cached_artifacts = artifact_cache.get(upload_key) if not job_pending and not profile_run else None
+    if cached_artifacts is not None:
+        _log.info(f"Using cached artifacts for {uploaded_file.name}.")
+        st.session_state.upload_job = None
+        st.session_state.upload_result = {"key": upload_key, **cached_artifacts}
+        st.session_state.season_text_indexes[upload_key] = cached_artifacts["text_index"]
+        return process_uploaded_file(uploaded_file)
 
-        if chunks is None:
-            st.error("Nepodarilo sa konvertovať alebo rozdeliť dokument. Skontrolujte logy pre detaily.")
-            return None
-        elif not chunks:
-            st.warning("Dokument bol konvertovaný, ale neboli vygenerované žiadne textové časti (chunks).")
+    job_queue = _get_job_queue()
+    if not job_pending:
+        try:
+            job = job_queue.submit(
+                "script", run_script_pipeline, file_bytes, dict(st.session_state.nominal_durations), Path(uploaded_file.name).stem, profile_run,
+                dedup_key=None if profile_run else upload_key, conversion=True
+            )
+        except QueueFullError:
+            st.error("Server momentálne spracováva príliš veľa súborov. Skúste to prosím o chvíľu znova.")
             return None
-        else:
-            st.success(f"Dokument úspešne rozdelený na {len(chunks)} častí.")
+        st.session_state.profile_next_upload = False
+        upload_job = st.session_state.upload_job = {"key": upload_key, "job_id": job.id}
 
-            with st.spinner("Spracovávam časti (chunks)..."):
-                parsed_data_raw = parse_chunks_to_structured_data(chunks)
+    job = job_queue.get(upload_job["job_id"])
+    if job is None:
+        st.session_state.upload_job = None
+        st.error("Úloha spracovania sa stratila. Nahrajte súbor znova.")
+        return None
 
-            parsed_data = []
-            if parsed_data_raw:
-                for row_dict in parsed_data_raw:
-                    cleaned_row = {k: (v if v is not None else '') for k, v in row_dict.items()}
-                    parsed_data.append(cleaned_row)
+    if not job.finished:
+        st.info(f"Spracováva sa súbor: {uploaded_file.name}")
+        display_job_progress(job.id)
+        return None
 
-            if not parsed_data:
-                st.warning("Spracovanie dokončené, ale neboli extrahované žiadne štruktúrované dáta.")
-                return None
-            else:
-                st.success(f"Spracovanie dokončené. Extrahovaných {len(parsed_data)} riadkov.")
+    if job.status == "cancelled":
+        st.warning("Spracovanie bolo zrušené.")
+        if st.button("Spracovať znova"):
+            st.session_state.upload_job = None
+            st.rerun()
+        return None
+    if job.status == "failed":
+        st.error(f"Počas spracovania nastala chyba: {job.error}")
+        if st.button("Spracovať znova"):
+            st.session_state.upload_job = None
+            st.rerun()
+        return None
 
-                with st.spinner("Analyzujem štruktúrované dáta..."):
-                    df_processed = process_parsed_data(parsed_data, st.session_state.nominal_durations)
+    st.session_state.upload_job = None
+    artifacts = {name: artifact for name, artifact in job.result.items() if name != "profile_bundle"}
+    if "profile_bundle" in job.result:
+        st.session_state.profile_bundle = {
+            "file_name": f"{Path(uploaded_file.name).stem}_profile.zip",
+            "data": job.result["profile_bundle"]
+        }
+    artifact_cache.put(upload_key, artifacts)
+    st.session_state.upload_result = {"key": upload_key, **artifacts}
+    st.session_state.season_text_indexes[upload_key] = artifacts["text_index"]
+    st.success(
+        f"Dokument rozdelený na {job.result['num_chunks']} častí, extrahovaných {len(job.result['parsed_data'])} riadkov "
+        f"za {job.finished_at - job.started_at:.1f} s."
+    )
+    return process_uploaded_file(uploaded_file)
 
-                if df_processed.empty:
-                    st.warning("Analýza dát nepriniesla žiadne spracované riadky.")
-                    return None
-                else:
-                    st.success("Dáta úspešne analyzované a obohatené.")
-                    return df_processed
-    except Exception as e:
-        st.error(f"Počas spracovania nastala neočakávaná chyba: {e}")
-        _log.exception("Nespracovaná chyba počas behu aplikácie:")
-        return None
-    finally:
-        if 'tmp_file_path' in locals() and tmp_file_path.exists():
-            tmp_file_path.unlink()
-            _log.info(f"Dočasný súbor zmazaný: {tmp_file_path}")
+STAGE_LABELS = {
+    "conversion": "Konverzia (docling)",
+    "chunking": "Rozdelenie na časti",
+    "parse": "Parsovanie",
+    "enrich": "Obohatenie dát",
+    "index": "Indexovanie",
+    "matrix": "Matica rečník-segment",
+}
 
-def display_parsed_data_table(df_processed):
-    """Displays the processed data in a table."""
+def display_upload_timings(stage_timings: list[dict]):
+    """Shows the per-stage timing breakdown of the processing run that produced the current script."""
+    if not stage_timings:
+        return
+    with st.expander("Časy spracovania"):
+        # Conversion and chunking record one timing per converted part of the document
+        timings_df = pd.DataFrame(stage_timings).groupby("stage", sort=False).sum(min_count=1).reset_index()
+        timings_df["stage"] = timings_df["stage"].map(lambda stage: STAGE_LABELS.get(stage, stage))
+        timings_df = timings_df.rename(columns={"stage": "Fáza", "seconds": "Trvanie (s)", "input_size": "Veľkosť vstupu"})
+        st.dataframe(timings_df, use_container_width=True, hide_index=True)
+        st.caption(f"Spolu {sum(timing['seconds'] for timing in stage_timings):.2f} s.")
+
+PARSED_TABLE_COLUMN_LABELS = {
+    "Segment": "Segment",
+    "Speaker": "Rečník",
+    "Timecode": "Časový kód",
+    "Text": "Text",
+    "Scene Marker": "Označenie Scény",
+    "Segment Marker": "Označenie Segmentu",
+    "TimeInSeconds": "Čas v sekundách",
+    "NumSpeakersInSegment": "Počet rečníkov v segmente"
+}
+
+def display_parsed_data_table(df_processed, table_index):
+    """Displays one page of the processed data, filtered through the precomputed table index."""
     st.header("Spracované Dáta Scenára")
+    col_speakers, col_segments, col_scene = st.columns([0.4, 0.3, 0.3])
+    with col_speakers:
+        selected_speakers = st.multiselect("Filtrovať rečníkov", table_index.speakers, key="parsed_table_speakers")
+    with col_segments:
+        first_segment, last_segment = table_index.segment_bounds
+        segment_range = None
+        if last_segment > first_segment:
+            segment_range = st.slider("Rozsah segmentov", first_segment, last_segment, (first_segment, last_segment), key="parsed_table_segments")
+    with col_scene:
+        scene_idx = st.selectbox(
+            "Scéna",
+            range(len(table_index.scene_labels)),
+            index=None,
+            format_func=lambda idx: table_index.scene_labels[idx],
+            key="parsed_table_scene"
+        )
+
+    row_ids = table_index.query(selected_speakers, segment_range, scene_idx)
+    col_page_size, col_page = st.columns(2)
+    with col_page_size:
+        page_size = st.selectbox("Riadkov na stránku", [50, 100, 250, 500], index=1, key="parsed_table_page_size")
+    num_pages = max(1, -(-len(row_ids) // page_size))
+    if st.session_state.get("parsed_table_page", 1) > num_pages:
+        st.session_state.parsed_table_page = num_pages
+    with col_page:
+        page = st.number_input(f"Stránka (z {num_pages})", min_value=1, max_value=num_pages, value=1, key="parsed_table_page")
+
     try:
-        df_display_raw = df_processed.copy()
-        df_display = df_display_raw.rename(columns={
-            "Segment": "Segment",
-            "Speaker": "Rečník",
-            "Timecode": "Časový kód",
-            "Text": "Text",
-            "Scene Marker": "Označenie Scény",
-            "Segment Marker": "Označenie Segmentu",
-            "TimeInSeconds": "Čas v sekundách",
-            "NumSpeakersInSegment": "Počet rečníkov v segmente"
-        })
-        st.dataframe(df_display, use_container_width=True)
+        df_page = df_processed.iloc[page_rows(row_ids, page, page_size)].rename(columns=PARSED_TABLE_COLUMN_LABELS)
+        st.dataframe(df_page, use_container_width=True)
+        st.caption(f"Zobrazených {len(df_page)} z {len(row_ids)} vyfiltrovaných riadkov ({table_index.num_rows} celkom).")
     except Exception as e:
         _log.error(f"Error creating/casting main DataFrame for display: {e}.")
         st.error("Chyba pri zobrazovaní spracovaných dát.")
 
-def display_speaker_segment_matrix(df_processed, uploaded_file_name):
-    """Generates and displays the speaker-segment matrix with download option."""
-    st.header("Matica Rečník-Segment")
-    df_parsed_str_segment = df_processed.copy()
-    df_parsed_str_segment['Segment'] = df_parsed_str_segment['Segment'].astype(str)
+def display_dialogue_search(unique_speakers):
+    """Full-text search over the dialogue of the current episode or of every episode uploaded in this session."""
+    st.header("Vyhľadávanie v Dialógoch")
+    st.markdown('Hľadanie nerozlišuje diakritiku ani veľkosť písmen. Frázu zadajte v úvodzovkách (`"dobrý deň"`), začiatok slova s hviezdičkou (`dob*`).')
+    query = st.text_input("Hľadaný text", key="dialogue_search_query")
+    col_speakers, col_segments, col_scope = st.columns([0.4, 0.3, 0.3])
+    with col_speakers:
+        selected_speakers = st.multiselect("Rečníci", unique_speakers, key="dialogue_search_speakers")
+    with col_segments:
+        segment_range_text = st.text_input("Segmenty (napr. 3-12)", key="dialogue_search_segments")
+    with col_scope:
+        whole_season = st.checkbox(
+            f"Celá séria ({len(st.session_state.season_text_indexes)} epizód)",
+            key="dialogue_search_season",
+            help="Prehľadá všetky scenáre nahrané počas tejto relácie."
+        )
+    if not query.strip():
+        return
 
-    df_filtered = df_parsed_str_segment[
-        (df_parsed_str_segment['Speaker'] != '') &
-        (df_parsed_str_segment['Segment'].str.isdigit()) &
-        (df_parsed_str_segment['Segment'].astype(int) > 0)
-    ].copy()
+    segment_range = None
+    if segment_range_text.strip():
+        match = re.fullmatch(r"\s*(\d+)\s*(?:-\s*(\d+))?\s*", segment_range_text)
+        if not match:
+            st.error("Neplatný rozsah segmentov. Použite napr. 3-12 alebo 5.")
+            return
+        segment_range = (int(match.group(1)), int(match.group(2) or match.group(1)))
 
-    if not df_filtered.empty:
-        df_filtered['Segment'] = df_filtered['Segment'].astype(int)
-        try:
-            speaker_matrix = pd.crosstab(
-                index=df_filtered['Speaker'],
-                columns=df_filtered['Segment']
-            )
-            transformed_matrix = speaker_matrix.copy()
-            for segment_col in transformed_matrix.columns:
-                transformed_matrix[segment_col] = transformed_matrix[segment_col].apply(
-                    lambda count: str(segment_col) if count > 0 else ''
-                )
-            st.dataframe(transformed_matrix, use_container_width=True)
+    if whole_season:
+        indexes = list(st.session_state.season_text_indexes.values())
+    else:
+        indexes = [st.session_state.upload_result["text_index"]]
+    hits = search_episodes(indexes, query, selected_speakers, segment_range)
+    st.caption(f"Nájdených {len(hits)} výskytov.")
+    if not hits.empty:
+        st.dataframe(
+            hits.rename(columns={
+                "Episode": "Epizóda", "Row": "Riadok", "Speaker": "Rečník",
+                "Timecode": "Časový kód", "TimecodeMs": "Čas (ms)"
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
 
-            excel_data = to_excel(transformed_matrix)
-            st.download_button(
-                label="📥 Stiahnuť Maticu Rečník-Segment (Excel)",
-                data=excel_data,
-                file_name=f"{Path(uploaded_file_name).stem}_matica_recnik_segment.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        except Exception as e:
-            st.error(f"Chyba pri vytváraní matice rečníkov: {e}")
+def display_speaker_segment_matrix(speaker_matrix):
+    """Displays the speaker-segment matrix."""
+    st.header("Matica Rečník-Segment")
+    if not speaker_matrix.empty:
+        st.dataframe(speaker_matrix, use_container_width=True)
     else:
         st.warning("Neboli nájdené žiadne dáta rečníkov v platných segmentoch na vytvorenie matice.")
 
+def display_workbook_export(df_processed, uploaded_file_name):
+    """Builds the multi-sheet Excel workbook on request and offers it for download."""
+    st.header("Export do Excelu")
+    st.markdown("Zošit obsahuje scenár, maticu rečník-segment, segmenty, zobrazený kalendár a plán nahrávania.")
+    if st.button("Pripraviť Excel Export"):
+        from utils.excel_export import build_workbook_sheets, to_excel_workbook
+
+        with st.spinner("Vytváram Excel zošit..."):
+            start = time.perf_counter()
+            calendar_df = None
+            if st.session_state.get("calendar_cache") is not None:
+                calendar_df = st.session_state.calendar_cache.get_window(
+                    st.session_state.calendar_start_date, st.session_state.get("calendar_num_days", 7)
+                )
+            schedule_bookings = None
+            if st.session_state.last_schedule is not None:
+                schedule_bookings = st.session_state.last_schedule.bookings.sort_values("start")
+            sheets = build_workbook_sheets(
+                df_processed,
+                st.session_state.upload_result["speaker_matrix"],
+                build_segment_table(df_processed),
+                calendar_df,
+                schedule_bookings
+            )
+            st.session_state.excel_export = {
+                "file_name": uploaded_file_name,
+                "data": to_excel_workbook(sheets),
+                "seconds": time.perf_counter() - start,
+                "rows": len(df_processed)
+            }
+
+    excel_export = st.session_state.get("excel_export")
+    if excel_export and excel_export["file_name"] == uploaded_file_name:
+        st.caption(
+            f"Export {excel_export['rows']} riadkov trval {excel_export['seconds']:.2f} s, "
+            f"veľkosť súboru {len(excel_export['data']) / 1024:.1f} kB."
+        )
+        st.download_button(
+            label="📥 Stiahnuť Excel Zošit",
+            data=excel_export["data"],
+            file_name=f"{Path(uploaded_file_name).stem}_export.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
 def display_segment_time_analysis(df_processed):
     """Displays segment time analysis by speaker count."""
     st.header("Analýza Času Segmentov Podľa Počtu Rečníkov")
@@ -170,71 +367,131 @@ def configure_nominal_durations():
     )
 
 def manage_speaker_availability(unique_speakers):
-    """Manages speaker availability inputs."""
+    """Manages speaker availability in an editable speaker x day grid, committed in one batch per form submit."""
     st.header("Dostupnosť Rečníkov a Optimálny Plán Nahrávania")
-    speaker_availability_inputs = {}
-
-    if unique_speakers:
-        st.markdown("Zadajte dostupné časové sloty pre každého rečníka:")
-        
-        for speaker in unique_speakers:
-            if speaker not in st.session_state.speaker_availability_slots:
-                today = datetime.today().strftime('%Y-%m-%d')
-                tomorrow = (datetime.today() + timedelta(days=1)).strftime('%Y-%m-%d')
-                day_after_tomorrow = (datetime.today() + timedelta(days=2)).strftime('%Y-%m-%d')
-                st.session_state.speaker_availability_slots[speaker] = [
-                    f"{today} 09:00-17:00",
-                    f"{tomorrow} 09:00-17:00",
-                    f"{day_after_tomorrow} 09:00-17:00"
-                ]
-        speakers_to_remove = [s for s in st.session_state.speaker_availability_slots if s not in unique_speakers]
-        for s in speakers_to_remove:
-            del st.session_state.speaker_availability_slots[s]
-
-        num_cols = st.slider("Počet stĺpcov pre dostupnosť rečníkov", 1, 4, 2)
-        cols = st.columns(num_cols)
-        col_idx = 0
-
-        for speaker in unique_speakers:
-            with cols[col_idx]:
-                st.subheader(f"Dostupnosť pre {speaker}")
-                current_slots = st.session_state.speaker_availability_slots.get(speaker, [])
-                
-                if current_slots:
-                    for i, slot in enumerate(current_slots):
-                        col1_inner, col2_inner = st.columns([0.7, 0.3])
-                        with col1_inner:
-                            st.write(f"- {slot}")
-                        with col2_inner:
-                            if st.button("Zmazať", key=f"delete_{speaker}_{i}"):
-                                st.session_state.speaker_availability_slots[speaker].pop(i)
-                                st.rerun()
-                else:
-                    st.info("Žiadne časové sloty pridané.")
-
-                new_slot_key = f"new_slot_{speaker}"
-                if new_slot_key not in st.session_state:
-                    st.session_state[new_slot_key] = f"{datetime.today().strftime('%Y-%m-%d')} 09:00-12:00"
 
-                new_slot_value = st.text_input(
-                    "Pridať nový slot (YYYY-MM-DD HH:MM-HH:MM)", 
-                    value=st.session_state[new_slot_key], 
-                    key=new_slot_key
-                )
-                
-                if st.button("Pridať Slot", key=f"add_slot_{speaker}"):
-                    if new_slot_value and re.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}-\d{2}:\d{2}", new_slot_value.strip()):
-                        st.session_state.speaker_availability_slots[speaker].append(new_slot_value.strip())
-                        st.rerun()
-                    else:
-                        st.error("Neplatný formát slotu. Použite YYYY-MM-DD HH:MM-HH:MM.")
-                
-                speaker_availability_inputs[speaker] = st.session_state.speaker_availability_slots[speaker]
-            
-            col_idx = (col_idx + 1) % num_cols
-    else:
+    if not unique_speakers:
         st.info("Žiadni rečníci nájdení pre zadanie dostupnosti.")
-    return speaker_availability_inputs
+        return {}
+
+    for speaker in unique_speakers:
+        if speaker not in st.session_state.speaker_availability_slots:
+            st.session_state.speaker_availability_slots[speaker] = [
+                f"{(datetime.today() + timedelta(days=i)).strftime('%Y-%m-%d')} 09:00-17:00" for i in range(3)
+            ]
+    speakers_to_remove = [s for s in st.session_state.speaker_availability_slots if s not in unique_speakers]
+    for s in speakers_to_remove:
+        del st.session_state.speaker_availability_slots[s]
+
+    recording_days = [slot.split(' ', 1)[0] for slot in st.session_state.recording_slots]
+    grid = slots_to_grid(
+        st.session_state.speaker_availability_slots,
+        unique_speakers,
+        recording_days + st.session_state.availability_grid_extra_days
+    )
+    hidden_slots = ungridded_slots(st.session_state.speaker_availability_slots, unique_speakers)
+
+    st.markdown(
+        "Do buniek zadajte časové rozsahy dostupnosti v tvare `HH:MM-HH:MM`, viac rozsahov oddeľte čiarkou. "
+        "Zmeny sa uložia naraz tlačidlom **Uložiť Dostupnosť**."
+    )
+    if hidden_slots:
+        st.caption(
+            f"{sum(len(slots) for slots in hidden_slots.values())} slotov ({', '.join(hidden_slots)}) sa v mriežke nedá zobraziť; "
+            "pri uložení zostanú zachované."
+        )
+    with st.form("availability_grid_form"):
+        edited_grid = st.data_editor(
+            grid.rename_axis("Rečník"),
+            key=f"availability_grid_{st.session_state.availability_grid_version}",
+            use_container_width=True,
+            column_config={day: st.column_config.TextColumn(day) for day in grid.columns}
+        )
+        new_day = st.date_input("Pridať stĺpec pre deň", value=None, format="YYYY-MM-DD")
+        submitted = st.form_submit_button("Uložiť Dostupnosť")
+
+    if submitted:
+        slots_by_speaker, errors = grid_to_slots(edited_grid)
+        if not errors.empty:
+            st.error(f"Neplatné časové rozsahy ({len(errors)}), dostupnosť nebola uložená. Použite HH:MM-HH:MM.")
+            st.dataframe(errors.rename(columns={"speaker": "Rečník", "day": "Deň", "value": "Hodnota"}), use_container_width=True)
+        else:
+            st.session_state.speaker_availability_slots = {
+                speaker: slots + hidden_slots.get(speaker, []) for speaker, slots in slots_by_speaker.items()
+            }
+            if new_day is not None and new_day.isoformat() not in st.session_state.availability_grid_extra_days:
+                st.session_state.availability_grid_extra_days.append(new_day.isoformat())
+            st.session_state.availability_grid_version += 1
+            st.rerun()
+
+    return {speaker: st.session_state.speaker_availability_slots[speaker] for speaker in unique_speakers}
+
+def manage_availability_bulk_import(unique_speakers):
+    """Bulk import of speaker availability from CSV / iCalendar files and recurring availability rules."""
+    with st.expander("Hromadný import dostupnosti (CSV, iCalendar, opakovanie)"):
+        st.markdown(
+            "CSV so stĺpcami `rečník` a `slot` (alebo `dátum`, `od`, `do`, alebo `pravidlo`), "
+            "prípadne súbor `.ics`, kde názov udalosti je meno rečníka."
+        )
+        availability_file = st.file_uploader("Nahrať dostupnosť (CSV / ICS)", type=["csv", "ics"], key="availability_import_file")
+        if availability_file is not None and st.button("Importovať Dostupnosť"):
+            file_text = availability_file.getvalue().decode("utf-8-sig")
+            if availability_file.name.lower().endswith(".ics"):
+                imported_slots, imported_rules = import_availability_ics(file_text)
+            else:
+                imported_slots, imported_rules = import_availability_csv(file_text)
+
+            unknown_speakers = (set(imported_slots) | {rule.speaker for rule in imported_rules}) - set(unique_speakers)
+            for speaker, slots in imported_slots.items():
+                if speaker in unique_speakers:
+                    existing_slots = st.session_state.speaker_availability_slots.setdefault(speaker, [])
+                    existing_slots.extend(slot for slot in slots if slot not in existing_slots)
+            st.session_state.availability_grid_version += 1
+            st.session_state.availability_rules.extend(
+                rule for rule in imported_rules
+                if rule.speaker in unique_speakers and rule not in st.session_state.availability_rules
+            )
+            if unknown_speakers:
+                st.warning(f"Preskočení neznámi rečníci: {', '.join(sorted(unknown_speakers))}")
+            st.success(f"Importovaných {sum(len(slots) for slots in imported_slots.values())} slotov a {len(imported_rules)} pravidiel.")
+
+        col_speaker, col_rule = st.columns([0.3, 0.7])
+        with col_speaker:
+            rule_speaker = st.selectbox("Rečník", unique_speakers, key="availability_rule_speaker")
+        with col_rule:
+            rule_text = st.text_input(
+                "Opakovaná dostupnosť (napr. weekdays 09:00-17:00 until end of month)",
+                key="availability_rule_text"
+            )
+        if st.button("Pridať Pravidlo") and rule_speaker:
+            rule = parse_rule_text(rule_speaker, rule_text)
+            if rule:
+                st.session_state.availability_rules.append(rule)
+            else:
+                st.error("Neplatné pravidlo. Príklad: 'po,st 10:00-14:00 od 2026-11-02 do 2026-11-30'.")
+
+        for i, rule in enumerate(st.session_state.availability_rules):
+            col1, col2 = st.columns([0.8, 0.2])
+            with col1:
+                st.write(f"- {rule.speaker}: {describe_rule(rule)}")
+            with col2:
+                if st.button("Zmazať", key=f"delete_rule_{i}"):
+                    st.session_state.availability_rules.pop(i)
+                    st.rerun()
+
+def build_scheduling_availability(unique_speakers, speaker_availability_inputs, recording_days_times):
+    """Merges slots and recurrence rules into per-speaker interval sets over the recording horizon."""
+    recording_dates = sorted(slot.split(' ')[0] for slot in recording_days_times if slot.strip())
+    try:
+        horizon_start = datetime.strptime(recording_dates[0], '%Y-%m-%d').date()
+        horizon_end = datetime.strptime(recording_dates[-1], '%Y-%m-%d').date() + timedelta(days=1)
+    except (IndexError, ValueError):
+        horizon_start = datetime.today().date()
+        horizon_end = horizon_start + timedelta(days=30)
+    interval_sets = build_speaker_interval_sets(
+        speaker_availability_inputs, st.session_state.availability_rules, horizon_start, horizon_end
+    )
+    return {speaker: interval_sets.get(speaker, []) for speaker in unique_speakers}
 
 def manage_global_recording_times():
     """Manages global recording time slots."""
@@ -274,18 +531,46 @@ def manage_global_recording_times():
     
     return st.session_state.recording_slots
 
+def _shift_calendar_start(days: int):
+    """Moves the calendar window start by the given number of days."""
+    st.session_state.calendar_start_date += timedelta(days=days)
+
 def display_calendar_view(unique_speakers, speaker_availability_inputs, recording_days_times):
-    """Displays the calendar view of speaker and recording availability."""
+    """Displays a window of the calendar view of speaker and recording availability."""
+    from analyzer.scheduler.calendar import AvailabilityIndex, CalendarWindowCache
+
     st.header("Kalendár Dostupnosti Rečníkov a Nahrávania")
-    num_days_to_show = st.slider("Počet dní na zobrazenie v kalendári", 1, 30, 7)
+    num_days_to_show = st.slider("Počet dní na zobrazenie v kalendári", 1, 30, 7, key="calendar_num_days")
+    if "calendar_start_date" not in st.session_state:
+        st.session_state.calendar_start_date = datetime.today().date()
+
+    col_prev, col_date, col_next = st.columns([0.2, 0.6, 0.2])
+    with col_prev:
+        st.button("◀ Predchádzajúce", on_click=_shift_calendar_start, args=(-num_days_to_show,), key="calendar_prev")
+    with col_date:
+        st.date_input("Začiatok kalendára", key="calendar_start_date")
+    with col_next:
+        st.button("Nasledujúce ▶", on_click=_shift_calendar_start, args=(num_days_to_show,), key="calendar_next")
+
     if unique_speakers or recording_days_times:
-        with st.spinner("Generujem kalendár..."):
-            calendar_df = generate_calendar_view(
-                unique_speakers, 
-                speaker_availability_inputs, 
-                recording_days_times,
-                num_days_to_show=num_days_to_show
+        # The availability index is rebuilt only when the availability inputs change
+        calendar_signature = (
+            tuple(unique_speakers),
+            tuple((speaker, tuple(slots)) for speaker, slots in sorted(speaker_availability_inputs.items())),
+            tuple(recording_days_times),
+            tuple(st.session_state.availability_rules)
+        )
+        if st.session_state.get("calendar_signature") != calendar_signature:
+            st.session_state.calendar_signature = calendar_signature
+            st.session_state.calendar_cache = CalendarWindowCache(
+                AvailabilityIndex(unique_speakers, speaker_availability_inputs, recording_days_times, st.session_state.availability_rules)
             )
+        calendar_cache = st.session_state.calendar_cache
+
+        with st.spinner("Generujem kalendár..."):
+            calendar_df = calendar_cache.get_window(st.session_state.calendar_start_date, num_days_to_show)
+        calendar_cache.prefetch_neighbours(st.session_state.calendar_start_date, num_days_to_show)
+
         if not calendar_df.empty:
             st.dataframe(calendar_df, use_container_width=True)
         else:
@@ -299,7 +584,8 @@ def manage_availability_json_import_export():
 
     export_data = {
         "speaker_availability": st.session_state.speaker_availability_slots,
-        "recording_slots": st.session_state.recording_slots
+        "recording_slots": st.session_state.recording_slots,
+        "availability_rules": [rule_to_dict(rule) for rule in st.session_state.availability_rules]
     }
     json_export_str = json.dumps(export_data, indent=4)
     st.download_button(
@@ -316,6 +602,7 @@ def manage_availability_json_import_export():
             if "speaker_availability" in loaded_data and "recording_slots" in loaded_data:
                 st.session_state.loaded_speaker_availability = loaded_data["speaker_availability"]
                 st.session_state.loaded_recording_slots = loaded_data["recording_slots"]
+                st.session_state.loaded_availability_rules = [rule_from_dict(rule_dict) for rule_dict in loaded_data.get("availability_rules", [])]
                 st.success("Dostupnosť úspešne načítaná z JSON súboru! Kliknite 'Použiť Načítané Dáta' pre aplikovanie.")
                 st.session_state.show_apply_button = True
             else:
@@ -329,37 +616,454 @@ def manage_availability_json_import_export():
         if st.button("Použiť Načítané Dáta"):
             st.session_state.speaker_availability_slots = st.session_state.loaded_speaker_availability
             st.session_state.recording_slots = st.session_state.loaded_recording_slots
+            st.session_state.availability_rules = st.session_state.loaded_availability_rules
             st.session_state.show_apply_button = False
+            st.session_state.availability_grid_version += 1
             st.rerun()
 
+def format_schedule_bookings(schedule) -> pd.DataFrame:
+    """Formats the columnar schedule bookings for display."""
+    bookings = schedule.bookings.sort_values("start")
+    return pd.DataFrame({
+        "Segment": bookings["segment_id"],
+        "Rečníci": bookings["speakers"].str.join(", "),
+        "Trvanie (s)": bookings["duration"].round(2),
+        "Začiatok": bookings["start"].dt.strftime('%Y-%m-%d %H:%M:%S'),
+        "Koniec": bookings["end"].dt.strftime('%H:%M:%S'),
+        "Miestnosť": bookings["room"],
+    }).reset_index(drop=True)
+
+def format_speaker_summary(speaker_summary_df, schedule) -> pd.DataFrame:
+    """Formats the per-speaker schedule summary (minutes, time ranges) for display."""
+    speaker_bookings = schedule.speaker_bookings.sort_values("start")
+    scheduled_ranges = (
+        speaker_bookings["start"].dt.strftime('%Y-%m-%d %H:%M') + "-" + speaker_bookings["end"].dt.strftime('%H:%M')
+    ).groupby(speaker_bookings["speaker"]).agg(", ".join)
+    return pd.DataFrame({
+        "SpeakerName": speaker_summary_df["SpeakerName"],
+        "TotalScheduledDuration (min)": (speaker_summary_df["TotalScheduledDuration"] / 60).round(2),
+        "TotalSegments": speaker_summary_df["TotalSegments"],
+        "OverallTimeRange": speaker_summary_df["OverallStart"].dt.strftime('%Y-%m-%d %H:%M') + "-" + speaker_summary_df["OverallEnd"].dt.strftime('%H:%M'),
+        "IdleTime (min)": (speaker_summary_df["IdleTime"] / 60).round(2),
+        "ScheduledTimeRanges": speaker_summary_df["SpeakerName"].map(scheduled_ranges),
+    })
+
+def display_schedule_estimate(df_processed, speaker_availability_inputs, recording_days_times):
+    """Instant lower bounds on studio days and time, shown before the scheduler is run."""
+    from analyzer.scheduler.estimates import estimate_schedule
+
+    if df_processed is None or df_processed.empty or not recording_days_times:
+        return
+    estimate = estimate_schedule(df_processed, speaker_availability_inputs, recording_days_times)
+    hours = f"{estimate.required_seconds / 3600:.1f} h nahrávania, {estimate.studio_seconds / 3600:.1f} h štúdia"
+    if estimate.min_days is None:
+        st.error(f"Odhad: scenár sa do rezervovaných dní štúdia nezmestí ({hours}).")
+    elif estimate.fits:
+        st.success(f"Odhad: potrebné aspoň {estimate.min_days} z {estimate.studio_days} dní štúdia ({hours}).")
+    else:
+        st.warning(f"Odhad: aspoň {estimate.min_days} z {estimate.studio_days} dní štúdia ({hours}), ale nie všetky segmenty sa dajú naplánovať.")
+
+    if estimate.fits:
+        return
+    with st.expander("Detaily odhadu"):
+        if estimate.min_slots is None:
+            st.markdown(f"Segmenty sa nezmestia do {estimate.studio_slots} blokov nahrávania.")
+        else:
+            st.markdown(f"Potrebné aspoň **{estimate.min_slots}** z {estimate.studio_slots} blokov nahrávania.")
+        overloaded = estimate.overloaded_speakers
+        if not overloaded.empty:
+            st.markdown("**Rečníci s nedostatkom času v štúdiu:**")
+            st.dataframe(pd.DataFrame({
+                "Rečník": overloaded["speaker"],
+                "Potrebný čas (min)": (overloaded["required_seconds"] / 60).round(2),
+                "Dostupný čas (min)": (overloaded["available_seconds"] / 60).round(2),
+                "Chýba (min)": (overloaded["shortfall_seconds"] / 60).round(2),
+            }), hide_index=True, use_container_width=True)
+        unschedulable = estimate.unschedulable
+        if not unschedulable.empty:
+            st.markdown("**Segmenty, ktoré sa nedajú naplánovať nikdy:**")
+            st.dataframe(pd.DataFrame({
+                "Segment": unschedulable["segment_id"],
+                "Rečníci": unschedulable["speakers"].map(", ".join),
+                "Trvanie (min)": (unschedulable["duration"] / 60).round(2),
+                "Najdlhšie spoločné okno (min)": (unschedulable["longest_window_seconds"] / 60).round(2),
+            }), hide_index=True, use_container_width=True)
+
 def display_optimal_schedule(df_processed, unique_speakers, speaker_availability_inputs, recording_days_times):
     """Calculates and displays the optimal recording schedule."""
-    if st.button("Vypočítať Optimálny Plán Nahrávania"):
+    from analyzer.scheduler.summary import summarize_speaker_schedule
+
+    col_calculate, col_repair = st.columns(2)
+    with col_calculate:
+        calculate_clicked = st.button("Vypočítať Optimálny Plán Nahrávania")
+        display_schedule_estimate(df_processed, speaker_availability_inputs, recording_days_times)
+    with col_repair:
+        repair_clicked = st.button(
+            "Opraviť Plán po Zmene Dostupnosti",
+            disabled=st.session_state.last_schedule is None or st.session_state.last_schedule_inputs is None,
+            help="Preplánuje iba segmenty dotknuté zmenou dostupnosti, ostatné termíny zostanú nezmenené."
+        )
+
+    if calculate_clicked or repair_clicked:
         if unique_speakers and speaker_availability_inputs:
-            with st.spinner("Vypočítavam optimálny plán..."):
-                optimal_schedule = calculate_optimal_schedule(df_processed, speaker_availability_inputs, recording_days_times)
-            
-            st.subheader("Navrhovaný Plán Nahrávania")
-            if optimal_schedule and optimal_schedule.get("details"):
-                for item in optimal_schedule["details"]:
-                    st.write(f"Segment {item['segment_id']} ({item['duration']:.2f}s) s rečníkmi {', '.join(item['speakers'])}: {item['assigned_start_time']}-{item['assigned_end_time'].split(' ')[1]} ({item['status']})")
-                if optimal_schedule.get("unassigned_segments"):
-                    st.warning(f"Nasledujúce segmenty neboli priradené: {', '.join(optimal_schedule['unassigned_segments'])}")
-            else:
-                st.info("Optimálny plán nebol vygenerovaný alebo neobsahuje detaily.")
-
-            if optimal_schedule and optimal_schedule.get("details"):
-                st.subheader("Súhrn Plánu Nahrávania Podľa Rečníka")
-                speaker_summary_df = summarize_speaker_schedule(optimal_schedule["details"])
-                if not speaker_summary_df.empty:
-                    speaker_summary_df['TotalScheduledDuration (min)'] = (speaker_summary_df['TotalScheduledDuration'] / 60).round(2)
-                speaker_summary_df['IdleTime (min)'] = (speaker_summary_df['IdleTime'] / 60).round(2)
-                st.dataframe(speaker_summary_df[['SpeakerName', 'TotalScheduledDuration (min)', 'TotalSegments', 'OverallTimeRange', 'IdleTime (min)', 'ScheduledTimeRanges']], use_container_width=True)
-            else:
-                st.info("Žiadny súhrn plánu nahrávania pre rečníkov.")
+            previous = None
+            if repair_clicked:
+                previous_inputs = st.session_state.last_schedule_inputs
+                previous = {
+                    "schedule": st.session_state.last_schedule,
+                    "speaker_availability": previous_inputs["speaker_availability"],
+                    "recording_slots": previous_inputs["recording_slots"]
+                }
+            inputs = {
+                "speaker_availability": {speaker: list(slots) for speaker, slots in speaker_availability_inputs.items()},
+                "recording_slots": list(recording_days_times)
+            }
+            try:
+                job = _get_job_queue().submit(
+                    "repair" if repair_clicked else "schedule",
+                    run_schedule_job, df_processed, inputs["speaker_availability"], inputs["recording_slots"], previous
+                )
+                st.session_state.schedule_job = {"job_id": job.id, "inputs": inputs}
+            except QueueFullError:
+                st.error("Server je momentálne preťažený. Skúste výpočet plánu o chvíľu znova.")
         else:
             st.warning("Nahrajte dokument a zadajte dostupnosť rečníkov pre výpočet plánu.")
 
+    schedule_job = st.session_state.schedule_job
+    if schedule_job is not None:
+        job = _get_job_queue().get(schedule_job["job_id"])
+        if job is not None and not job.finished:
+            display_job_progress(job.id)
+        else:
+            st.session_state.schedule_job = None
+            if job is not None and job.status == "done":
+                st.session_state.last_schedule = job.result
+                st.session_state.last_schedule_inputs = schedule_job["inputs"]
+                st.session_state.schedule_editor_base = None
+                st.session_state.schedule_editor_version += 1
+            elif job is not None and job.status == "failed":
+                st.error(f"Výpočet plánu zlyhal: {job.error}")
+            elif job is not None and job.status == "cancelled":
+                st.warning("Výpočet plánu bol zrušený.")
+
+    optimal_schedule = st.session_state.last_schedule
+    if optimal_schedule is None:
+        return
+
+    st.subheader("Navrhovaný Plán Nahrávania")
+    if optimal_schedule.repaired_segments:
+        st.info(f"Preplánované segmenty: {', '.join(optimal_schedule.repaired_segments)}")
+    if not optimal_schedule.bookings.empty:
+        st.dataframe(format_schedule_bookings(optimal_schedule), use_container_width=True)
+        if optimal_schedule.unassigned_segments:
+            st.warning(f"Nasledujúce segmenty neboli priradené: {', '.join(optimal_schedule.unassigned_segments)}")
+    else:
+        st.info("Optimálny plán nebol vygenerovaný alebo neobsahuje detaily.")
+    if optimal_schedule.unassigned_segments:
+        display_unassigned_diagnostics(optimal_schedule, df_processed, speaker_availability_inputs, recording_days_times)
+
+    if not optimal_schedule.bookings.empty:
+        st.subheader("Súhrn Plánu Nahrávania Podľa Rečníka")
+        speaker_summary_df = summarize_speaker_schedule(optimal_schedule)
+        st.dataframe(format_speaker_summary(speaker_summary_df, optimal_schedule), use_container_width=True)
+    else:
+        st.info("Žiadny súhrn plánu nahrávania pre rečníkov.")
+
+FEASIBILITY_REASON_LABELS = {
+    "unknown_segment": "Segment sa v aktuálnom scenári nenachádza.",
+    "speaker_without_availability": "Niektorý rečník nemá žiadnu dostupnosť počas časov nahrávania štúdia.",
+    "no_common_availability": "Rečníci segmentu nie sú nikdy dostupní súčasne.",
+    "no_common_studio_time": "Rečníci sú dostupní súčasne, ale nie počas časov nahrávania štúdia.",
+    "window_too_short": "Spoločné voľné okno ({longest} min) je kratšie ako segment ({required} min).",
+    "feasible": "Segment by sa zmestil ({longest} min spoločného okna), ale jeho čas obsadili iné segmenty.",
+}
+
+def get_feasibility_matrix(df_processed, speaker_availability_inputs, recording_days_times):
+    """
+    Feasibility matrix of the current script. It is kept in the session and only the rows of
+    speakers whose availability changed are recomputed; a new script builds it again.
+    """
+    from analyzer.scheduler.core import build_segments_to_schedule
+    from analyzer.scheduler.feasibility import FeasibilityMatrix
+
+    segments = build_segments_to_schedule(df_processed)
+    matrix = st.session_state.feasibility_matrix
+    if matrix is None or not matrix.has_segments(segments):
+        matrix = FeasibilityMatrix(segments, speaker_availability_inputs, recording_days_times)
+        st.session_state.feasibility_matrix = matrix
+    else:
+        matrix.update(speaker_availability_inputs, recording_days_times)
+    return matrix
+
+def display_unassigned_diagnostics(optimal_schedule, df_processed, speaker_availability_inputs, recording_days_times):
+    """Explains, from the feasibility matrix, why a chosen unassigned segment could not be scheduled."""
+    with st.expander("Prečo segment nebol priradený?"):
+        segment_id = st.selectbox(
+            "Segment",
+            optimal_schedule.unassigned_segments,
+            index=None,
+            placeholder="Vyberte nepriradený segment",
+            key="unassigned_diagnostics_segment"
+        )
+        if segment_id is None:
+            return
+        st.caption("Diagnostika vychádza z aktuálne zadanej dostupnosti a časov nahrávania.")
+        matrix = get_feasibility_matrix(df_processed, speaker_availability_inputs, recording_days_times)
+        explanation = matrix.explain(segment_id)
+        st.info(FEASIBILITY_REASON_LABELS[explanation["reason"]].format(
+            longest=explanation["longest_run_bins"] * matrix.bin_minutes,
+            required=explanation["required_bins"] * matrix.bin_minutes
+        ))
+        if not explanation["speakers"].empty:
+            speaker_table = explanation["speakers"].set_index("speaker") * matrix.bin_minutes
+            speaker_table.index.name = "Rečník"
+            st.dataframe(speaker_table.rename(columns={
+                "available_bins": "Dostupnosť (min)",
+                "available_in_studio_bins": "V čase nahrávania (min)",
+                "shared_with_cast_bins": "Spolu so zvyškom obsadenia (min)"
+            }), use_container_width=True)
+
+VIOLATION_LABELS = {
+    "invalid_booking": "Neplatný čas",
+    "speaker_double_booking": "Rečník naplánovaný dvakrát",
+    "room_overlap": "Prekrytie v štúdiu",
+    "outside_recording_slots": "Mimo časov nahrávania",
+    "outside_availability": "Mimo dostupnosti rečníka",
+    "dropped_segment": "Vynechaný segment",
+    "duplicate_segment": "Duplicitný segment",
+    "unknown_segment": "Neznámy segment",
+}
+
+SCHEDULE_EDITOR_LABELS = {"segment_id": "Segment", "speakers": "Rečníci", "start": "Začiatok", "end": "Koniec", "room": "Miestnosť"}
+
+def schedule_to_editor(bookings: pd.DataFrame) -> pd.DataFrame:
+    """Bookings as an editable table: speakers comma separated, one row per booking."""
+    bookings = bookings.sort_values("start")
+    return pd.DataFrame({
+        "segment_id": bookings["segment_id"].astype(str),
+        "speakers": bookings["speakers"].map(lambda speakers: ", ".join(speakers) if isinstance(speakers, list) else str(speakers or "")),
+        "start": pd.to_datetime(bookings["start"], errors="coerce"),
+        "end": pd.to_datetime(bookings["end"], errors="coerce"),
+        "room": bookings["room"].fillna(""),
+    }, dtype=object).astype({"start": "datetime64[ns]", "end": "datetime64[ns]"}).reset_index(drop=True)
+
+def editor_to_bookings(edited: pd.DataFrame) -> pd.DataFrame:
+    """Converts the edited table back to bookings with the ScheduleResult columns."""
+    start = pd.to_datetime(edited["start"], errors="coerce")
+    end = pd.to_datetime(edited["end"], errors="coerce")
+    return pd.DataFrame({
+        "segment_id": edited["segment_id"].fillna("").astype(str).str.strip(),
+        "room": edited["room"].fillna(""),
+        "start": start,
+        "end": end,
+        "duration": (end - start).dt.total_seconds(),
+        "speakers": edited["speakers"].fillna("").astype(str).map(
+            lambda speakers: [speaker.strip() for speaker in speakers.split(",") if speaker.strip()]
+        ),
+    }).reset_index(drop=True)
+
+@st.fragment
+def display_schedule_editor(df_processed, speaker_availability_inputs, recording_days_times):
+    """
+    Hand-editing and import of the schedule. Every edit reruns only this fragment and the edited
+    schedule is validated again (double bookings, availability, studio slots, dropped segments).
+    """
+    from analyzer.scheduler.result import ScheduleResult
+    from analyzer.scheduler.validation import DROPPED_SEGMENT, validate_schedule
+
+    st.subheader("Úprava a Kontrola Plánu")
+    with st.expander("Importovať plán (CSV)"):
+        st.markdown("CSV so stĺpcami `segment_id`, `speakers` (oddelené čiarkou), `start`, `end` a `room`, napr. z exportu nižšie.")
+        schedule_file = st.file_uploader("Nahrať plán", type="csv", key="schedule_import_file")
+        if schedule_file is not None and st.button("Načítať Plán do Editora"):
+            try:
+                imported = pd.read_csv(schedule_file, dtype=str, keep_default_na=False)
+                missing_columns = [column for column in SCHEDULE_EDITOR_LABELS if column not in imported.columns]
+                if missing_columns:
+                    st.error(f"V CSV chýbajú stĺpce: {', '.join(missing_columns)}")
+                else:
+                    st.session_state.schedule_editor_base = schedule_to_editor(editor_to_bookings(imported))
+                    st.session_state.schedule_editor_version += 1
+            except (pd.errors.ParserError, UnicodeDecodeError) as e:
+                st.error(f"Súbor sa nepodarilo načítať: {e}")
+
+    if st.session_state.schedule_editor_base is None:
+        if st.session_state.last_schedule is None:
+            st.info("Vypočítajte alebo importujte plán, aby ho bolo možné upraviť.")
+            return
+        st.session_state.schedule_editor_base = schedule_to_editor(st.session_state.last_schedule.bookings)
+
+    edited = st.data_editor(
+        st.session_state.schedule_editor_base,
+        key=f"schedule_editor_{st.session_state.schedule_editor_version}",
+        num_rows="dynamic",
+        use_container_width=True,
+        column_config={
+            "segment_id": st.column_config.TextColumn(SCHEDULE_EDITOR_LABELS["segment_id"]),
+            "speakers": st.column_config.TextColumn(SCHEDULE_EDITOR_LABELS["speakers"]),
+            "start": st.column_config.DatetimeColumn(SCHEDULE_EDITOR_LABELS["start"], format="YYYY-MM-DD HH:mm", step=60),
+            "end": st.column_config.DatetimeColumn(SCHEDULE_EDITOR_LABELS["end"], format="YYYY-MM-DD HH:mm", step=60),
+            "room": st.column_config.TextColumn(SCHEDULE_EDITOR_LABELS["room"]),
+        }
+    )
+    edited_bookings = editor_to_bookings(edited)
+    violations = validate_schedule(edited_bookings, df_processed, speaker_availability_inputs, recording_days_times)
+    if violations.empty:
+        st.success("Plán je platný: žiadne konflikty, všetky segmenty sú naplánované.")
+    else:
+        counts = violations["kind"].map(VIOLATION_LABELS).value_counts()
+        st.error("Nájdené problémy: " + ", ".join(f"{label} ({count})" for label, count in counts.items()))
+        st.dataframe(
+            violations.assign(kind=violations["kind"].map(VIOLATION_LABELS)).rename(columns={
+                "kind": "Problém", "segment_id": "Segment", "speaker": "Rečník", "room": "Miestnosť",
+                "start": "Začiatok", "end": "Koniec", "detail": "Detail"
+            }),
+            use_container_width=True
+        )
+
+    col_apply, col_export = st.columns(2)
+    with col_apply:
+        if st.button("Použiť Upravený Plán"):
+            st.session_state.last_schedule = ScheduleResult.from_records(
+                edited_bookings[edited_bookings["start"].notna() & edited_bookings["end"].notna()].to_dict("records"),
+                violations.loc[violations["kind"] == DROPPED_SEGMENT, "segment_id"].tolist(),
+                "Edited Schedule"
+            )
+            # The applied plan was validated against the current inputs, a later repair starts from them
+            st.session_state.last_schedule_inputs = {
+                "speaker_availability": {speaker: list(slots) for speaker, slots in speaker_availability_inputs.items()},
+                "recording_slots": list(recording_days_times)
+            }
+            st.session_state.schedule_editor_base = None
+            st.session_state.schedule_editor_version += 1
+            st.rerun()
+    with col_export:
+        st.download_button(
+            "📥 Exportovať Plán (CSV)",
+            data=edited.to_csv(index=False, date_format="%Y-%m-%d %H:%M"),
+            file_name="plan_nahravania.csv",
+            mime="text/csv"
+        )
+
+def parse_nominal_duration_variant(variant_str: str, base_durations: dict[int, int]) -> dict[int, int] | None:
+    """Parses a variant line like '2=120, 3=150' into nominal durations overriding the base values."""
+    durations = dict(base_durations)
+    for part in variant_str.split(','):
+        match = re.fullmatch(r"\s*(\d)\s*=\s*(\d+)\s*", part)
+        if not match or not 1 <= int(match.group(1)) <= 5:
+            return None
+        durations[int(match.group(1))] = int(match.group(2))
+    return durations
+
+def display_scenario_sweep(parsed_data, speaker_availability_inputs, recording_days_times):
+    """
+    Runs what-if scenarios over nominal durations, recording day subsets and fully available
+    speakers as a background job, re-enriching the parser rows of the script for every scenario.
+    """
+    with st.expander("Scenáre „Čo ak“"):
+        st.markdown("Porovnajte plány pre rôzne nominálne trvania segmentov, vynechané dni nahrávania a plne dostupných rečníkov.")
+        variants_text = st.text_area(
+            "Varianty nominálneho trvania (jeden na riadok, napr. 2=120, 3=150)",
+            key="scenario_nominal_variants"
+        )
+        drop_each_day = st.checkbox("Vyskúšať vynechanie každého dňa nahrávania", key="scenario_drop_each_day")
+        fully_available_speakers = st.multiselect(
+            "Vyskúšať plnú dostupnosť rečníka",
+            sorted(speaker_availability_inputs),
+            key="scenario_fully_available_speakers",
+            help="Každý vybraný rečník tvorí scenár, v ktorom je dostupný počas všetkých časov nahrávania."
+        )
+
+        if st.button("Spustiť Scenáre"):
+            from analyzer.scheduler.scenarios import build_scenario_grid
+
+            nominal_duration_variants = [("Aktuálne trvanie", dict(st.session_state.nominal_durations))]
+            for line in variants_text.splitlines():
+                if not line.strip():
+                    continue
+                durations = parse_nominal_duration_variant(line, st.session_state.nominal_durations)
+                if durations is None:
+                    st.error(f"Neplatný variant trvania: {line}")
+                    return
+                nominal_duration_variants.append((line.strip(), durations))
+
+            recording_slot_variants = [("Všetky dni", list(recording_days_times))]
+            if drop_each_day:
+                recording_dates = sorted({slot.split(' ')[0] for slot in recording_days_times})
+                for date in recording_dates:
+                    recording_slot_variants.append(
+                        (f"Bez {date}", [slot for slot in recording_days_times if not slot.startswith(date)])
+                    )
+
+            availability_override_variants = None
+            if fully_available_speakers:
+                availability_override_variants = [("Aktuálna dostupnosť", {})] + [
+                    (f"{speaker} plne dostupný", {speaker: list(recording_days_times)}) for speaker in fully_available_speakers
+                ]
+
+            scenarios = build_scenario_grid(nominal_duration_variants, recording_slot_variants, availability_override_variants)
+            try:
+                job = _get_job_queue().submit("scenarios", run_scenario_sweep_job, parsed_data, dict(speaker_availability_inputs), scenarios)
+                st.session_state.scenario_job = {"job_id": job.id}
+            except QueueFullError:
+                st.error("Server je momentálne preťažený. Skúste scenáre o chvíľu znova.")
+
+        scenario_job = st.session_state.scenario_job
+        if scenario_job is not None:
+            job = _get_job_queue().get(scenario_job["job_id"])
+            if job is not None and not job.finished:
+                display_job_progress(job.id)
+            else:
+                st.session_state.scenario_job = None
+                if job is not None and job.status == "done":
+                    st.session_state.scenario_results = job.result
+                elif job is not None and job.status == "failed":
+                    st.error(f"Vyhodnotenie scenárov zlyhalo: {job.error}")
+                elif job is not None and job.status == "cancelled":
+                    st.warning("Vyhodnotenie scenárov bolo zrušené.")
+
+        if st.session_state.scenario_results is not None:
+            st.dataframe(st.session_state.scenario_results, use_container_width=True)
+
+def display_admin_panel():
+    """Sidebar panel with the shared artifact cache, the job queue, stage metrics and profiling capture."""
+    with st.expander("Administrácia"):
+        cache_stats = _get_artifact_cache().stats()
+        st.markdown("**Zdieľaná cache artefaktov**")
+        st.caption(
+            f"Položky: {cache_stats['entries']} | "
+            f"Pamäť: {cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB | "
+            f"Úspešnosť: {cache_stats['hit_rate']:.0%} ({cache_stats['hits']} zásahov, {cache_stats['misses']} minutí) | "
+            f"Vyradené: {cache_stats['evictions']}"
+        )
+        if st.button("Vyprázdniť cache"):
+            _get_artifact_cache().clear()
+        queue_stats = _get_job_queue().stats()
+        st.markdown("**Fronta úloh**")
+        st.caption(
+            f"Čakajúce: {queue_stats['queued']} | Čakajúce na konverziu: {queue_stats['waiting_for_conversion']} | "
+            f"Bežiace: {queue_stats['running']} | Dokončené: {queue_stats['finished']}"
+        )
+        st.download_button("Stiahnuť metriky (Prometheus)", REGISTRY.render_prometheus(), file_name="metrics.prom", mime="text/plain")
+
+        st.markdown("**Profilovanie**")
+        if st.session_state.profile_next_upload:
+            st.caption("Ďalšie spracovanie scenára pobeží pod profilerom (cProfile, tracemalloc).")
+            if st.button("Zrušiť profilovanie"):
+                st.session_state.profile_next_upload = False
+                st.rerun()
+        elif st.button("Profilovať ďalšie spracovanie", help="Aktuálny alebo ďalší nahraný scenár sa spracuje znova pod profilerom."):
+            st.session_state.profile_next_upload = True
+            st.rerun()
+        profile_bundle = st.session_state.profile_bundle
+        if profile_bundle is not None:
+            st.download_button(
+                "Stiahnuť profilovací balík",
+                profile_bundle["data"],
+                file_name=profile_bundle["file_name"],
+                mime="application/zip"
+            )
+
 def display_main_app_ui():
     """Displays the main application UI and handles file processing."""
     st.title("🎬 Analyzátor Dabingových Scenárov") # Slovak Title
@@ -374,24 +1078,39 @@ def display_main_app_ui():
 5.  Umožní vám stiahnuť maticu Rečník-Segment ako súbor Excel.
 """) # Slovak Instructions
 
+    if METRICS_HTTP_PORT:
+        start_metrics_server(METRICS_HTTP_PORT)
+    if METRICS_FILE_PATH:
+        start_metrics_file_writer(Path(METRICS_FILE_PATH), METRICS_FILE_INTERVAL_SECONDS)
+    if API_HTTP_PORT:
+        from api.server import start_api_server
+        start_api_server(API_HTTP_PORT, _get_job_queue(), _get_artifact_cache(), token=API_TOKEN)
+
     uploaded_file = st.file_uploader("Vyberte súbor DOCX", type="docx") # Slovak Label
 
     if uploaded_file is not None:
         df_processed = process_uploaded_file(uploaded_file)
 
         if df_processed is not None:
-            display_parsed_data_table(df_processed)
-            display_speaker_segment_matrix(df_processed, uploaded_file.name)
+            display_upload_timings(st.session_state.upload_result.get("stage_timings"))
+            display_parsed_data_table(df_processed, st.session_state.upload_result["table_index"])
+            display_dialogue_search(get_unique_speakers(df_processed))
+            display_speaker_segment_matrix(st.session_state.upload_result["speaker_matrix"])
             display_segment_time_analysis(df_processed)
             display_total_speaker_time(df_processed)
             configure_nominal_durations()
             
             unique_speakers = get_unique_speakers(df_processed)
             speaker_availability_inputs = manage_speaker_availability(unique_speakers)
+            manage_availability_bulk_import(unique_speakers)
             recording_days_times = manage_global_recording_times()
             
             display_calendar_view(unique_speakers, speaker_availability_inputs, recording_days_times)
             manage_availability_json_import_export()
-            display_optimal_schedule(df_processed, unique_speakers, speaker_availability_inputs, recording_days_times)
+            scheduling_availability = build_scheduling_availability(unique_speakers, speaker_availability_inputs, recording_days_times)
+            display_optimal_schedule(df_processed, unique_speakers, scheduling_availability, recording_days_times)
+            display_schedule_editor(df_processed, scheduling_availability, recording_days_times)
+            display_scenario_sweep(st.session_state.upload_result["parsed_data"], scheduling_availability, recording_days_times)
+            display_workbook_export(df_processed, uploaded_file.name)
     else:
         st.info("Prosím, nahrajte súbor DOCX pre začatie.")
@@ -11,3 +11,21 @@ _log = logging.getLogger(__name__)
 # --- Hardcoded Credentials (INSECURE - for demo only) ---
 VALID_USERNAME = "andrej"
 VALID_PASSWORD = "andrej123"
+
+# --- Background Job Queue ---
+MAX_JOB_WORKERS = 4 # Worker threads running conversion, parsing and scheduling jobs
+MAX_CONCURRENT_CONVERSIONS = 1 # Docling conversions are memory heavy, further uploads wait in line
+MAX_PENDING_JOBS = 20 # Unfinished jobs accepted before new submissions are rejected
+JOB_POLL_INTERVAL_SECONDS = 0.5
+
+# --- Shared Artifact Cache ---
+ARTIFACT_CACHE_MAX_BYTES = 512 * 2**20 # Memory ceiling of parsed script artifacts shared by all sessions
+
+# --- Metrics ---
+METRICS_HTTP_PORT = None # e.g. 9464 to serve Prometheus metrics on http://127.0.0.1:<port>/metrics
+METRICS_FILE_PATH = None # e.g. "/var/lib/node_exporter/textfile/analyzer.prom"
+METRICS_FILE_INTERVAL_SECONDS = 15 # How often the metrics file is rewritten
+
+# --- Local HTTP API ---
+API_HTTP_PORT = None # e.g. 8600 to serve the API from the app process, sharing its job queue and artifact cache
+API_TOKEN = None # Bearer token required by the API when set
@@ -1,25 +1,60 @@
 import logging
+from io import BytesIO
 from pathlib import Path
-from docling.chunking import HybridChunker
-from docling.document_converter import DocumentConverter
+from typing import Callable, Iterable, Iterator
+
+from docling_core.transforms.chunker.doc_chunk import DocChunk
+from docling_core.transforms.chunker.hierarchical_chunker import ChunkingDocSerializer, ChunkingSerializerProvider, HierarchicalChunker, TripletTableSerializer
+from docling_core.transforms.chunker.hybrid_chunker import HybridChunker
+from docling_core.transforms.serializer.common import create_ser_result
+from docling_core.types.doc import DoclingDocument, TableItem
+from docling_core.types.io import DocumentStream
+
+from parser.table_blocks import TableBlock, build_table_block
+from utils.metrics import stage_timer
 
 _log = logging.getLogger(__name__)
 
-def convert_and_chunk(source_path: Path) -> list[str] | None:
+CHUNKING_MODES = ("hybrid", "lines")
+# Both modes give the parser the same lines (tests/test_converter.py), "lines" without loading a tokenizer
+DEFAULT_CHUNKING_MODE = "lines"
+LINE_BLOCK_MAX_CHARS = 8000 # Soft size of a "lines" chunk; whole document items are never split
+TABLE_BLOCK_MAX_ROWS = 200 # Recognised tables are split into TableBlocks of at most this many rows
+# Line standing in for a recognised table in the chunker text; the private-use character cannot occur in a script
+TABLE_PLACEHOLDER_PREFIX = "\ue000table:"
+# Body elements (paragraphs and tables) of a DOCX converted at a time by iter_convert_and_chunk;
+# docling converts about 200 paragraphs a second, so the first chunks come out within seconds
+DOCX_PART_ELEMENTS = 400
+
+def convert_and_chunk(source_path: Path, mode: str = DEFAULT_CHUNKING_MODE) -> list[str | TableBlock] | None:
     """
-    Loads and converts a source document, then chunks it using HybridChunker.
+    Loads and converts a source document, then chunks it.
 
     Args:
         source_path: Path to the input source file (e.g., .docx, .pdf).
+        mode: "lines" (the default) groups the text of docling's per-item chunks into blocks of
+            whole lines without a tokenizer; "hybrid" sizes the chunks with docling's HybridChunker
+            and its default tokenizer. Both serialize the items the same way and write each section
+            heading once where its section starts, so the parser reads the same lines in either
+            mode; they differ only when HybridChunker has to split one item longer than its token
+            limit. Word tables with recognised timecode/speaker/text columns are returned as
+            TableBlock chunks, other tables as docling's triplet text.
 
     Returns:
-        A list of serialized text chunks, or None if an error occurs.
+        A list of serialized text chunks (and TableBlocks), or None if an error occurs.
     """
+    if mode not in CHUNKING_MODES:
+        raise ValueError(f"Unknown chunking mode '{mode}', expected one of {CHUNKING_MODES}.")
+
+    # Imported here: the converter pulls in docling's ML dependencies, chunk_lines needs docling-core only
+    from docling.document_converter import DocumentConverter
+
     # 1. Convert document
     _log.info(f"Loading and converting document from {source_path}...")
     try:
-        converter = DocumentConverter()
-        conv_result = converter.convert(source=source_path)
+        with stage_timer("conversion", input_size=source_path.stat().st_size):
+            converter = DocumentConverter()
+            conv_result = converter.convert(source=source_path)
         if not conv_result or not conv_result.document:
              _log.error(f"Failed to convert document from {source_path}")
              return None
@@ -32,17 +67,11 @@ def convert_and_chunk(source_path: Path) -> list[str] | None:
         return None
 
     # 2. Chunk document
-    _log.info("Initializing HybridChunker...")
-    try:
-        chunker = HybridChunker() # Using default tokenizer
-    except Exception as e:
-        _log.error(f"Error initializing HybridChunker: {e}")
-        return None
-
-    _log.info("Chunking document...")
+    _log.info(f"Chunking document ({mode} mode)...")
     try:
-        chunk_iter = chunker.chunk(dl_doc=doc)
-        serialized_chunks = [chunker.serialize(chunk=chunk) for chunk in chunk_iter]
+        with stage_timer("chunking") as counts:
+            serialized_chunks = chunk_lines(doc) if mode == "lines" else chunk_hybrid(doc)
+            counts["chunks"] = len(serialized_chunks)
     except Exception as e:
         _log.error(f"Error during chunking: {e}")
         return None
@@ -55,6 +84,201 @@ def convert_and_chunk(source_path: Path) -> list[str] | None:
 
     return serialized_chunks
 
+def iter_convert_and_chunk(
+    source_path: Path,
+    mode: str = DEFAULT_CHUNKING_MODE,
+    part_elements: int = DOCX_PART_ELEMENTS,
+    on_progress: Callable[[int, int], None] | None = None
+) -> Iterator[str | TableBlock]:
+    """
+    Streaming version of convert_and_chunk: a DOCX is converted and chunked in parts of
+    part_elements body elements, and the chunks of each part are yielded before the next part
+    is converted; other formats are converted as a whole. Headings and line blocks continue
+    across parts, so the chunks give the parser the same lines as convert_and_chunk, except
+    that Word's automatic heading numbering restarts in every part.
+
+    Args:
+        on_progress: Called with (parts converted, number of parts) after every converted part.
+
+    Raises:
+        ValueError: For an unknown chunking mode.
+        Exception: Whatever docling raises for a file it cannot convert.
+    """
+    if mode not in CHUNKING_MODES:
+        raise ValueError(f"Unknown chunking mode '{mode}', expected one of {CHUNKING_MODES}.")
+
+    from docling.document_converter import DocumentConverter
+
+    converter = DocumentConverter()
+    if source_path.suffix.lower() == ".docx":
+        num_parts, sources = _docx_parts(source_path, part_elements)
+    else:
+        num_parts, sources = 1, [source_path]
+
+    def converted_parts():
+        for part_idx, source in enumerate(sources):
+            input_size = source.stream.getbuffer().nbytes if isinstance(source, DocumentStream) else source_path.stat().st_size
+            with stage_timer("conversion", input_size=input_size):
+                doc = converter.convert(source=source).document
+            with stage_timer("chunking") as counts:
+                tables = _recognised_tables(doc)
+                chunker = _chunker(mode, tables)
+                doc_chunks = list(chunker.chunk(dl_doc=doc))
+                counts["chunks"] = len(doc_chunks)
+            _log.debug(f"Converted part {part_idx + 1} of {num_parts} of {source_path} into {len(doc_chunks)} docling chunks.")
+            if on_progress:
+                on_progress(part_idx + 1, num_parts)
+            yield doc_chunks, tables
+
+    yield from _parser_chunks(converted_parts(), LINE_BLOCK_MAX_CHARS if mode == "lines" else None)
+
+def _docx_parts(source_path: Path, part_elements: int) -> tuple[int, Iterator[DocumentStream]]:
+    """
+    Splits the DOCX into consecutive documents of at most part_elements body elements each,
+    built lazily. Every part keeps the styles, numbering definitions and section properties of
+    the whole document.
+
+    Returns:
+        The number of parts and an iterator over them.
+    """
+    import docx
+    from docx.oxml.ns import qn
+
+    document = docx.Document(str(source_path))
+    body = document.element.body
+    section_properties = body.find(qn("w:sectPr"))
+    elements = [element for element in body.iterchildren() if element is not section_properties]
+    for element in elements:
+        body.remove(element)
+    part_starts = range(0, max(len(elements), 1), part_elements)
+
+    def parts():
+        for part_idx, start in enumerate(part_starts):
+            part = elements[start:start + part_elements]
+            for element in part:
+                if section_properties is not None:
+                    section_properties.addprevious(element)
+                else:
+                    body.append(element)
+            stream = BytesIO()
+            document.save(stream)
+            stream.seek(0)
+            for element in part:
+                body.remove(element)
+            yield DocumentStream(name=f"{source_path.stem}-{part_idx + 1}.docx", stream=stream)
+
+    return len(part_starts), parts()
+
+class _TableBlockSerializer(TripletTableSerializer):
+    """Serializes recognised tables as one placeholder line and other tables as docling's triplet text."""
+
+    def __init__(self, table_refs: set[str]):
+        super().__init__()
+        self.table_refs = table_refs
+
+    def serialize(self, *, item, doc_serializer, doc, **kwargs):
+        if item.self_ref in self.table_refs:
+            return create_ser_result(text=f"{TABLE_PLACEHOLDER_PREFIX}{item.self_ref}", span_source=item)
+        return super().serialize(item=item, doc_serializer=doc_serializer, doc=doc, **kwargs)
+
+class _TableBlockSerializerProvider(ChunkingSerializerProvider):
+    def __init__(self, table_refs: set[str]):
+        self.table_refs = table_refs
+
+    def get_serializer(self, doc: DoclingDocument) -> ChunkingDocSerializer:
+        return ChunkingDocSerializer(doc=doc, table_serializer=_TableBlockSerializer(self.table_refs))
+
+def _table_rows(table: TableItem) -> list[list[str]]:
+    """Cell texts of every table row; a cell spanning several columns is kept in its first column only."""
+    return [
+        [cell.text.strip() if cell.start_col_offset_idx == col_idx else "" for col_idx, cell in enumerate(row)]
+        for row in table.data.grid
+    ]
+
+def _recognised_tables(doc: DoclingDocument) -> dict[str, TableBlock]:
+    """TableBlocks of the document tables with a recognised column layout, by table reference."""
+    tables = {}
+    for item, _level in doc.iterate_items():
+        if isinstance(item, TableItem):
+            table_block = build_table_block(_table_rows(item))
+            if table_block is not None:
+                tables[item.self_ref] = table_block
+    return tables
+
+def _split_table_block(table_block: TableBlock) -> list[TableBlock]:
+    # Bounded chunks let the parser report partial results of long table scripts
+    return [
+        TableBlock(table_block.rows[start:start + TABLE_BLOCK_MAX_ROWS], table_block.lines[start:start + TABLE_BLOCK_MAX_ROWS])
+        for start in range(0, len(table_block.rows), TABLE_BLOCK_MAX_ROWS)
+    ]
+
+def _parser_chunks(parts: Iterable[tuple[Iterable[DocChunk], dict[str, TableBlock]]], max_chars: int | None = None) -> Iterator[str | TableBlock]:
+    """
+    Turns docling chunks into parser chunks. Headings are written only where the heading path
+    changes (contextualize() repeats them in every chunk, and the parser would read every copy
+    as a script line) and table placeholder lines are replaced by the table's TableBlocks.
+
+    Args:
+        parts: Chunks of a HierarchicalChunker or HybridChunker with the recognised tables of
+            the chunked document (as returned by _recognised_tables), for every converted part
+            of one source document in order.
+        max_chars: Group the lines of consecutive chunks into blocks of about this many characters,
+            ending only between lines; None keeps the chunker's chunk boundaries.
+    """
+    block_lines = []
+    block_chars = 0
+    written_headings = []
+    for doc_chunks, tables in parts:
+        for chunk in doc_chunks:
+            headings = chunk.meta.headings or []
+            common = 0
+            while common < min(len(headings), len(written_headings)) and headings[common] == written_headings[common]:
+                common += 1
+            written_headings = headings
+            if max_chars is None and block_lines:
+                yield "\n".join(block_lines)
+                block_lines = []
+                block_chars = 0
+            for line in headings[common:] + chunk.text.split("\n"):
+                if line.startswith(TABLE_PLACEHOLDER_PREFIX):
+                    if block_lines:
+                        yield "\n".join(block_lines)
+                        block_lines = []
+                        block_chars = 0
+                    yield from _split_table_block(tables[line[len(TABLE_PLACEHOLDER_PREFIX):]])
+                    continue
+                if max_chars is not None and block_lines and block_chars + len(line) > max_chars:
+                    yield "\n".join(block_lines)
+                    block_lines = []
+                    block_chars = 0
+                block_lines.append(line)
+                block_chars += len(line) + 1
+    if block_lines:
+        yield "\n".join(block_lines)
+
+def _chunker(mode: str, tables: dict[str, TableBlock], tokenizer=None) -> HierarchicalChunker | HybridChunker:
+    serializer_provider = _TableBlockSerializerProvider(set(tables))
+    if mode == "lines":
+        return HierarchicalChunker(serializer_provider=serializer_provider)
+    return HybridChunker(serializer_provider=serializer_provider, **({"tokenizer": tokenizer} if tokenizer is not None else {}))
+
+def chunk_hybrid(doc: DoclingDocument, tokenizer=None) -> list[str | TableBlock]:
+    """
+    Chunks the document with docling's HybridChunker, using its default tokenizer unless one is
+    given. Recognised tables are kept out of the chunk text and returned as TableBlock chunks.
+    """
+    tables = _recognised_tables(doc)
+    return list(_parser_chunks([(_chunker("hybrid", tables, tokenizer).chunk(dl_doc=doc), tables)]))
+
+def chunk_lines(doc: DoclingDocument, max_chars: int = LINE_BLOCK_MAX_CHARS) -> list[str | TableBlock]:
+    """
+    Serializes the document items like chunk_hybrid, without a tokenizer, and groups their lines
+    into newline-joined blocks of about max_chars characters; recognised tables become separate
+    TableBlock chunks. Blocks end only between lines, so no line is ever split across chunks.
+    """
+    tables = _recognised_tables(doc)
+    return list(_parser_chunks([(_chunker("lines", tables).chunk(dl_doc=doc), tables)], max_chars))
+
 if __name__ == '__main__':
     # Example usage for testing the module directly
     logging.basicConfig(level=logging.INFO)
@@ -1,5 +1,6 @@
 import logging
 import re
+from collections import Counter
 from .constants import (
     COLUMN_HEADERS,
     P_SEGMENT_MARKER_FIND,
@@ -21,24 +22,91 @@ from .constants import (
     P_SPEAKER_SIMPLE_FALLBACK
 )
 from .speaker_processing import clean_speaker_name, extract_speaker_list
+from .table_blocks import TableBlock, is_structured_row
+from utils.metrics import timed_stage
 
 _log = logging.getLogger(__name__)
 
-def parse_chunks_to_structured_data(chunks: list[str]) -> list[dict[str, str]]:
+def parse_table_row(row: dict[str, str], segment: int) -> list[dict[str, str]]:
+    """
+    Maps one row of a recognised table to output rows (one per speaker). The table already
+    separates the fields, so the regexes only run on the free text inside the cells: timecodes
+    of the timecode cell, names and markers of the speaker cell and scene markers of the text.
+    """
+    row_data = {header: "" for header in COLUMN_HEADERS}
+    row_data["Segment"] = str(segment)
+    row_data["Timecode"] = " ".join(match.group(1) for match in P_TIMECODE_FIND.finditer(row.get("Timecode", "")))
+
+    scene_markers = [" ".join(row["Scene Marker"].split())] if row.get("Scene Marker", "").strip() else []
+    speakers = []
+    speaker_cell = row.get("Speaker", "")
+    if "(" in speaker_cell:
+        scene_markers.extend(match.group(1) for match in P_PARENS_MARKER_FIND.finditer(speaker_cell))
+        speaker_cell = P_PARENS_MARKER_FIND.sub("", speaker_cell)
+    for speaker_raw in P_COMMA_SEPARATOR.split(speaker_cell.strip()):
+        if not speaker_raw:
+            continue
+        if P_SCENE_KEYWORD_FIND.match(speaker_raw):
+            scene_markers.append(speaker_raw)
+            continue
+        # The column says this is a speaker, so names the line rules reject are kept as written
+        speakers.append(clean_speaker_name(speaker_raw) or speaker_raw.rstrip(":").strip())
+
+    text = " ".join(row.get("Text", "").split())
+    if "(" in text:
+        scene_markers.extend(match.group(1) for match in P_PARENS_MARKER_FIND.finditer(text))
+        text = " ".join(P_PARENS_MARKER_FIND.sub("", text).split())
+    keyword_match = P_SCENE_KEYWORD_FIND.search(text)
+    if keyword_match:
+        scene_markers.append(text[keyword_match.start():])
+        if keyword_match.start() == 0:
+            text = ""
+    row_data["Text"] = text
+    row_data["Scene Marker"] = " ".join(scene_markers)
+
+    if not speakers:
+        return [row_data] if row_data["Timecode"] or row_data["Text"] or row_data["Scene Marker"] else []
+    return [{**row_data, "Speaker": speaker} for speaker in speakers]
+
+def _chunk_lines(chunk: str | TableBlock) -> list[str | dict[str, str]]:
+    """Lines of a text chunk; for a TableBlock its structured rows, and the rows that must be parsed as lines as text."""
+    if isinstance(chunk, TableBlock):
+        return [row if is_structured_row(row, line) else line for row, line in zip(chunk.rows, chunk.lines)]
+    return chunk.splitlines()
+
+@timed_stage("parse", input_size=lambda chunks, *args, **kwargs: len(chunks), output_counts=lambda rows: {"rows": len(rows)})
+def parse_chunks_to_structured_data(chunks: list[str | TableBlock], detection_counts: Counter | None = None) -> list[dict[str, str]]:
     """
     Parses lines using hybrid speaker detection (list prioritized, pattern fallback).
-    Includes fallback for multi-speaker lines not in list.
+    Includes fallback for multi-speaker lines not in list. Rows of recognised tables
+    (TableBlock chunks) are mapped to fields directly.
 
     Args:
-        chunks: A list of text chunks.
+        chunks: A list of text chunks and TableBlocks.
+        detection_counts: Optional counter incremented with the speaker detection method of every line.
 
     Returns:
         A list of dictionaries representing rows.
     """
-    parsed_rows = []
+    return [row for chunk_rows in iter_parse_chunks(chunks, detection_counts) for row in chunk_rows]
+
+def iter_parse_chunks(chunks: list[str | TableBlock], detection_counts: Counter | None = None, speaker_list: list[str] | None = None):
+    """
+    Generator version of parse_chunks_to_structured_data yielding the rows of each chunk as soon
+    as it is parsed, so that callers can show partial results of long scripts.
+
+    Args:
+        chunks: A list of text chunks and TableBlocks.
+        detection_counts: Optional counter incremented with the speaker detection method of every line.
+        speaker_list: The result of extract_speaker_list(chunks), if the caller already has it.
+
+    Yields:
+        The list of rows parsed from each chunk, one list per chunk.
+    """
     segment_marker_count = 0
     current_segment = 0
-    speaker_list = extract_speaker_list(chunks)
+    if speaker_list is None:
+        speaker_list = extract_speaker_list(chunks)
     use_speaker_list = bool(speaker_list)
 
     P_MULTI_SPEAKER_PREFIX_LIST = None
@@ -56,8 +124,14 @@ def parse_chunks_to_structured_data(chunks: list[str]) -> list[dict[str, str]]:
 
     for chunk_idx, chunk in enumerate(chunks):
         _log.debug(f"--- Parsing Chunk {chunk_idx} ---")
-        lines = chunk.splitlines()
+        parsed_rows = []
+        lines = _chunk_lines(chunk)
         for line_idx, line in enumerate(lines):
+            if isinstance(line, dict):
+                parsed_rows.extend(parse_table_row(line, current_segment))
+                if detection_counts is not None:
+                    detection_counts["Table"] += 1
+                continue
             original_line = line.strip()
             if not original_line: continue
 
@@ -205,6 +279,9 @@ def parse_chunks_to_structured_data(chunks: list[str]) -> list[dict[str, str]]:
             row_data["Text"] = final_text.strip()
             _log.debug(f"Line {line_idx}: Assigned Final Text: {repr(row_data['Text'])}")
 
+            if detection_counts is not None:
+                detection_counts[speaker_detection_method] += 1
+
             # --- Handle Row Output ---
             if len(speakers_found_on_line) > 1:
                  for sp in speakers_found_on_line:
@@ -216,4 +293,4 @@ def parse_chunks_to_structured_data(chunks: list[str]) -> list[dict[str, str]]:
             else: # No speaker found
                  if not (is_segment_marker_line and not row_data["Speaker"] and not row_data["Timecode"] and not row_data["Text"] and not row_data["Scene Marker"]): parsed_rows.append(row_data)
 
-    return parsed_rows
+        yield parsed_rows
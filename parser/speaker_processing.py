@@ -1,4 +1,5 @@
 import logging
+from .table_blocks import TableBlock
 from .constants import (
     COLUMN_HEADERS,
     P_SCRIPT_START_MARKER,
@@ -14,6 +15,8 @@ from .constants import (
 
 _log = logging.getLogger(__name__)
 
+SPEAKER_LIST_MAX_LINES = 500 # Text lines extract_speaker_list reads at most, so a prefix of that many lines decides the list
+
 def clean_speaker_name(name: str) -> str:
     """Validates and cleans speaker names according to rules:
     - Removes trailing colons
@@ -50,17 +53,25 @@ def clean_speaker_name(name: str) -> str:
     return name if len(name) >= 3 else ""
 
 
-def extract_speaker_list(chunks: list[str]) -> list[str]:
+def extract_speaker_list(chunks: list[str | TableBlock]) -> list[str]:
     """
     Extracts speaker list from 'Postavy:' section. Ignores empty lines within list.
     Stops only when a script start marker is found or max lines reached.
+    A recognised table (TableBlock) also ends the section, as the script starts there.
     """
     speakers = []
     in_postavy_section = False
     lines_checked = 0
-    max_lines_to_check = 500
+    max_lines_to_check = SPEAKER_LIST_MAX_LINES
 
     for chunk in chunks:
+        if isinstance(chunk, TableBlock):
+            if in_postavy_section:
+                _log.info(f"End of 'Postavy:' section detected (script table). Found {len(speakers)} speakers.")
+                unique_speakers = sorted(list(set(s.strip() for s in speakers if s.strip())), key=len, reverse=True)
+                _log.info(f"Final extracted speaker list (sorted): {unique_speakers}")
+                return unique_speakers
+            continue
         lines = chunk.splitlines()
         for line in lines:
             lines_checked += 1
@@ -0,0 +1,102 @@
+import logging
+import re
+import unicodedata
+from typing import NamedTuple
+
+from .constants import P_SEGMENT_MARKER_FIND, P_TIMECODE_FIND, SPEAKER_PATTERN_FALLBACK
+
+_log = logging.getLogger(__name__)
+
+# Normalized header cell texts recognised per COLUMN_HEADERS field
+TABLE_HEADER_ALIASES = {
+    "Timecode": {"tc", "timecode", "time code", "cas", "casovy kod", "casovy kod (tc)", "time", "in"},
+    "Speaker": {"postava", "postavy", "rola", "role", "speaker", "character", "hovoriaci", "meno"},
+    "Text": {"text", "dialog", "dialogue", "replika", "preklad", "translation"},
+    "Scene Marker": {"poznamka", "poznamky", "scena", "scene", "note", "notes"},
+}
+
+# Share of non-empty cells that must match for a column of a headerless table to be recognised
+MIN_COLUMN_MATCH_RATIO = 0.8
+MIN_HEADERLESS_ROWS = 3
+
+P_SPEAKER_CELL = re.compile(rf"{SPEAKER_PATTERN_FALLBACK}(?:\s*,\s*{SPEAKER_PATTERN_FALLBACK})*")
+
+class TableBlock(NamedTuple):
+    """
+    A Word table whose columns were recognised. rows holds the cell texts of each data row keyed by
+    COLUMN_HEADERS fields; lines holds the same rows as tab-joined text for rows that are parsed as lines.
+    """
+    rows: list[dict[str, str]]
+    lines: list[str]
+
+def _normalize_header(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).casefold().rstrip(":").split())
+
+def _match_ratio(cells: list[str], pattern: re.Pattern) -> float:
+    non_empty = [cell for cell in cells if cell]
+    if not non_empty:
+        return 0.0
+    return sum(bool(pattern.fullmatch(cell)) for cell in non_empty) / len(non_empty)
+
+def detect_table_columns(rows: list[list[str]]) -> tuple[dict[int, str], bool] | None:
+    """
+    Recognises the column layout of a table from its header row, or from the cell contents of a
+    headerless table (a timecode column, a speaker name column and the longest text column).
+
+    Args:
+        rows: Cell texts of the table rows.
+
+    Returns:
+        (column index -> COLUMN_HEADERS field, whether the first row is a header), or None when
+        the table has no recognisable speaker and text columns.
+    """
+    if not rows:
+        return None
+    header_columns = {}
+    for col_idx, cell in enumerate(rows[0]):
+        normalized = _normalize_header(cell)
+        for field, aliases in TABLE_HEADER_ALIASES.items():
+            if normalized in aliases and field not in header_columns.values():
+                header_columns[col_idx] = field
+                break
+    if {"Speaker", "Text"} <= set(header_columns.values()):
+        return header_columns, True
+
+    if len(rows) < MIN_HEADERLESS_ROWS:
+        return None
+    num_columns = max(len(row) for row in rows)
+    columns = [[row[col_idx] if col_idx < len(row) else "" for row in rows] for col_idx in range(num_columns)]
+    content_columns = {}
+    for col_idx, cells in enumerate(columns):
+        if _match_ratio(cells, P_TIMECODE_FIND) >= MIN_COLUMN_MATCH_RATIO and "Timecode" not in content_columns.values():
+            content_columns[col_idx] = "Timecode"
+        elif _match_ratio(cells, P_SPEAKER_CELL) >= MIN_COLUMN_MATCH_RATIO and "Speaker" not in content_columns.values():
+            content_columns[col_idx] = "Speaker"
+    remaining = [col_idx for col_idx in range(num_columns) if col_idx not in content_columns]
+    if "Speaker" not in content_columns.values() or not remaining:
+        return None
+    text_column = max(remaining, key=lambda col_idx: sum(len(cell) for cell in columns[col_idx]))
+    content_columns[text_column] = "Text"
+    return content_columns, False
+
+def build_table_block(rows: list[list[str]]) -> TableBlock | None:
+    """Maps the rows of a table with a recognised layout to a TableBlock, or returns None."""
+    detected = detect_table_columns(rows)
+    if detected is None:
+        return None
+    columns, has_header = detected
+    data_rows = rows[1:] if has_header else rows
+    block_rows = []
+    block_lines = []
+    for row in data_rows:
+        if not any(row):
+            continue
+        block_rows.append({field: row[col_idx] if col_idx < len(row) else "" for col_idx, field in columns.items()})
+        block_lines.append("\t".join(cell for cell in row if cell))
+    _log.info(f"Recognised table layout {sorted(columns.items())} with {len(block_rows)} rows.")
+    return TableBlock(block_rows, block_lines)
+
+def is_structured_row(row: dict[str, str], line: str) -> bool:
+    """Whether a table row can be mapped directly; segment marker rows and rows with only unmapped cells are parsed as lines."""
+    return any(row.values()) and not P_SEGMENT_MARKER_FIND.search(line)
@@ -0,0 +1,275 @@
+import logging
+import tempfile
+import time
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from parser.core_parsing import iter_parse_chunks
+from parser.speaker_processing import SPEAKER_LIST_MAX_LINES, extract_speaker_list
+from parser.table_blocks import TableBlock
+from analyzer.data_processing import add_segment_durations, build_speaker_segment_matrix, convert_parsed_rows, process_parsed_data
+from analyzer.table_index import ScriptTableIndex
+from analyzer.text_index import TextIndex
+from utils.job_queue import Job, JobCancelled, get_job_queue
+from utils.metrics import collect_stage_timings, excluded_from_stage, stage_timer
+from utils.profiling import ProfileCapture
+
+_log = logging.getLogger(__name__)
+
+PREVIEW_INTERVAL_SECONDS = 1.0 # Minimum time between two published previews of a running upload
+
+class PipelineError(Exception):
+    """Raised when a pipeline stage produces no usable output; the message is shown to the user."""
+
+def run_script_pipeline(job: Job, file_bytes: bytes, nominal_durations: dict[int, int], episode: str = "", profile: bool = False) -> dict:
+    """
+    Background job converting, parsing and enriching one uploaded script.
+    Cancellation is checked between stages, converted parts and chunks (docling cannot interrupt the conversion of one part).
+    The document is converted in parts that are parsed as soon as they are chunked, and the
+    speaker list and previews of the rows parsed so far are published as the job's partial result.
+
+    Args:
+        job: The job this function runs as, used for progress reports.
+        file_bytes: Contents of the uploaded DOCX file, written to a temporary file for the conversion.
+        nominal_durations: Nominal durations used for the enrichment stage.
+        episode: Episode name stored with the full-text index hits.
+        profile: Run the stages under cProfile and tracemalloc and add a diagnostics zip ("profile_bundle").
+
+    Returns:
+        A dictionary with the cleaned parsed rows ("parsed_data"), the processed DataFrame
+        ("df_processed"), the nominal durations it was computed with, the row index of the
+        table ("table_index"), the dialogue full-text index ("text_index"), the speaker-segment
+        matrix ("speaker_matrix"), the per-stage timings ("stage_timings"), the parser's speaker
+        detection method counts ("detection_counts") and the chunk count.
+        The result is shared read-only between sessions through the artifact cache.
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_file:
+        tmp_file.write(file_bytes)
+        file_path = Path(tmp_file.name)
+    capture = ProfileCapture() if profile else None
+    try:
+        with collect_stage_timings() as stage_timings:
+            if capture:
+                capture.start()
+            try:
+                result = _run_script_stages(job, file_path, nominal_durations, episode, capture)
+            finally:
+                if capture:
+                    capture.stop()
+        result["stage_timings"] = stage_timings
+        if capture:
+            job.report("Balím profilovacie dáta", 0.98)
+            result["profile_bundle"] = capture.build_bundle({
+                "stage_timings.json": stage_timings,
+                "parser_detection_methods.json": dict(result["detection_counts"]),
+                "summary.json": {"episode": episode, "input_bytes": len(file_bytes), "chunks": result["num_chunks"], "rows": len(result["parsed_data"])},
+            })
+        return result
+    finally:
+        if file_path.exists():
+            file_path.unlink()
+            _log.info(f"Dočasný súbor zmazaný: {file_path}")
+
+def _run_script_stages(job: Job, file_path: Path, nominal_durations: dict[int, int], episode: str, capture: ProfileCapture | None) -> dict:
+    # docling and its ML dependencies take seconds to import, so they are loaded by the first conversion
+    from converter import iter_convert_and_chunk
+
+    checkpoint = capture.snapshot if capture else lambda stage: None
+    conversion_progress = [0.1]
+
+    def report_conversion(parts_done: int, num_parts: int) -> None:
+        conversion_progress[0] = 0.1 + 0.75 * parts_done / num_parts
+        job.report(f"Konvertujem dokument: časť {parts_done} z {num_parts}", conversion_progress[0])
+
+    detection_counts = Counter()
+    parsed_data = []
+    preview = _ScriptPreview(nominal_durations)
+    with get_job_queue().conversion_slot(job):
+        job.report("Konvertujem a rozdeľujem dokument", 0.1)
+        chunks = _converted_chunks(iter_convert_and_chunk(file_path, on_progress=report_conversion))
+        head_chunks = _speaker_list_head(chunks)
+        if not head_chunks:
+            raise PipelineError("Dokument bol konvertovaný, ale neboli vygenerované žiadne textové časti (chunks).")
+
+        with stage_timer("parse") as counts:
+            speaker_list = extract_speaker_list(head_chunks)
+            job.publish({"speakers": speaker_list, "chunks_done": 0})
+            next_preview_at = 0.0
+            num_chunks = 0
+            for num_chunks, chunk_rows in enumerate(iter_parse_chunks(chain(head_chunks, chunks), detection_counts, speaker_list), start=1):
+                chunk_rows = [{k: (v if v is not None else '') for k, v in row_dict.items()} for row_dict in chunk_rows]
+                parsed_data.extend(chunk_rows)
+                job.report(f"Spracovávam časť {num_chunks}", conversion_progress[0])
+                # Preview work is not parsing and stays out of the parse stage; previews are spaced by at least
+                # four times their build time, so building them never takes more than a fifth of the run
+                with excluded_from_stage():
+                    preview.append(chunk_rows)
+                    if parsed_data and time.monotonic() >= next_preview_at:
+                        build_start = time.monotonic()
+                        job.publish(preview.build(speaker_list, num_chunks))
+                        next_preview_at = time.monotonic() + max(PREVIEW_INTERVAL_SECONDS, 4 * (time.monotonic() - build_start))
+            counts["chunks"] = num_chunks
+            counts["rows"] = len(parsed_data)
+    checkpoint("convert_and_parse")
+    if not parsed_data:
+        raise PipelineError("Spracovanie dokončené, ale neboli extrahované žiadne štruktúrované dáta.")
+
+    job.report(f"Analyzujem {len(parsed_data)} riadkov", 0.85)
+    df_processed = process_parsed_data(parsed_data, nominal_durations)
+    if df_processed.empty:
+        raise PipelineError("Analýza dát nepriniesla žiadne spracované riadky.")
+    checkpoint("enrich")
+
+    job.report("Indexujem tabuľku a text scenára", 0.9)
+    with stage_timer("index", input_size=len(df_processed)):
+        table_index = ScriptTableIndex(df_processed)
+        text_index = TextIndex(df_processed, episode)
+    checkpoint("index")
+    speaker_matrix = build_speaker_segment_matrix(df_processed)
+    checkpoint("matrix")
+
+    return {
+        "parsed_data": parsed_data,
+        "df_processed": df_processed,
+        "nominal_durations": dict(nominal_durations),
+        "table_index": table_index,
+        "text_index": text_index,
+        "speaker_matrix": speaker_matrix,
+        "detection_counts": detection_counts,
+        "num_chunks": num_chunks,
+    }
+
+def _converted_chunks(chunks: Iterator[str | TableBlock]) -> Iterator[str | TableBlock]:
+    """
+    Passes the converter's chunks on, leaving the conversion time out of the stage that consumes
+    them (conversion and chunking record their own stages) and reporting conversion errors as
+    PipelineError.
+    """
+    while True:
+        with excluded_from_stage():
+            try:
+                chunk = next(chunks, None)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                _log.error(f"Error during document conversion or chunking: {e}")
+                raise PipelineError("Nepodarilo sa konvertovať alebo rozdeliť dokument. Skontrolujte logy pre detaily.") from e
+        if chunk is None:
+            return
+        yield chunk
+
+def _speaker_list_head(chunks: Iterator[str | TableBlock]) -> list[str | TableBlock]:
+    """The first chunks, up to the one passing SPEAKER_LIST_MAX_LINES text lines; extract_speaker_list gives the same list for them as for the whole document."""
+    head_chunks = []
+    num_lines = 0
+    for chunk in chunks:
+        head_chunks.append(chunk)
+        if not isinstance(chunk, TableBlock):
+            num_lines += len(chunk.splitlines())
+        if num_lines > SPEAKER_LIST_MAX_LINES:
+            break
+    return head_chunks
+
+class _ScriptPreview:
+    """
+    Preview of the rows parsed so far. The row-wise enrichment is done once per chunk and the
+    converted rows are appended; only the segment durations, which a later chunk can still
+    change, and the speaker-segment matrix are computed again for each preview.
+    """
+
+    def __init__(self, nominal_durations: dict[int, int]):
+        self.nominal_durations = nominal_durations
+        self._frames = []
+        self._df = None # Concatenation of _frames, once built
+
+    def append(self, rows: Iterable[dict]) -> None:
+        rows = list(rows)
+        if rows:
+            self._frames.append(convert_parsed_rows(rows))
+
+    def build(self, speaker_list: list[str], chunks_done: int) -> dict:
+        """Partial result of the rows parsed so far; the last segment may still be incomplete."""
+        # concat returns a new frame, so the previews already published are never modified
+        self._df = pd.concat(([self._df] if self._df is not None else []) + self._frames, ignore_index=True)
+        self._frames = []
+        df_preview = add_segment_durations(self._df, self.nominal_durations)
+        return {
+            "speakers": speaker_list,
+            "df_processed": df_preview,
+            # The undecorated function keeps previews from being recorded as matrix stages
+            "speaker_matrix": build_speaker_segment_matrix.__wrapped__(df_preview),
+            "chunks_done": chunks_done,
+        }
+
+def apply_nominal_durations(artifacts: dict, nominal_durations: dict[int, int]) -> dict:
+    """
+    Artifacts of a processed script (as returned by run_script_pipeline) for other nominal
+    durations: the enrichment is repeated from the parsed rows, and the row index, the full-text
+    index and the speaker-segment matrix are rebuilt from the new frame. The given artifacts,
+    which may be shared through the artifact cache, are not modified.
+    """
+    if artifacts["nominal_durations"] == nominal_durations:
+        return artifacts
+    df_processed = process_parsed_data(artifacts["parsed_data"], nominal_durations)
+    with stage_timer("index", input_size=len(df_processed)):
+        table_index = ScriptTableIndex(df_processed)
+        text_index = TextIndex(df_processed, artifacts["text_index"].episode)
+    return {
+        **artifacts,
+        "df_processed": df_processed,
+        "nominal_durations": dict(nominal_durations),
+        "table_index": table_index,
+        "text_index": text_index,
+        "speaker_matrix": build_speaker_segment_matrix(df_processed),
+    }
+
+def run_schedule_job(job: Job, df_processed, speaker_availability: dict, recording_days_times: list[str], previous: dict | None = None):
+    """
+    Background job calculating a schedule, or repairing the previous one when previous is given.
+
+    Args:
+        job: The job this function runs as, used for progress reports.
+        df_processed: Processed script DataFrame.
+        speaker_availability: Speaker -> availability slots.
+        recording_days_times: Global recording slots.
+        previous: Optional {"schedule", "speaker_availability", "recording_slots"} of the schedule to repair.
+
+    Returns:
+        The ScheduleResult.
+    """
+    if previous is not None:
+        from analyzer.scheduler.repair import repair_schedule
+
+        job.report("Opravujem plán", 0.1)
+        return repair_schedule(
+            previous["schedule"],
+            df_processed,
+            previous["speaker_availability"],
+            speaker_availability,
+            previous["recording_slots"],
+            recording_days_times
+        )
+    from analyzer.scheduler.core import calculate_optimal_schedule
+
+    job.report("Vypočítavam optimálny plán", 0.1)
+    return calculate_optimal_schedule(df_processed, speaker_availability, recording_days_times)
+
+def run_scenario_sweep_job(job: Job, parsed_data: list[dict], speaker_availability: dict, scenarios: list[dict]):
+    """
+    Background job evaluating what-if scenarios (see analyzer.scheduler.scenarios); progress is
+    reported per finished scenario and cancellation stops the scenarios not started yet.
+
+    Returns:
+        The comparison DataFrame of run_scenario_sweep.
+    """
+    from analyzer.scheduler.scenarios import run_scenario_sweep
+
+    job.report(f"Vyhodnocujem {len(scenarios)} scenárov", 0.0)
+    return run_scenario_sweep(
+        parsed_data, speaker_availability, scenarios,
+        on_progress=lambda finished, total: job.report(f"Vyhodnotených {finished} z {total} scenárov", finished / total)
+    )
@@ -0,0 +1,111 @@
+import http.client
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from api.server import ApiServer
+from utils.artifact_cache import ArtifactCache
+from utils.job_queue import JobQueue
+
+@pytest.fixture
+def api_server():
+    server = ApiServer(("127.0.0.1", 0), JobQueue(max_workers=2), ArtifactCache(2**20))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _request(server: ApiServer, method: str, path: str, body: bytes | None = None, headers: dict | None = None) -> tuple[int, dict]:
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+
+def _finished_script_job(server: ApiServer, df_processed: pd.DataFrame):
+    result = {"df_processed": df_processed, "speaker_matrix": pd.DataFrame(), "num_chunks": 0}
+    job = server.job_queue.submit("script", lambda job: result)
+    deadline = time.monotonic() + 5
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == "done"
+    return job
+
+def test_unknown_endpoint_returns_404(api_server):
+    status, payload = _request(api_server, "GET", "/nothing")
+    assert status == 404
+    assert "error" in payload
+
+def test_schedule_body_must_be_a_json_object(api_server):
+    status, payload = _request(api_server, "POST", "/jobs/schedule", body=b"[1]", headers={"Content-Type": "application/json"})
+    assert status == 400
+    assert "JSON object" in payload["error"]
+
+def test_invalid_json_body_returns_400(api_server):
+    status, _ = _request(api_server, "POST", "/jobs/schedule", body=b"{not json")
+    assert status == 400
+
+def test_non_numeric_content_length_returns_400(api_server):
+    connection = http.client.HTTPConnection(*api_server.server_address, timeout=10)
+    try:
+        connection.putrequest("POST", "/jobs/parse")
+        connection.putheader("Content-Length", "abc")
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        assert "Content-Length" in json.loads(response.read())["error"]
+    finally:
+        connection.close()
+
+def test_arrow_conversion_error_is_reported_before_streaming(api_server):
+    pytest.importorskip("pyarrow")
+    job = _finished_script_job(api_server, pd.DataFrame({"mixed": [1, "x"]}))
+    status, payload = _request(api_server, "GET", f"/jobs/{job.id}/rows?format=arrow")
+    assert status == 406
+    assert "format=json" in payload["error"]
+
+def test_arrow_table_is_streamed(api_server):
+    pa = pytest.importorskip("pyarrow")
+    job = _finished_script_job(api_server, pd.DataFrame({"Segment": ["1", "2"], "SegmentDuration": [60.0, 90.0]}))
+    connection = http.client.HTTPConnection(*api_server.server_address, timeout=10)
+    try:
+        connection.request("GET", f"/jobs/{job.id}/rows?format=arrow")
+        response = connection.getresponse()
+        assert response.status == 200
+        table = pa.ipc.open_stream(response.read()).read_all()
+    finally:
+        connection.close()
+    assert table.column("SegmentDuration").to_pylist() == [60.0, 90.0]
+
+def test_unexpected_error_returns_500(api_server, monkeypatch):
+    def broken_stats():
+        raise RuntimeError("boom")
+    monkeypatch.setattr(api_server.job_queue, "stats", broken_stats)
+    status, payload = _request(api_server, "GET", "/health")
+    assert status == 500
+    assert payload["error"] == "Internal error: RuntimeError."
+
+@pytest.mark.parametrize("body", [
+    {"speaker_availability": {"A": "2026-01-05 09:00-12:00"}, "recording_slots": ["2026-01-05 09:00-17:00"]},
+    {"speaker_availability": {"A": [["2026-01-05", "09:00-12:00"]]}, "recording_slots": ["2026-01-05 09:00-17:00"]},
+    {"speaker_availability": {"A": ["2026-01-05 09:00-12:00"]}, "recording_slots": "2026-01-05 09:00-17:00"},
+    {"speaker_availability": {"A": ["2026-01-05 09:00-12:00"]}, "recording_slots": [1]},
+])
+def test_schedule_slots_must_be_lists_of_strings(api_server, body):
+    job = _finished_script_job(api_server, pd.DataFrame({"Segment": ["1"], "Speaker": ["A"], "SegmentDuration": [60.0]}))
+    status, payload = _request(api_server, "POST", "/jobs/schedule", body=json.dumps({"parse_job_id": job.id, **body}).encode())
+    assert status == 400
+    assert "list of slot strings" in payload["error"]
+
+def test_valid_schedule_request_is_accepted(api_server):
+    job = _finished_script_job(api_server, pd.DataFrame({"Segment": ["1"], "Speaker": ["A"], "SegmentDuration": [60.0]}))
+    body = {"parse_job_id": job.id, "speaker_availability": {"A": ["2026-01-05 09:00-12:00"]}, "recording_slots": ["2026-01-05 09:00-17:00"]}
+    status, payload = _request(api_server, "POST", "/jobs/schedule", body=json.dumps(body).encode())
+    assert status == 202
+    assert payload["kind"] == "schedule"
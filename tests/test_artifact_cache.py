@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from utils.artifact_cache import ArtifactCache, content_hash, estimate_size
+
+def test_least_recently_used_entries_are_evicted_at_the_byte_cap():
+    cache = ArtifactCache(max_bytes=100)
+    cache.put("a", "A", size=40)
+    cache.put("b", "B", size=40)
+    assert cache.get("a") == "A" # "b" is now the least recently used
+    cache.put("c", "C", size=40)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    assert cache.stats() == {
+        "entries": 2, "bytes": 80, "max_bytes": 100, "hits": 3, "misses": 1, "hit_rate": 0.75, "evictions": 1,
+    }
+
+    # Filling exactly to the cap keeps everything, one more byte evicts as many entries as needed
+    cache.put("d", "D", size=20)
+    assert cache.stats()["bytes"] == 100
+    cache.put("e", "E", size=61)
+    assert [key for key in "acde" if cache.get(key) is not None] == ["d", "e"]
+    assert cache.stats()["bytes"] == 81
+
+def test_replacing_an_entry_updates_its_size():
+    cache = ArtifactCache(max_bytes=100)
+    cache.put("a", "A1", size=60)
+    cache.put("b", "B", size=30)
+    cache.put("a", "A2", size=20)
+    assert cache.stats()["bytes"] == 50
+    assert (cache.get("a"), cache.get("b")) == ("A2", "B")
+    assert cache.stats()["evictions"] == 0
+
+def test_entry_larger_than_the_cap_is_not_cached():
+    cache = ArtifactCache(max_bytes=100)
+    cache.put("a", "A", size=50)
+    cache.put("huge", "H", size=101)
+    assert cache.get("huge") is None
+    assert cache.get("a") == "A"
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+def test_estimate_size_counts_frames_arrays_and_shared_objects_once():
+    df = pd.DataFrame({"Text": ["a" * 1000] * 10, "Segment": np.arange(10)})
+    assert estimate_size(df) == int(df.memory_usage(deep=True).sum())
+    array = np.zeros(1000, dtype=np.int64)
+    assert estimate_size(array) == 8000
+    artifacts = {"df_processed": df, "again": df, "array": array}
+    assert estimate_size(artifacts) < estimate_size(df) * 2
+    assert estimate_size(artifacts) > estimate_size(df) + 8000
+
+def test_content_hash_is_stable():
+    assert content_hash(b"scenar") == content_hash(b"scenar")
+    assert content_hash(b"scenar") != content_hash(b"scenar ")
+    assert len(content_hash(b"")) == 64
@@ -0,0 +1,145 @@
+import json
+from datetime import date, datetime
+
+import pandas as pd
+
+from analyzer.scheduler.availability import (
+    ALL_WEEKDAYS,
+    RecurrenceRule,
+    build_speaker_interval_sets,
+    expand_rule,
+    grid_to_slots,
+    import_availability_csv,
+    import_availability_ics,
+    parse_rule_text,
+    rule_from_dict,
+    rule_to_dict,
+    slots_to_grid,
+    ungridded_slots,
+)
+
+def test_grid_round_trip_keeps_slots_the_grid_cannot_show():
+    speaker_availability = {
+        "JANO": ["2026-01-06 13:00-17:00", "2026-01-05 9:00-12:00", (datetime(2026, 1, 7, 9), datetime(2026, 1, 7, 11))],
+        "MARA": ["2026-01-05 22:00-02:00", "od pondelka 2026-01-08 10:00-11:00"],
+        "FERO": [],
+    }
+    speakers = ["JANO", "MARA", "FERO"]
+
+    grid = slots_to_grid(speaker_availability, speakers, ["2026-01-09"])
+    assert list(grid.columns) == ["2026-01-05", "2026-01-06", "2026-01-09"]
+    assert grid.loc["JANO"].tolist() == ["09:00-12:00", "13:00-17:00", ""]
+    assert grid.loc["MARA"].tolist() == ["22:00-02:00", "", ""]
+    hidden = ungridded_slots(speaker_availability, speakers)
+    assert hidden == {"JANO": [(datetime(2026, 1, 7, 9), datetime(2026, 1, 7, 11))], "MARA": ["od pondelka 2026-01-08 10:00-11:00"]}
+
+    # Editing one cell and committing the grid the way the availability editor does
+    grid.loc["FERO", "2026-01-09"] = "10:00-11:00, 14:00-15:30"
+    slots_by_speaker, errors = grid_to_slots(grid)
+    assert errors.empty
+    committed = {speaker: slots + hidden.get(speaker, []) for speaker, slots in slots_by_speaker.items()}
+    assert committed == {
+        "JANO": ["2026-01-05 09:00-12:00", "2026-01-06 13:00-17:00", (datetime(2026, 1, 7, 9), datetime(2026, 1, 7, 11))],
+        "MARA": ["2026-01-05 22:00-02:00", "od pondelka 2026-01-08 10:00-11:00"],
+        "FERO": ["2026-01-09 10:00-11:00", "2026-01-09 14:00-15:30"],
+    }
+    # The committed slots lay out as the same grid again
+    pd.testing.assert_frame_equal(slots_to_grid(committed, speakers, ["2026-01-09"]), grid)
+
+def test_grid_to_slots_reports_invalid_ranges():
+    grid = pd.DataFrame({"2026-01-05": ["09:00-12:00, 25:00-26:00", "9-12"]}, index=pd.Index(["JANO", "MARA"], name="speaker"))
+    slots_by_speaker, errors = grid_to_slots(grid)
+    assert slots_by_speaker["JANO"] == ["2026-01-05 09:00-12:00"]
+    assert errors.to_dict("records") == [
+        {"speaker": "JANO", "day": "2026-01-05", "value": "25:00-26:00"},
+        {"speaker": "MARA", "day": "2026-01-05", "value": "9-12"},
+    ]
+
+def test_parse_rule_text_until_end_of_month():
+    rule = parse_rule_text("JANO", "weekdays 09:00-17:00 until end of month", today=date(2026, 11, 10))
+    assert rule == RecurrenceRule("JANO", date(2026, 11, 10), 9 * 60, 17 * 60, (0, 1, 2, 3, 4), 1, date(2026, 11, 30), None)
+    intervals = expand_rule(rule, date(2026, 11, 1), date(2026, 12, 10))
+    assert len(intervals) == 15 # Tue 10th to Mon 30th, weekdays only
+    assert intervals[0] == (datetime(2026, 11, 10, 9), datetime(2026, 11, 10, 17))
+    assert intervals[-1] == (datetime(2026, 11, 30, 9), datetime(2026, 11, 30, 17))
+
+def test_parse_rule_text_slovak_overnight_rule():
+    rule = parse_rule_text("MARA", "po, streda 22:00-02:00 od 2026-11-02")
+    assert (rule.weekdays, rule.first_date, rule.until) == ((0, 2), date(2026, 11, 2), None)
+    # Monday's occurrence reaches into Tuesday, the only day of the horizon
+    assert expand_rule(rule, date(2026, 11, 3), date(2026, 11, 3)) == [(datetime(2026, 11, 2, 22), datetime(2026, 11, 3, 2))]
+    assert parse_rule_text("MARA", "kedykoľvek 09:00-10:00") is None
+    assert parse_rule_text("MARA", "mon 09:00-10:70") is None
+
+def test_count_is_counted_from_the_rules_first_date():
+    rule = RecurrenceRule("FERO", date(2026, 11, 2), 9 * 60, 11 * 60, (0, 2), interval_weeks=2, count=3)
+    assert [start.date() for start, _ in expand_rule(rule, date(2026, 11, 1), date(2026, 12, 31))] == [
+        date(2026, 11, 2), date(2026, 11, 4), date(2026, 11, 16)
+    ]
+    assert expand_rule(rule, date(2026, 11, 10), date(2026, 12, 31)) == [(datetime(2026, 11, 16, 9), datetime(2026, 11, 16, 11))]
+
+def test_import_availability_csv():
+    csv_text = (
+        "Rečník;Dátum;Od;Do;Slot;Pravidlo\n"
+        "JANO;2026-11-02;9:00;12:00;;\n"
+        "JANO;;;;2026-11-03 22:00-01:30;\n"
+        "MARA;;;;;pracovné dni 10:00-14:00 od 2026-11-02 do 2026-11-06\n"
+        "MARA;;;;2026-11-04 25:00-26:00;\n"
+        ";2026-11-02;9:00;12:00;;\n"
+    )
+    slots_by_speaker, rules = import_availability_csv(csv_text)
+    assert slots_by_speaker == {"JANO": ["2026-11-02 09:00-12:00", "2026-11-03 22:00-01:30"]}
+    assert rules == [RecurrenceRule("MARA", date(2026, 11, 2), 10 * 60, 14 * 60, (0, 1, 2, 3, 4), 1, date(2026, 11, 6), None)]
+    assert import_availability_csv("meno,slot\nJANO,2026-11-02 09:00-12:00\n") == ({}, [])
+
+def test_import_availability_ics():
+    ics_text = "\r\n".join([
+        "BEGIN:VCALENDAR",
+        "BEGIN:VEVENT",
+        "SUMMARY:JANO",
+        "DTSTART:20261102T090000Z",
+        "DTEND:20261102T120000Z",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "SUMMARY:MA",
+        " RA",
+        "DTSTART;TZID=Europe/Bratislava:20261103T130000",
+        "DURATION:PT1H30M",
+        "RRULE:FREQ=WEEKLY;BYDAY=TU,TH;INTERVAL=2;UNTIL=20261130T000000Z",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "DTSTART;VALUE=DATE:20261105",
+        "DTEND;VALUE=DATE:20261106",
+        "END:VEVENT",
+        "BEGIN:VEVENT",
+        "SUMMARY:FERO",
+        "DTSTART:20261102T090000",
+        "DTEND:20261102T100000",
+        "RRULE:FREQ=MONTHLY",
+        "END:VEVENT",
+        "END:VCALENDAR",
+    ])
+    slots_by_speaker, rules = import_availability_ics(ics_text, default_speaker="ZUZANA")
+    assert slots_by_speaker == {"JANO": ["2026-11-02 09:00-12:00"], "ZUZANA": ["2026-11-05 00:00-23:59"]}
+    assert rules == [RecurrenceRule("MARA", date(2026, 11, 3), 13 * 60, 14 * 60 + 30, (1, 3), 2, date(2026, 11, 30), None)]
+    assert [start.date() for start, _ in expand_rule(rules[0], date(2026, 11, 1), date(2026, 12, 31))] == [
+        date(2026, 11, 3), date(2026, 11, 5), date(2026, 11, 17), date(2026, 11, 19)
+    ]
+
+def test_interval_sets_merge_slots_and_rules():
+    rule = RecurrenceRule("JANO", date(2026, 11, 2), 12 * 60, 15 * 60, ALL_WEEKDAYS, count=2)
+    interval_sets = build_speaker_interval_sets(
+        {"JANO": ["2026-11-02 09:00-12:00", "2026-11-03 14:00-16:00", "2026-11-02 10:00-11:00"], "MARA": []},
+        [rule, RecurrenceRule("FERO", date(2026, 11, 2), 9 * 60, 10 * 60)],
+        date(2026, 11, 2), date(2026, 11, 2)
+    )
+    assert interval_sets == {
+        # Touching and nested intervals are merged; the rule is expanded for the horizon day only
+        "JANO": [(datetime(2026, 11, 2, 9), datetime(2026, 11, 2, 15)), (datetime(2026, 11, 3, 14), datetime(2026, 11, 3, 16))],
+        "MARA": [],
+        "FERO": [(datetime(2026, 11, 2, 9), datetime(2026, 11, 2, 10))],
+    }
+
+def test_rule_dict_round_trip():
+    rule = RecurrenceRule("JANO", date(2026, 11, 2), 22 * 60, 2 * 60, (0, 4), 2, date(2026, 12, 31), 5)
+    assert rule_from_dict(json.loads(json.dumps(rule_to_dict(rule)))) == rule
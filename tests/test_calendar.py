@@ -0,0 +1,99 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from analyzer.scheduler import calendar as calendar_module
+from analyzer.scheduler.calendar import AvailabilityIndex, CalendarWindowCache, build_calendar_window, generate_calendar_view
+from analyzer.scheduler.utils import parse_time_slot
+
+SPEAKERS = ["JANO", "MARA", "FERO"]
+
+def _calendar_by_slot_loop(unique_speakers, speaker_availability, recording_days_times, time_granularity_minutes, start_hour, end_hour, num_days_to_show, start_date):
+    """The calendar built the way it was before vectorizing: every slot checked against every bin."""
+    all_time_labels, all_time_intervals = [], []
+    for d_offset in range(num_days_to_show):
+        current_date = start_date + timedelta(days=d_offset)
+        current_time = datetime.combine(current_date, datetime.min.time().replace(hour=start_hour))
+        end_time_limit = datetime.combine(current_date, datetime.min.time().replace(hour=end_hour))
+        while current_time < end_time_limit:
+            slot_end = current_time + timedelta(minutes=time_granularity_minutes)
+            all_time_labels.append(f"{current_date.strftime('%Y-%m-%d')} {current_time.strftime('%H:%M')}-{slot_end.strftime('%H:%M')}")
+            all_time_intervals.append((current_time, slot_end))
+            current_time = slot_end
+
+    calendar_data = {speaker: [''] * len(all_time_labels) for speaker in unique_speakers}
+    calendar_data['Recording Slots'] = [''] * len(all_time_labels)
+    calendar_df = pd.DataFrame(calendar_data, index=all_time_labels)
+    columns = [(speaker, speaker_availability.get(speaker, []), "Dostupný") for speaker in unique_speakers]
+    columns.append(('Recording Slots', recording_days_times, "Nahrávanie"))
+    for column, slots, value in columns:
+        for slot_str in slots:
+            parsed_slot = parse_time_slot(slot_str)
+            if not parsed_slot:
+                continue
+            start_dt, end_dt = parsed_slot
+            for i, (interval_start_dt, interval_end_dt) in enumerate(all_time_intervals):
+                if max(start_dt, interval_start_dt) < min(end_dt, interval_end_dt):
+                    calendar_df.loc[all_time_labels[i], column] = value
+    return calendar_df
+
+def _random_slot(rng: random.Random) -> str:
+    day = date(2026, 1, 4) + timedelta(days=rng.randrange(10))
+    start = rng.randrange(6 * 60, 23 * 60, 5)
+    end = (start + rng.randrange(5, 6 * 60, 5)) % 1440 # Some slots run past midnight
+    return f"{day:%Y-%m-%d} {start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+
+def test_calendar_mask_matches_slot_loop():
+    for seed in range(20):
+        rng = random.Random(seed)
+        speaker_availability = {speaker: [_random_slot(rng) for _ in range(rng.randint(0, 6))] for speaker in SPEAKERS}
+        speaker_availability["MARA"].append("2026-01-06 bez času") # Skipped as invalid
+        recording_days_times = [_random_slot(rng) for _ in range(rng.randint(0, 4))]
+        granularity = rng.choice([15, 30, 45, 60])
+        start_hour, end_hour = rng.choice([(8, 20), (0, 23), (10, 12)])
+        num_days = rng.randint(1, 9)
+        start_date = date(2026, 1, 3) + timedelta(days=rng.randrange(6))
+
+        calendar_df = generate_calendar_view(
+            SPEAKERS, speaker_availability, recording_days_times, granularity, start_hour, end_hour, num_days, start_date
+        )
+        expected = _calendar_by_slot_loop(
+            SPEAKERS, speaker_availability, recording_days_times, granularity, start_hour, end_hour, num_days, start_date
+        )
+        pd.testing.assert_frame_equal(calendar_df, expected, check_dtype=False)
+
+def test_calendar_marks_partially_covered_bins():
+    calendar_df = generate_calendar_view(
+        ["JANO"], {"JANO": ["2026-01-05 09:10-09:20", "2026-01-05 23:30-08:45"]}, ["2026-01-05 10:00-10:30"],
+        30, 8, 11, 1, date(2026, 1, 5)
+    )
+    assert calendar_df["JANO"].tolist() == ["", "", "Dostupný", "", "", ""]
+    assert calendar_df["Recording Slots"].tolist() == ["", "", "", "", "Nahrávanie", ""]
+    # The overnight slot starts on the previous calendar day and reaches into this window
+    calendar_df = generate_calendar_view(
+        ["JANO"], {"JANO": ["2026-01-04 23:30-08:45"]}, [], 30, 8, 11, 1, date(2026, 1, 5)
+    )
+    assert calendar_df["JANO"].tolist() == ["Dostupný", "Dostupný", "", "", "", ""]
+
+def test_window_cache_serves_built_windows_and_evicts_the_oldest():
+    availability_index = AvailabilityIndex(SPEAKERS, {"JANO": ["2026-01-05 09:00-12:00"]}, ["2026-01-06 10:00-14:00"])
+    cache = CalendarWindowCache(availability_index, max_windows=2)
+    window = cache.get_window(date(2026, 1, 5), 7)
+    pd.testing.assert_frame_equal(window, build_calendar_window(availability_index, date(2026, 1, 5), 7))
+    assert cache.get_window(date(2026, 1, 5), 7) is window
+
+    cache.get_window(date(2026, 1, 12), 7)
+    cache.get_window(date(2026, 1, 5), 7) # Now the most recently used
+    cache.get_window(date(2026, 1, 19), 7)
+    assert list(cache._windows) == [(date(2026, 1, 5), 7), (date(2026, 1, 19), 7)]
+
+def test_window_cache_prefetches_both_neighbours():
+    availability_index = AvailabilityIndex(SPEAKERS, {"MARA": ["2026-01-02 09:00-12:00"]}, [])
+    cache = CalendarWindowCache(availability_index)
+    cache.prefetch_neighbours(date(2026, 1, 5), 3)
+    # The shared prefetch thread runs one task at a time, so a task queued after the
+    # prefetches finishes after them
+    calendar_module._prefetch_executor.submit(lambda: None).result(timeout=10)
+    assert set(cache._windows) == {(date(2026, 1, 2), 3), (date(2026, 1, 8), 3)}
+    assert cache.get_window(date(2026, 1, 2), 3)["MARA"].eq("Dostupný").sum() == 6
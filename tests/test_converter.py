@@ -0,0 +1,141 @@
+import pytest
+
+pytest.importorskip("docling_core.transforms.chunker")
+from docling_core.transforms.chunker.tokenizer.base import BaseTokenizer
+from docling_core.types.doc import DocItemLabel, DoclingDocument, TableCell, TableData
+
+from converter import TABLE_BLOCK_MAX_ROWS, chunk_hybrid, chunk_lines, convert_and_chunk, iter_convert_and_chunk
+from parser.core_parsing import parse_chunks_to_structured_data
+from parser.table_blocks import TableBlock
+
+class WhitespaceTokenizer(BaseTokenizer):
+    """Counts whitespace-separated words, so HybridChunker runs without downloading a tokenizer model."""
+    max_tokens: int = 40
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+    def get_max_tokens(self) -> int:
+        return self.max_tokens
+
+    def get_tokenizer(self):
+        return self.count_tokens
+
+def _table_data(rows: list[list[str]]) -> TableData:
+    cells = [
+        TableCell(text=text, start_row_offset_idx=row_idx, end_row_offset_idx=row_idx + 1, start_col_offset_idx=col_idx, end_col_offset_idx=col_idx + 1)
+        for row_idx, row in enumerate(rows)
+        for col_idx, text in enumerate(row)
+    ]
+    return TableData(num_rows=len(rows), num_cols=len(rows[0]), table_cells=cells)
+
+def _document(*items: str | tuple[int, str] | list[list[str]]) -> DoclingDocument:
+    """Text items, (level, heading) section headings and tables given as rows of cell texts."""
+    doc = DoclingDocument(name="test")
+    for item in items:
+        if isinstance(item, str):
+            doc.add_text(label=DocItemLabel.TEXT, text=item)
+        elif isinstance(item, tuple):
+            doc.add_heading(text=item[1], level=item[0])
+        else:
+            doc.add_table(data=_table_data(item))
+    return doc
+
+def _script_document(*tables: list[list[str]]) -> DoclingDocument:
+    """A script with nested sections, enough dialogue for several hybrid chunks and the given tables."""
+    return _document(
+        (1, "EPIZÓDA 1"),
+        "Postavy:\nJANO\nMARA",
+        (2, "Obraz 1"),
+        *(f"JANO: Toto je replika číslo {idx}, ktorá má niekoľko slov." for idx in range(12)),
+        [["Poznámky", "Hodnota"], ["réžia", "Novák"]],
+        *tables,
+        (2, "Obraz 2"),
+        "*** 2 ***",
+        *(f"MARA: Odpoveď číslo {idx} (smiech)" for idx in range(6)),
+        (1, "EPIZÓDA 2"),
+        "JANO, MARA: Koniec.",
+    )
+
+def test_lines_are_grouped_without_splitting():
+    lines = [f"JANO: replika {idx} " + "x" * 20 for idx in range(10)]
+    blocks = chunk_lines(_document(*lines), max_chars=100)
+    assert all(isinstance(block, str) for block in blocks)
+    assert len(blocks) > 1
+    assert [line for block in blocks for line in block.split("\n")] == lines
+    # A block only exceeds max_chars when it holds a single longer line
+    assert all(len(block) <= 100 or "\n" not in block for block in blocks)
+
+def test_long_line_is_kept_whole():
+    long_line = "JANO: " + "y" * 300
+    assert chunk_lines(_document("MARA: Ahoj", long_line, "MARA: Čau"), max_chars=100) == ["MARA: Ahoj", long_line, "MARA: Čau"]
+
+def test_headings_are_written_once_per_section():
+    doc = _document((1, "EPIZÓDA 1"), "JANO: Ahoj", (2, "Obraz 1"), "MARA: Čau", "JANO: Tak", (1, "EPIZÓDA 2"), "MARA: Koniec")
+    expected = ["EPIZÓDA 1", "JANO: Ahoj", "Obraz 1", "MARA: Čau", "JANO: Tak", "EPIZÓDA 2", "MARA: Koniec"]
+    assert "\n".join(chunk_lines(doc)).split("\n") == expected
+    # One hybrid chunk per dialogue line: the headings of the section are not repeated in each
+    assert "\n".join(chunk_hybrid(doc, tokenizer=WhitespaceTokenizer(max_tokens=6))).split("\n") == expected
+
+def test_recognised_table_is_split_into_bounded_blocks():
+    rows = [["TC", "Postava", "Text"]] + [[f"00:{idx // 60:02d}:{idx % 60:02d}", "JANO", f"Replika {idx}"] for idx in range(TABLE_BLOCK_MAX_ROWS + 5)]
+    blocks = chunk_lines(_document("Úvod", rows, "Záver"))
+    assert blocks[0] == "Úvod" and blocks[-1] == "Záver"
+    table_blocks = blocks[1:-1]
+    assert all(isinstance(block, TableBlock) for block in table_blocks)
+    assert [len(block.rows) for block in table_blocks] == [TABLE_BLOCK_MAX_ROWS, 5]
+    assert table_blocks[1].rows[-1]["Text"] == f"Replika {TABLE_BLOCK_MAX_ROWS + 4}"
+
+def test_unrecognised_table_is_triplet_text_in_both_modes():
+    doc = _document("Úvod", [["a", "b"], ["c", "d"]])
+    assert chunk_lines(doc) == ["Úvod\na, 1 = b. c, 1 = d"]
+    assert chunk_hybrid(doc, tokenizer=WhitespaceTokenizer()) == chunk_lines(doc)
+
+def test_hybrid_mode_returns_recognised_tables_as_table_blocks():
+    rows = [["TC", "Postava", "Text"], ["00:01:02", "JANO", "Ahoj"], ["00:01:05", "MARA", "Čau"]]
+    blocks = chunk_hybrid(_document("JANO: Úvod", rows, "MARA: Záver"), tokenizer=WhitespaceTokenizer())
+    assert blocks == [
+        "JANO: Úvod",
+        TableBlock(
+            rows=[{"Timecode": "00:01:02", "Speaker": "JANO", "Text": "Ahoj"}, {"Timecode": "00:01:05", "Speaker": "MARA", "Text": "Čau"}],
+            lines=["00:01:02\tJANO\tAhoj", "00:01:05\tMARA\tČau"],
+        ),
+        "MARA: Záver",
+    ]
+
+def test_both_modes_give_the_same_parser_output():
+    doc = _script_document([["TC", "Postava", "Text"]] + [[f"00:02:{idx:02d}", "JANO, MARA", f"Spolu {idx} (OFF)"] for idx in range(5)])
+    hybrid_chunks = chunk_hybrid(doc, tokenizer=WhitespaceTokenizer())
+    lines_chunks = chunk_lines(doc, max_chars=200)
+    # The modes cut the script differently, the rows must not depend on it
+    assert len(hybrid_chunks) > 2 and hybrid_chunks != lines_chunks
+    hybrid_rows = parse_chunks_to_structured_data(hybrid_chunks)
+    assert hybrid_rows == parse_chunks_to_structured_data(lines_chunks)
+
+def test_docx_converted_in_parts_gives_the_same_parser_output(tmp_path):
+    pytest.importorskip("docling.document_converter")
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_heading("EPIZÓDA 1", level=1)
+    for text in ["Postavy:", "JANO", "MARA", "*** 1 ***"]:
+        document.add_paragraph(text)
+    document.add_heading("Obraz 1", level=2)
+    for idx in range(7):
+        document.add_paragraph(f"JANO: Replika číslo {idx}.")
+    table_rows = [["TC", "Postava", "Text"], ["00:01:02", "JANO", "Ahoj (smiech)"], ["00:01:05", "JANO, MARA", "Nazdar"]]
+    table = document.add_table(rows=len(table_rows), cols=3)
+    for row_idx, row in enumerate(table_rows):
+        for col_idx, text in enumerate(row):
+            table.cell(row_idx, col_idx).text = text
+    document.add_heading("Obraz 2", level=2)
+    for idx in range(5):
+        document.add_paragraph(f"MARA: Odpoveď číslo {idx}.")
+    source_path = tmp_path / "script.docx"
+    document.save(source_path)
+
+    progress = []
+    streamed_chunks = list(iter_convert_and_chunk(source_path, part_elements=4, on_progress=lambda done, total: progress.append((done, total))))
+    assert progress == [(done, 5) for done in range(1, 6)]
+    # Headings and line blocks continue across the parts
+    assert streamed_chunks == convert_and_chunk(source_path)
+    assert any(isinstance(chunk, TableBlock) for chunk in streamed_chunks)
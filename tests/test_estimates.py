@@ -0,0 +1,86 @@
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from analyzer.scheduler.core import calculate_optimal_schedule
+from analyzer.scheduler.estimates import estimate_schedule
+
+SPEAKERS = ["A", "B", "C", "D", "E"]
+
+def _script(*segments: tuple[str, list[str], float]) -> pd.DataFrame:
+    """Processed script rows: one row per (segment, speaker), the duration split evenly."""
+    rows = [
+        {"Segment": segment_id, "Speaker": speaker, "SegmentDuration": duration / len(speakers)}
+        for segment_id, speakers, duration in segments
+        for speaker in speakers
+    ]
+    return pd.DataFrame(rows)
+
+def _slot(day: int, start_minute: int, end_minute: int) -> str:
+    day_start = datetime(2026, 1, 5) + timedelta(days=day)
+    start_dt, end_dt = day_start + timedelta(minutes=start_minute), day_start + timedelta(minutes=end_minute)
+    return f"{start_dt:%Y-%m-%d %H:%M}-{end_dt:%H:%M}"
+
+def _random_instance(seed: int):
+    """Wide availability and one or two separate studio slots on each of five days."""
+    rng = random.Random(seed)
+    recording_slots = []
+    for day in range(5):
+        recording_slots.append(_slot(day, 9 * 60, rng.randrange(10 * 60, 13 * 60, 15)))
+        if rng.random() < 0.5:
+            recording_slots.append(_slot(day, 14 * 60, rng.randrange(15 * 60, 18 * 60, 15)))
+    speaker_availability = {
+        speaker: [_slot(day, rng.randrange(8 * 60, 11 * 60, 15), rng.randrange(12 * 60, 19 * 60, 15)) for day in range(5) if rng.random() < 0.8]
+        for speaker in SPEAKERS
+    }
+    segments = [
+        (str(segment_id), rng.sample(SPEAKERS, rng.randint(1, 2)), rng.randint(1, 12) * 300)
+        for segment_id in range(1, rng.randint(5, 40))
+    ]
+    return speaker_availability, recording_slots, _script(*segments)
+
+def test_lower_bounds_never_exceed_a_computed_schedule():
+    full_schedules = 0
+    for seed in range(40):
+        speaker_availability, recording_slots, df_processed = _random_instance(seed)
+        estimate = estimate_schedule.__wrapped__(df_processed, speaker_availability, recording_slots)
+        schedule = calculate_optimal_schedule.__wrapped__(df_processed, speaker_availability, recording_slots)
+
+        # A segment the estimate rules out is never scheduled
+        assert set(estimate.unschedulable["segment_id"]) <= set(schedule.unassigned_segments), seed
+        if schedule.unassigned_segments:
+            continue
+        full_schedules += 1
+        bookings = schedule.bookings
+        used_days = bookings["start"].dt.date.nunique()
+        # Morning slots end by 13:00, afternoon slots start at 14:00
+        used_slots = len(set(zip(bookings["start"].dt.date, bookings["start"].dt.hour >= 14)))
+        assert estimate.fits, seed
+        assert estimate.min_days is not None and estimate.min_days <= used_days, (seed, estimate.min_days, used_days)
+        assert estimate.min_slots is not None and estimate.min_slots <= used_slots, (seed, estimate.min_slots, used_slots)
+        assert estimate.required_seconds == bookings["duration"].sum()
+    assert full_schedules >= 10
+
+def test_bounds_of_an_instance_that_does_not_fit():
+    recording_slots = [_slot(0, 9 * 60, 12 * 60), _slot(1, 9 * 60, 10 * 60)]
+    speaker_availability = {"A": [_slot(0, 9 * 60, 12 * 60)], "B": [_slot(0, 9 * 60, 10 * 60), _slot(1, 9 * 60, 10 * 60)]}
+    df_processed = _script(
+        ("1", ["A"], 7200),
+        ("2", ["A", "B"], 5400), # A and B share only one studio hour
+        ("3", ["B"], 1800),
+    )
+    estimate = estimate_schedule.__wrapped__(df_processed, speaker_availability, recording_slots)
+    assert (estimate.required_seconds, estimate.studio_seconds) == (14400.0, 14400.0)
+    assert (estimate.min_days, estimate.min_slots) == (2, 2)
+    assert estimate.unschedulable.to_dict("records") == [
+        {"segment_id": "2", "speakers": ["A", "B"], "duration": 5400.0, "longest_window_seconds": 3600.0}
+    ]
+    assert estimate.overloaded_speakers.to_dict("records") == [
+        {"speaker": "A", "required_seconds": 12600.0, "available_seconds": 10800.0, "shortfall_seconds": 1800.0},
+    ]
+    assert estimate.speaker_load.set_index("speaker").loc["B", "shortfall_seconds"] == 0.0
+    assert not estimate.fits
+
+    short_studio = estimate_schedule.__wrapped__(df_processed, speaker_availability, [_slot(0, 9 * 60, 10 * 60)])
+    assert (short_studio.min_days, short_studio.min_slots) == (None, None)
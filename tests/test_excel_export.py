@@ -0,0 +1,65 @@
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from utils import excel_export
+from utils.excel_export import build_workbook_sheets, to_excel_workbook
+
+def _read_workbook(workbook_bytes: bytes) -> dict[str, list[tuple]]:
+    workbook = openpyxl.load_workbook(BytesIO(workbook_bytes))
+    return {worksheet.title: list(worksheet.iter_rows(values_only=True)) for worksheet in workbook.worksheets}
+
+def test_workbook_sheets_and_cells():
+    df_processed = pd.DataFrame({
+        "Segment": [1, 1, 2],
+        "Speaker": ["JANO", "MARA", "JANO"],
+        "Text": ["Ahoj", "", None],
+        "SegmentDuration": [60.5, 60.5, np.nan],
+    })
+    speaker_matrix = pd.DataFrame({1: [1, 1], 2: [1, 0]}, index=pd.Index(["JANO", "MARA"]))
+    segment_table = pd.DataFrame({"Segment": [1, 2], "Speakers": [["JANO", "MARA"], ["JANO"]]})
+    calendar_df = pd.DataFrame({"JANO": ["Dostupný", ""]}, index=["2026-01-05 09:00-09:30", "2026-01-05 09:30-10:00"])
+    schedule_bookings = pd.DataFrame({
+        "segment_id": ["1"],
+        "start": pd.Series([datetime(2026, 1, 5, 9, 0, 30)], dtype="datetime64[ns]"),
+        "end": pd.Series([pd.NaT], dtype="datetime64[ns]"),
+        "speakers": [["JANO", "MARA"]],
+    })
+
+    sheets = build_workbook_sheets(df_processed, speaker_matrix, segment_table, calendar_df, schedule_bookings)
+    workbook = _read_workbook(to_excel_workbook.__wrapped__(sheets))
+
+    assert list(workbook) == ["Scenár", "Matica_Rečník_Segment", "Segmenty", "Kalendár", "Plán"]
+    # Empty strings and missing values stay blank cells
+    assert workbook["Scenár"] == [
+        ("Segment", "Speaker", "Text", "SegmentDuration"),
+        (1, "JANO", "Ahoj", 60.5),
+        (1, "MARA", None, 60.5),
+        (2, "JANO", None, None),
+    ]
+    assert workbook["Matica_Rečník_Segment"] == [("Rečník", "1", "2"), ("JANO", 1, 1), ("MARA", 1, 0)]
+    assert workbook["Segmenty"] == [("Segment", "Speakers"), (1, "JANO, MARA"), (2, "JANO")]
+    assert workbook["Kalendár"] == [("Čas", "JANO"), ("2026-01-05 09:00-09:30", "Dostupný"), ("2026-01-05 09:30-10:00", None)]
+    # Datetimes are written as dates with seconds kept
+    assert workbook["Plán"] == [("segment_id", "start", "end", "speakers"), ("1", datetime(2026, 1, 5, 9, 0, 30), None, "JANO, MARA")]
+
+def test_optional_sheets_are_left_out_and_long_names_are_cut():
+    speaker_matrix = pd.DataFrame({1: [1]}, index=["JANO"])
+    sheets = build_workbook_sheets(pd.DataFrame({"Segment": [1]}), speaker_matrix, pd.DataFrame({"Segment": [1]}))
+    assert list(sheets) == ["Scenár", "Matica_Rečník_Segment", "Segmenty"]
+
+    workbook = _read_workbook(to_excel_workbook.__wrapped__({"Veľmi dlhý názov hárku, ktorý Excel nepovolí": pd.DataFrame({"a": [1]})}))
+    assert list(workbook) == ["Veľmi dlhý názov hárku, ktorý E"]
+
+def test_too_wide_speaker_matrix_is_written_transposed(monkeypatch):
+    monkeypatch.setattr(excel_export, "MAX_SHEET_COLUMNS", 3)
+    speaker_matrix = pd.DataFrame({1: [1, 0], 2: [0, 1], 3: [1, 1]}, index=["JANO", "MARA"])
+    sheets = build_workbook_sheets(pd.DataFrame(), speaker_matrix, pd.DataFrame())
+    assert sheets["Matica_Rečník_Segment"].to_dict("records") == [
+        {"Segment": 1, "JANO": 1, "MARA": 0},
+        {"Segment": 2, "JANO": 0, "MARA": 1},
+        {"Segment": 3, "JANO": 1, "MARA": 1},
+    ]
@@ -0,0 +1,141 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from analyzer.scheduler.core import build_segments_to_schedule, calculate_optimal_schedule
+from analyzer.scheduler.feasibility import (
+    FEASIBLE,
+    NO_COMMON_AVAILABILITY,
+    NO_COMMON_STUDIO_TIME,
+    SPEAKER_WITHOUT_AVAILABILITY,
+    UNKNOWN_SEGMENT,
+    WINDOW_TOO_SHORT,
+    FeasibilityMatrix,
+    calculate_bitmask_schedule,
+)
+from analyzer.scheduler.intersection import CastIntersectionCache
+from analyzer.scheduler.utils import parse_time_slots
+from analyzer.scheduler.validation import DROPPED_SEGMENT, validate_schedule
+
+SPEAKERS = ["A", "B", "C", "D", "E"]
+
+def _script(*segments: tuple[str, list[str], float]) -> pd.DataFrame:
+    """Processed script rows: one row per (segment, speaker), the duration split evenly."""
+    rows = [
+        {"Segment": segment_id, "Speaker": speaker, "SegmentDuration": duration / len(speakers)}
+        for segment_id, speakers, duration in segments
+        for speaker in speakers
+    ]
+    return pd.DataFrame(rows)
+
+def _slot(day: int, start_minute: int, end_minute: int) -> str:
+    day_start = datetime(2026, 1, 5) + timedelta(days=day)
+    start_dt, end_dt = day_start + timedelta(minutes=start_minute), day_start + timedelta(minutes=end_minute)
+    return f"{start_dt:%Y-%m-%d %H:%M}-{end_dt:%H:%M}"
+
+def _random_instance(seed: int, step_minutes: int, duration_step_seconds: int):
+    """Random availability, studio slots and script over three days; all times are multiples of step_minutes."""
+    rng = random.Random(seed)
+
+    def random_slot(day: int) -> str:
+        start = rng.randrange(8 * 60, 17 * 60, step_minutes)
+        return _slot(day, start, min(start + rng.randrange(step_minutes, 5 * 60, step_minutes), 20 * 60))
+
+    speaker_availability = {speaker: [random_slot(rng.randrange(3)) for _ in range(rng.randint(0, 4))] for speaker in SPEAKERS}
+    # One studio slot a day: the greedy scheduler books overlapping studio slots independently
+    recording_slots = [random_slot(day) for day in range(3)]
+    segments = [
+        (str(segment_id), rng.sample(SPEAKERS, rng.randint(1, 3)), rng.randint(1, 8) * duration_step_seconds)
+        for segment_id in range(1, 16)
+    ]
+    return speaker_availability, recording_slots, _script(*segments)
+
+def _fits(speakers: list[str], duration: float, speaker_availability: dict[str, list[str]], recording_slots: list[str]) -> bool:
+    """The interval-based check of the greedy scheduler, on an empty schedule."""
+    cache = CastIntersectionCache({speaker: parse_time_slots(slots) for speaker, slots in speaker_availability.items()})
+    return any(
+        cache.earliest_common_start(speakers, rec_start, rec_end, duration) is not None
+        for rec_start, rec_end in parse_time_slots(recording_slots)
+    )
+
+def test_matrix_matches_interval_check_on_quarter_hour_inputs():
+    for seed in range(20):
+        speaker_availability, recording_slots, df_processed = _random_instance(seed, 15, 60)
+        segments = build_segments_to_schedule(df_processed)
+        matrix = FeasibilityMatrix(segments, speaker_availability, recording_slots)
+        for segment in segments:
+            fits = _fits(segment['speakers'], segment['duration'], speaker_availability, recording_slots)
+            assert bool(matrix.feasible_starts(segment['segment_id'])) == fits, (seed, segment)
+            assert (matrix.explain(segment['segment_id'])["reason"] == FEASIBLE) == fits, (seed, segment)
+
+def test_matrix_never_reports_off_grid_time_as_feasible():
+    for seed in range(20):
+        speaker_availability, recording_slots, df_processed = _random_instance(seed, 5, 60)
+        segments = build_segments_to_schedule(df_processed)
+        matrix = FeasibilityMatrix(segments, speaker_availability, recording_slots)
+        for segment in segments:
+            if matrix.feasible_starts(segment['segment_id']):
+                assert _fits(segment['speakers'], segment['duration'], speaker_availability, recording_slots), (seed, segment)
+
+def test_bitmask_schedule_matches_greedy_schedule_on_quarter_hour_inputs():
+    for seed in range(20):
+        speaker_availability, recording_slots, df_processed = _random_instance(seed, 15, 900)
+        bitmask = calculate_bitmask_schedule.__wrapped__(df_processed, speaker_availability, recording_slots)
+        greedy = calculate_optimal_schedule.__wrapped__(df_processed, speaker_availability, recording_slots)
+        columns = ["segment_id", "start", "end"]
+        pd.testing.assert_frame_equal(bitmask.bookings[columns], greedy.bookings[columns])
+        assert bitmask.unassigned_segments == greedy.unassigned_segments
+
+def test_bitmask_schedule_is_valid_on_off_grid_inputs():
+    for seed in range(20):
+        speaker_availability, recording_slots, df_processed = _random_instance(seed, 5, 50)
+        schedule = calculate_bitmask_schedule.__wrapped__(df_processed, speaker_availability, recording_slots)
+        violations = validate_schedule(schedule.bookings, df_processed, speaker_availability, recording_slots)
+        assert (violations["kind"] == DROPPED_SEGMENT).all(), (seed, violations)
+
+def test_explain_names_the_most_fundamental_reason():
+    recording_slots = [_slot(0, 9 * 60, 12 * 60), _slot(0, 14 * 60, 15 * 60)]
+    speaker_availability = {
+        "A": [_slot(0, 9 * 60, 11 * 60)],
+        "B": [_slot(0, 10 * 60, 12 * 60)],
+        "C": [_slot(0, 9 * 60, 10 * 60), _slot(0, 12 * 60, 13 * 60)],
+        "D": [_slot(0, 11 * 60, 12 * 60)],
+        "E": [_slot(0, 10 * 60, 11 * 60), _slot(0, 12 * 60, 13 * 60)], # Shares only the studio break with C
+        "F": [_slot(0, 12 * 60, 14 * 60)], # Only outside studio time
+    }
+    df_processed = _script(
+        ("1", ["A", "B"], 1800),
+        ("2", ["A", "F"], 1800),
+        ("3", ["A", "D"], 1800),
+        ("4", ["C", "E"], 1800),
+        ("5", ["A", "B"], 7200),
+    )
+    matrix = FeasibilityMatrix.from_processed(df_processed, speaker_availability, recording_slots)
+
+    assert matrix.explain("1")["reason"] == FEASIBLE
+    assert matrix.explain("2")["reason"] == SPEAKER_WITHOUT_AVAILABILITY
+    assert matrix.explain("3")["reason"] == NO_COMMON_AVAILABILITY
+    assert matrix.explain("4")["reason"] == NO_COMMON_STUDIO_TIME
+    too_short = matrix.explain("5")
+    assert too_short["reason"] == WINDOW_TOO_SHORT
+    assert (too_short["required_bins"], too_short["longest_run_bins"]) == (8, 4)
+    assert too_short["speakers"].set_index("speaker")["shared_with_cast_bins"].to_dict() == {"A": 4, "B": 4}
+    assert matrix.explain("99")["reason"] == UNKNOWN_SEGMENT
+
+def test_incremental_updates_match_a_rebuilt_matrix():
+    speaker_availability, recording_slots, df_processed = _random_instance(3, 15, 60)
+    segments = build_segments_to_schedule(df_processed)
+    matrix = FeasibilityMatrix(segments, speaker_availability, recording_slots)
+
+    changed_availability = {**speaker_availability, "B": [_slot(1, 9 * 60, 18 * 60)]}
+    assert matrix.update(changed_availability, recording_slots) == {"B"}
+    assert np.array_equal(matrix.bits, FeasibilityMatrix(segments, changed_availability, recording_slots).bits)
+
+    # A slot past the horizon makes the matrix rebuild it
+    wider_slots = recording_slots + [_slot(4, 8 * 60, 20 * 60)]
+    matrix.update(changed_availability, wider_slots)
+    rebuilt = FeasibilityMatrix(segments, changed_availability, wider_slots)
+    assert (matrix.horizon_start, matrix.num_bins) == (rebuilt.horizon_start, rebuilt.num_bins)
+    assert np.array_equal(matrix.bits, rebuilt.bits)
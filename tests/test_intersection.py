@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from analyzer.scheduler.intersection import CastIntersectionCache, intersect_intervals
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 1, 5, hour, minute)
+
+def test_intersect_intervals_of_three_lists():
+    common = intersect_intervals([
+        [(_at(9), _at(12)), (_at(13), _at(17))],
+        [(_at(10), _at(16))],
+        [(_at(8), _at(11)), (_at(14), _at(18))],
+    ])
+    assert common == [(_at(10), _at(11)), (_at(14), _at(16))]
+
+def test_touching_intervals_have_no_common_window():
+    assert intersect_intervals([[(_at(9), _at(10))], [(_at(10), _at(11))]]) == []
+
+def test_empty_input_or_list_has_no_common_window():
+    assert intersect_intervals([]) == []
+    assert intersect_intervals([[(_at(9), _at(10))], []]) == []
+
+def test_single_list_is_returned_unchanged():
+    intervals = [(_at(9), _at(10)), (_at(11), _at(12))]
+    assert intersect_intervals([intervals]) == intervals
+
+def test_cache_computes_each_cast_once():
+    cache = CastIntersectionCache({
+        "A": [(_at(9), _at(12))],
+        "B": [(_at(10), _at(11)), (_at(10, 30), _at(13))],
+    })
+    assert cache.common_availability(["A", "B"]) == [(_at(10), _at(12))]
+    assert cache.common_availability(["B", "A"]) == [(_at(10), _at(12))]
+    assert cache.stats() == {"casts": 1, "hits": 1, "misses": 1}
+
+def test_earliest_common_start_within_window():
+    cache = CastIntersectionCache({
+        "A": [(_at(9), _at(10)), (_at(11), _at(15))],
+        "B": [(_at(9), _at(15))],
+    })
+    assert cache.earliest_common_start(["A", "B"], _at(9, 30), _at(15), 3600) == _at(11)
+    assert cache.earliest_common_start(["A", "B"], _at(9), _at(15), 1800) == _at(9)
+    assert cache.earliest_common_start(["A", "B"], _at(11), _at(11, 30), 3600) is None
+    assert cache.earliest_common_start(["A", "C"], _at(9), _at(15), 60) is None
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from utils.job_queue import JobQueue
+
+def _wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.01)
+
+@pytest.fixture
+def job_queue():
+    return JobQueue(max_workers=2, max_concurrent_conversions=1)
+
+def _submit_conversion(job_queue: JobQueue, release: threading.Event):
+    def run(job):
+        with job_queue.conversion_slot(job):
+            release.wait(5)
+        return "converted"
+    return job_queue.submit("script", run, conversion=True)
+
+def test_waiting_conversions_do_not_block_other_jobs(job_queue):
+    release = threading.Event()
+    conversions = [_submit_conversion(job_queue, release) for _ in range(4)]
+    _wait_until(lambda: conversions[0].status == "running")
+
+    other_job = job_queue.submit("schedule", lambda job: "scheduled")
+    _wait_until(lambda: other_job.finished)
+    assert other_job.result == "scheduled"
+    # Only the converting job was handed to a worker, the others wait for the slot
+    assert [job.status for job in conversions] == ["running", "queued", "queued", "queued"]
+    assert job_queue.stats()["waiting_for_conversion"] == 3
+    assert job_queue.queue_position(conversions[1].id) == 1
+
+    release.set()
+    _wait_until(lambda: all(job.finished for job in conversions))
+    assert [job.result for job in conversions] == ["converted"] * 4
+
+def test_cancelling_a_waiting_conversion_finishes_it_at_once(job_queue):
+    release = threading.Event()
+    running = _submit_conversion(job_queue, release)
+    waiting = _submit_conversion(job_queue, release)
+    _wait_until(lambda: running.status == "running")
+
+    job_queue.cancel(waiting.id)
+    assert waiting.status == "cancelled"
+    assert job_queue.queue_position(waiting.id) is None
+    release.set()
+    _wait_until(lambda: running.finished)
+    assert running.status == "done"
+
+def test_slot_is_freed_when_a_conversion_job_skips_the_conversion(job_queue):
+    skipped = job_queue.submit("script", lambda job: "cached", conversion=True)
+    _wait_until(lambda: skipped.finished)
+    release = threading.Event()
+    release.set()
+    converted = _submit_conversion(job_queue, release)
+    _wait_until(lambda: converted.finished)
+    assert converted.result == "converted"
+
+def test_conversion_slot_requires_a_conversion_job(job_queue):
+    def run(job):
+        with job_queue.conversion_slot(job):
+            pass
+    job = job_queue.submit("script", run)
+    _wait_until(lambda: job.finished)
+    assert job.status == "failed"
+    assert "conversion=True" in job.error
@@ -0,0 +1,34 @@
+import time
+
+from utils import metrics
+
+def test_metrics_file_picks_up_stages_recorded_after_start(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_metrics_file_writer", None)
+    path = tmp_path / "analyzer.prom"
+    metrics.start_metrics_file_writer(path, interval_seconds=0.05)
+
+    with metrics.stage_timer("test_background_stage"):
+        pass
+    deadline = time.monotonic() + 5
+    while 'stage="test_background_stage"' not in (path.read_text(encoding="utf-8") if path.exists() else ""):
+        assert time.monotonic() < deadline, "stage did not reach the metrics file"
+        time.sleep(0.02)
+
+def test_timed_stage_records_output_counts():
+    @metrics.timed_stage("test_counted_stage", input_size=lambda items: len(items), output_counts=lambda result: {"rows": len(result)})
+    def double(items):
+        return items * 2
+
+    with metrics.collect_stage_timings() as timings:
+        assert double([1, 2]) == [1, 2, 1, 2]
+    assert timings[0]["stage"] == "test_counted_stage"
+    assert timings[0]["input_size"] == 2
+    assert timings[0]["rows"] == 4
+
+def test_excluded_time_is_left_out_of_the_stage():
+    with metrics.collect_stage_timings() as timings:
+        with metrics.stage_timer("test_stage_with_preview"):
+            with metrics.excluded_from_stage():
+                time.sleep(0.2)
+            time.sleep(0.01)
+    assert 0.005 < timings[0]["seconds"] < 0.1
@@ -0,0 +1,100 @@
+import io
+import time
+
+import pandas as pd
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from analyzer.data_processing import build_speaker_segment_matrix, process_parsed_data
+from analyzer.table_index import ScriptTableIndex
+from analyzer.text_index import TextIndex
+from pipeline import _ScriptPreview, apply_nominal_durations, run_script_pipeline
+from utils.job_queue import get_job_queue
+
+NOMINAL_DURATIONS = {1: 60, 2: 90, 3: 120, 4: 150, 5: 200}
+
+def _docx_bytes(paragraphs_before: list[str], table_rows: list[list[str]], paragraphs_after: list[str]) -> bytes:
+    document = docx.Document()
+    for text in paragraphs_before:
+        document.add_paragraph(text)
+    table = document.add_table(rows=len(table_rows), cols=len(table_rows[0]))
+    for row_idx, row in enumerate(table_rows):
+        for col_idx, text in enumerate(row):
+            table.cell(row_idx, col_idx).text = text
+    for text in paragraphs_after:
+        document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def test_docx_table_is_mapped_to_rows():
+    pytest.importorskip("docling.document_converter")
+    file_bytes = _docx_bytes(
+        ["Postavy:", "JANO", "MARA", "*** 1 ***"],
+        [["TC", "Postava", "Text"], ["00:01:02", "JANO", "Ahoj (smiech)"], ["00:01:05", "JANO, MARA", "Nazdar"]],
+        ["MARA: Koniec"],
+    )
+    job = get_job_queue().submit("script", run_script_pipeline, file_bytes, NOMINAL_DURATIONS, conversion=True)
+    deadline = time.monotonic() + 120
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert job.status == "done", job.error
+
+    result = job.result
+    assert result["detection_counts"]["Table"] == 2
+    table_rows = [row for row in result["parsed_data"] if row["Timecode"]]
+    assert [(row["Timecode"], row["Speaker"], row["Text"], row["Scene Marker"]) for row in table_rows] == [
+        ("00:01:02", "JANO", "Ahoj", "(smiech)"),
+        ("00:01:05", "JANO", "Nazdar", ""),
+        ("00:01:05", "MARA", "Nazdar", ""),
+    ]
+    assert result["parsed_data"][-1]["Speaker"] == "MARA"
+
+def test_preview_appended_in_batches_equals_the_processed_rows():
+    rows = [
+        {"Segment": str(idx // 4), "Speaker": ["JANO", "MARA", "", "FERO"][idx % 4 if idx < 12 else 0], "Timecode": f"00:00:{idx:02d}", "Text": f"Replika {idx}"}
+        for idx in range(20)
+    ]
+    preview = _ScriptPreview(NOMINAL_DURATIONS)
+    published = []
+    # Segment 1 continues in the next batch, which adds a speaker to it
+    for start, end in [(0, 6), (6, 7), (7, 15), (15, 20)]:
+        preview.append(rows[start:end])
+        published.append(preview.build(["JANO", "MARA", "FERO"], len(published) + 1))
+        pd.testing.assert_frame_equal(published[-1]["df_processed"], process_parsed_data.__wrapped__(rows[:end], NOMINAL_DURATIONS))
+
+    # Previews already handed out are not changed by later batches
+    assert len(published[0]["df_processed"]) == 6
+    assert published[0]["df_processed"]["NumSpeakersInSegment"].tolist() == [3, 3, 3, 3, 2, 2]
+    assert list(published[-1]["speaker_matrix"].index) == ["FERO", "JANO", "MARA"]
+
+def test_new_nominal_durations_rebuild_everything_derived_from_the_frame():
+    parsed_data = [
+        {"Segment": "1", "Speaker": "JANO", "Timecode": "00:00:01", "Text": "Ahoj", "Scene Marker": ""},
+        {"Segment": "1", "Speaker": "MARA", "Timecode": "00:00:02", "Text": "Čau", "Scene Marker": ""},
+        {"Segment": "2", "Speaker": "JANO", "Timecode": "00:00:03", "Text": "Zbohom", "Scene Marker": ""},
+    ]
+    df_processed = process_parsed_data.__wrapped__(parsed_data, NOMINAL_DURATIONS)
+    artifacts = {
+        "parsed_data": parsed_data,
+        "df_processed": df_processed,
+        "nominal_durations": dict(NOMINAL_DURATIONS),
+        "table_index": ScriptTableIndex(df_processed),
+        "text_index": TextIndex(df_processed, "E01"),
+        "speaker_matrix": build_speaker_segment_matrix.__wrapped__(df_processed),
+        "num_chunks": 1,
+    }
+    assert apply_nominal_durations(artifacts, dict(NOMINAL_DURATIONS)) is artifacts
+
+    new_durations = {**NOMINAL_DURATIONS, 2: 300}
+    updated = apply_nominal_durations(artifacts, new_durations)
+    assert updated["df_processed"]["SegmentDuration"].tolist() == [300, 300, 60]
+    assert updated["nominal_durations"] == new_durations
+    for name in ("table_index", "text_index", "speaker_matrix"):
+        assert updated[name] is not artifacts[name]
+    assert updated["text_index"].episode == "E01"
+    assert updated["table_index"].query(speakers=["MARA"]).tolist() == [1]
+    assert updated["num_chunks"] == 1
+    # The shared artifacts are left as they were
+    assert artifacts["df_processed"] is df_processed and artifacts["nominal_durations"] == NOMINAL_DURATIONS
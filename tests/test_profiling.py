@@ -0,0 +1,55 @@
+import io
+import json
+import pstats
+import tempfile
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+from utils.profiling import ProfileCapture
+
+def _allocate_rows(count: int) -> list[str]:
+    return [f"riadok {i}" * 10 for i in range(count)]
+
+def test_capture_records_each_stage_and_builds_the_bundle():
+    capture = ProfileCapture()
+    capture.start()
+    kept = _allocate_rows(20000)
+    capture.snapshot("parse")
+    kept.extend(_allocate_rows(100))
+    capture.snapshot("process")
+    capture.stop()
+    assert not tracemalloc.is_tracing()
+
+    assert [stage["stage"] for stage in capture.stage_allocations] == ["parse", "process"]
+    parse_stage = capture.stage_allocations[0]
+    assert parse_stage["seconds"] >= 0
+    # The rows kept alive show up as the largest allocation of the stage, located in this file
+    assert parse_stage["top_allocations"][0]["location"].startswith(__file__)
+    assert parse_stage["top_allocations"][0]["size_diff_bytes"] > 20000 * 80
+
+    bundle = zipfile.ZipFile(io.BytesIO(capture.build_bundle({"metrics.json": {"rows": len(kept)}, "poznámka.txt": "Ďakujem"})))
+    assert set(bundle.namelist()) == {
+        "profile.pstats", "profile_summary.txt", "allocations.txt", "allocations.json", "metrics.json", "poznámka.txt"
+    }
+    assert json.loads(bundle.read("allocations.json"))[1]["stage"] == "process"
+    assert json.loads(bundle.read("metrics.json")) == {"rows": 20100}
+    assert bundle.read("poznámka.txt").decode() == "Ďakujem"
+    assert "== parse:" in bundle.read("allocations.txt").decode()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pstats_path = Path(tmp_dir) / "profile.pstats"
+        pstats_path.write_bytes(bundle.read("profile.pstats"))
+        profiled_functions = {function_name for _, _, function_name in pstats.Stats(str(pstats_path)).stats}
+    assert "_allocate_rows" in profiled_functions
+
+def test_capture_leaves_an_already_running_tracemalloc_running():
+    tracemalloc.start()
+    try:
+        capture = ProfileCapture()
+        capture.start()
+        capture.snapshot("parse")
+        capture.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+import pandas as pd
+
+from analyzer.scheduler.core import calculate_optimal_schedule
+from analyzer.scheduler.repair import _subtract_bookings, repair_schedule
+from analyzer.scheduler.result import DEFAULT_ROOM, ScheduleResult
+from analyzer.scheduler.validation import OUTSIDE_AVAILABILITY, validate_schedule
+
+RECORDING_SLOTS = ["2026-01-05 09:00-17:00"]
+
+def _script(*segments: tuple[str, list[str], float]) -> pd.DataFrame:
+    """Processed script rows: one row per (segment, speaker), the duration split evenly."""
+    rows = [
+        {"Segment": segment_id, "Speaker": speaker, "SegmentDuration": duration / len(speakers)}
+        for segment_id, speakers, duration in segments
+        for speaker in speakers
+    ]
+    return pd.DataFrame(rows)
+
+def _schedule(*bookings: tuple[str, list[str], str, str]) -> ScheduleResult:
+    records = [
+        {
+            "segment_id": segment_id,
+            "room": DEFAULT_ROOM,
+            "start": datetime.fromisoformat(start),
+            "end": datetime.fromisoformat(end),
+            "duration": (datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds(),
+            "speakers": speakers,
+        }
+        for segment_id, speakers, start, end in bookings
+    ]
+    return ScheduleResult.from_records(records, [], "Generated Schedule")
+
+def test_repair_requeues_booking_only_partly_inside_new_availability():
+    df_processed = _script(("1", ["A"], 3600))
+    previous_schedule = _schedule(("1", ["A"], "2026-01-05 09:00", "2026-01-05 10:00"))
+    previous_availability = {"A": ["2026-01-05 09:00-10:00"]}
+    speaker_availability = {"A": ["2026-01-05 09:30-10:00"]}
+
+    repaired = repair_schedule.__wrapped__(
+        previous_schedule, df_processed, previous_availability, speaker_availability, RECORDING_SLOTS, RECORDING_SLOTS
+    )
+
+    assert repaired.repaired_segments == ["1"]
+    assert repaired.bookings.empty
+    assert repaired.unassigned_segments == ["1"]
+    # Repair agrees with the validator and with a fresh scheduler run
+    assert OUTSIDE_AVAILABILITY in set(validate_schedule(previous_schedule.bookings, df_processed, speaker_availability, RECORDING_SLOTS)["kind"])
+    assert calculate_optimal_schedule.__wrapped__(df_processed, speaker_availability, RECORDING_SLOTS).unassigned_segments == ["1"]
+
+def test_repair_keeps_booking_inside_adjacent_availability_slots():
+    df_processed = _script(("1", ["A", "B"], 3600))
+    previous_schedule = _schedule(("1", ["A", "B"], "2026-01-05 09:00", "2026-01-05 10:00"))
+    availability = {"A": ["2026-01-05 09:00-10:00"], "B": ["2026-01-05 08:00-12:00"]}
+    # Split into touching slots: still covers the booking
+    speaker_availability = {**availability, "A": ["2026-01-05 09:00-09:30", "2026-01-05 09:30-11:00"]}
+
+    repaired = repair_schedule.__wrapped__(
+        previous_schedule, df_processed, availability, speaker_availability, RECORDING_SLOTS, RECORDING_SLOTS
+    )
+
+    assert repaired.repaired_segments == []
+    assert repaired.bookings["start"].tolist() == [pd.Timestamp("2026-01-05 09:00")]
+    assert validate_schedule(repaired.bookings, df_processed, speaker_availability, RECORDING_SLOTS).empty
+
+def test_repaired_schedule_is_valid_after_availability_shrinks():
+    df_processed = _script(("1", ["A"], 1800), ("2", ["A", "B"], 1800), ("3", ["B"], 1800))
+    availability = {"A": ["2026-01-05 09:00-12:00"], "B": ["2026-01-05 09:00-12:00"]}
+    previous_schedule = calculate_optimal_schedule.__wrapped__(df_processed, availability, RECORDING_SLOTS)
+    speaker_availability = {**availability, "A": ["2026-01-05 10:15-12:00"]}
+
+    repaired = repair_schedule.__wrapped__(
+        previous_schedule, df_processed, availability, speaker_availability, RECORDING_SLOTS, RECORDING_SLOTS
+    )
+
+    assert repaired.unassigned_segments == []
+    assert validate_schedule(repaired.bookings, df_processed, speaker_availability, RECORDING_SLOTS).empty
+
+def test_repair_keeps_bookings_that_still_fit_a_changed_recording_slot():
+    df_processed = _script(("1", ["A"], 3600), ("2", ["A"], 3600))
+    availability = {"A": ["2026-01-05 08:00-18:00"]}
+    previous_schedule = _schedule(
+        ("1", ["A"], "2026-01-05 09:00", "2026-01-05 10:00"),
+        ("2", ["A"], "2026-01-05 15:00", "2026-01-05 16:00"),
+    )
+
+    extended = repair_schedule.__wrapped__(
+        previous_schedule, df_processed, availability, availability, ["2026-01-05 09:00-17:00"], ["2026-01-05 09:00-18:00"]
+    )
+    assert extended.repaired_segments == []
+    assert extended.bookings["start"].tolist() == previous_schedule.bookings["start"].tolist()
+
+    shortened = repair_schedule.__wrapped__(
+        previous_schedule, df_processed, availability, availability, ["2026-01-05 09:00-17:00"], ["2026-01-05 09:00-15:30"]
+    )
+    assert shortened.repaired_segments == ["2"]
+    assert shortened.bookings.set_index("segment_id")["start"].to_dict() == {
+        "1": pd.Timestamp("2026-01-05 09:00"),
+        "2": pd.Timestamp("2026-01-05 10:00"),
+    }
+    assert validate_schedule(shortened.bookings, df_processed, availability, ["2026-01-05 09:00-15:30"]).empty
+
+def test_repair_requeues_only_segments_whose_cast_or_duration_changed():
+    df_processed = _script(("1", ["A"], 1800), ("2", ["A", "B"], 1800), ("3", ["B"], 1800))
+    availability = {"A": ["2026-01-05 09:00-12:00"], "B": ["2026-01-05 09:00-12:00"]}
+    previous_schedule = calculate_optimal_schedule.__wrapped__(df_processed, availability, RECORDING_SLOTS)
+    kept_start = previous_schedule.bookings.set_index("segment_id").loc["3", "start"]
+    # Segment 1 gains B, segment 2 becomes longer
+    changed_script = _script(("1", ["A", "B"], 1800), ("2", ["A", "B"], 2400), ("3", ["B"], 1800))
+
+    repaired = repair_schedule.__wrapped__(
+        previous_schedule, changed_script, availability, availability, RECORDING_SLOTS, RECORDING_SLOTS
+    )
+
+    assert sorted(repaired.repaired_segments) == ["1", "2"]
+    assert repaired.bookings.set_index("segment_id").loc["3", "start"] == kept_start
+    assert validate_schedule(repaired.bookings, changed_script, availability, RECORDING_SLOTS).empty
+
+def test_subtract_bookings_leaves_the_gaps_of_each_slot():
+    def at(time: str) -> datetime:
+        return datetime.fromisoformat(f"2026-01-05 {time}")
+
+    free = _subtract_bookings(
+        [(at("13:00"), at("17:00")), (at("09:00"), at("12:00"))],
+        [(at("10:00"), at("10:30")), (at("10:15"), at("11:00")), (at("11:30"), at("13:30")), (at("16:00"), at("18:00"))],
+    )
+    assert free == [(at("09:00"), at("10:00")), (at("11:00"), at("11:30")), (at("13:30"), at("16:00"))]
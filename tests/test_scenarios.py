@@ -0,0 +1,35 @@
+from analyzer.scheduler.scenarios import build_scenario_grid, run_scenario_sweep
+
+NOMINAL_DURATIONS = {1: 60, 2: 90, 3: 120, 4: 150, 5: 200}
+
+def _parsed_rows() -> list[dict]:
+    rows = []
+    for segment_id, speakers in (("1", ["A"]), ("2", ["A", "B"]), ("3", ["B"])):
+        for speaker in speakers:
+            rows.append({"Timecode": "", "Speaker": speaker, "Text": "Text", "Scene Marker": "", "Segment": segment_id})
+    return rows
+
+def test_grid_includes_availability_overrides():
+    scenarios = build_scenario_grid(
+        [("Aktuálne", NOMINAL_DURATIONS)],
+        [("Všetky dni", ["2026-01-05 09:00-17:00"])],
+        [("Aktuálna dostupnosť", {}), ("B plne dostupný", {"B": ["2026-01-05 09:00-17:00"]})]
+    )
+    assert [scenario["name"] for scenario in scenarios] == ["Aktuálne | Všetky dni | Aktuálna dostupnosť", "Aktuálne | Všetky dni | B plne dostupný"]
+    assert scenarios[1]["availability_overrides"] == {"B": ["2026-01-05 09:00-17:00"]}
+
+def test_sweep_applies_overrides_and_reports_progress():
+    recording_slots = ["2026-01-05 09:00-17:00"]
+    scenarios = build_scenario_grid(
+        [("Aktuálne", NOMINAL_DURATIONS)],
+        [("Všetky dni", recording_slots)],
+        [("Aktuálna dostupnosť", {}), ("B plne dostupný", {"B": recording_slots})]
+    )
+    progress = []
+    results = run_scenario_sweep(
+        _parsed_rows(), {"A": recording_slots, "B": []}, scenarios, max_workers=2,
+        on_progress=lambda finished, total: progress.append((finished, total))
+    )
+    assert results["Scenario"].tolist() == [scenario["name"] for scenario in scenarios]
+    assert results["UnassignedSegments"].tolist() == [2, 0]
+    assert progress == [(1, 2), (2, 2)]
@@ -0,0 +1,82 @@
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from analyzer.scheduler.result import DEFAULT_ROOM, ScheduleResult
+from analyzer.scheduler.summary import SUMMARY_COLUMNS, summarize_speaker_schedule
+
+SPEAKERS = ["JANO", "MARA", "FERO", "ZUZANA"]
+
+def _summary_by_row_loop(records: list[dict]) -> pd.DataFrame:
+    """The per-speaker summary computed the way it was before vectorizing: one booking at a time."""
+    speaker_summary = {}
+    for item in records:
+        for speaker in item["speakers"]:
+            data = speaker_summary.setdefault(speaker, {"TotalScheduledDuration": 0.0, "TotalSegments": 0, "TimeRanges": []})
+            data["TotalScheduledDuration"] += item["duration"]
+            data["TotalSegments"] += 1
+            data["TimeRanges"].append((item["start"], item["end"]))
+
+    summary_data = []
+    for speaker, data in speaker_summary.items():
+        sorted_time_ranges = sorted(data["TimeRanges"], key=lambda x: x[0])
+        overall_start, overall_end = sorted_time_ranges[0]
+        idle_time = timedelta(seconds=0)
+        for i in range(1, len(sorted_time_ranges)):
+            prev_end = sorted_time_ranges[i - 1][1]
+            current_start = sorted_time_ranges[i][0]
+            if current_start > prev_end:
+                idle_time += current_start - prev_end
+            overall_end = max(overall_end, sorted_time_ranges[i][1])
+        summary_data.append({
+            "SpeakerName": speaker,
+            "TotalScheduledDuration": data["TotalScheduledDuration"],
+            "TotalSegments": data["TotalSegments"],
+            "OverallStart": overall_start,
+            "OverallEnd": overall_end,
+            "IdleTime": idle_time.total_seconds(),
+        })
+    return pd.DataFrame(summary_data, columns=SUMMARY_COLUMNS)
+
+def _random_records(rng: random.Random) -> list[dict]:
+    records = []
+    for segment_id in range(rng.randint(1, 40)):
+        start = datetime(2026, 1, 5, 8) + timedelta(seconds=rng.randrange(0, 3 * 24 * 3600, 7))
+        duration = rng.randrange(30, 3600)
+        records.append({
+            "segment_id": str(segment_id),
+            "room": DEFAULT_ROOM,
+            "start": start,
+            "end": start + timedelta(seconds=duration),
+            "duration": float(duration),
+            "speakers": rng.sample(SPEAKERS, rng.randint(1, 3)),
+        })
+    return records
+
+def test_vectorized_summary_matches_row_loop():
+    for seed in range(30):
+        records = _random_records(random.Random(seed))
+        schedule = ScheduleResult.from_records(records, [], "Generated Schedule")
+        df_summary = summarize_speaker_schedule(schedule).sort_values("SpeakerName", ignore_index=True)
+        expected = _summary_by_row_loop(records).sort_values("SpeakerName", ignore_index=True)
+        pd.testing.assert_frame_equal(df_summary, expected, check_dtype=False)
+
+def test_summary_counts_only_gaps_between_consecutive_bookings():
+    records = [
+        {"segment_id": "1", "room": DEFAULT_ROOM, "start": datetime(2026, 1, 5, 9), "end": datetime(2026, 1, 5, 10), "duration": 3600.0, "speakers": ["JANO", "MARA"]},
+        {"segment_id": "2", "room": DEFAULT_ROOM, "start": datetime(2026, 1, 5, 9, 30), "end": datetime(2026, 1, 5, 9, 45), "duration": 900.0, "speakers": ["JANO"]},
+        {"segment_id": "3", "room": DEFAULT_ROOM, "start": datetime(2026, 1, 5, 11, 0, 30), "end": datetime(2026, 1, 5, 11, 10), "duration": 570.0, "speakers": ["JANO"]},
+    ]
+    df_summary = summarize_speaker_schedule(ScheduleResult.from_records(records, ["4"], "Generated Schedule")).set_index("SpeakerName")
+    assert df_summary.loc["JANO", "TotalSegments"] == 3
+    assert df_summary.loc["JANO", "TotalScheduledDuration"] == 5070.0
+    # Seconds are kept: the gap after the 9:30 booking runs to 11:00:30
+    assert df_summary.loc["JANO", "IdleTime"] == 75 * 60 + 30
+    assert df_summary.loc["JANO", "OverallEnd"] == pd.Timestamp(2026, 1, 5, 11, 10)
+    assert df_summary.loc["MARA", "IdleTime"] == 0.0
+
+def test_summary_of_empty_schedule_has_the_summary_columns():
+    df_summary = summarize_speaker_schedule(ScheduleResult.from_records([], ["1", "2"], "Generated Schedule"))
+    assert df_summary.empty
+    assert list(df_summary.columns) == SUMMARY_COLUMNS
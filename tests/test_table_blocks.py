@@ -0,0 +1,45 @@
+from parser.core_parsing import parse_table_row
+from parser.table_blocks import TableBlock, build_table_block, detect_table_columns
+
+HEADERLESS_ROWS = [
+    ["00:01:02", "JANO", "Ahoj, ako sa máš?"],
+    ["00:01:05", "MARA", "Dobre."],
+    ["00:01:09", "JANO", "Tak fajn."],
+]
+
+def test_header_row_is_mapped_by_aliases():
+    assert detect_table_columns([["TC", "Postava", "Text"], ["00:01:02", "JANO", "Ahoj"]]) == (
+        {0: "Timecode", 1: "Speaker", 2: "Text"}, True
+    )
+
+def test_headerless_table_is_detected_from_cell_contents():
+    assert detect_table_columns(HEADERLESS_ROWS) == ({0: "Timecode", 1: "Speaker", 2: "Text"}, False)
+
+def test_short_headerless_table_is_not_recognised():
+    assert detect_table_columns(HEADERLESS_ROWS[:2]) is None
+
+def test_unrecognised_table_is_not_a_table_block():
+    assert detect_table_columns([["a", "b"], ["c", "d"]]) is None
+    assert build_table_block([["a", "b"], ["c", "d"]]) is None
+
+def test_table_block_skips_header_row():
+    block = build_table_block([["TC", "Postava", "Text"], ["00:01:02", "JANO, MARA", "Ahoj"]])
+    assert block == TableBlock(
+        rows=[{"Timecode": "00:01:02", "Speaker": "JANO, MARA", "Text": "Ahoj"}],
+        lines=["00:01:02\tJANO, MARA\tAhoj"],
+    )
+
+def test_parse_table_row_splits_speakers_and_moves_parentheses():
+    rows = parse_table_row({"Timecode": "00:01:02", "Speaker": "JANO, MARA (OFF)", "Text": "Ahoj (smiech) tu"}, 3)
+    assert [row["Speaker"] for row in rows] == ["JANO", "MARA"]
+    for row in rows:
+        assert row["Segment"] == "3"
+        assert row["Timecode"] == "00:01:02"
+        assert row["Text"] == "Ahoj tu"
+        assert row["Scene Marker"] == "(OFF) (smiech)"
+
+def test_parse_table_row_keeps_scene_heading_as_marker():
+    rows = parse_table_row({"Timecode": "", "Speaker": "", "Text": "INT. KUCHYŇA"}, 1)
+    assert len(rows) == 1
+    assert rows[0]["Scene Marker"] == "INT. KUCHYŇA"
+    assert rows[0]["Speaker"] == "" and rows[0]["Text"] == ""
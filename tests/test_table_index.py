@@ -0,0 +1,66 @@
+import random
+
+import numpy as np
+import pandas as pd
+
+from analyzer.table_index import ScriptTableIndex, page_rows
+
+SPEAKERS = ["JANO", "MARA", "FERO", "ZUZANA"]
+
+def _random_script(rng: random.Random, in_order: bool) -> pd.DataFrame:
+    num_rows = rng.randint(0, 80)
+    segments = sorted(rng.randint(1, 20) for _ in range(num_rows))
+    if not in_order:
+        rng.shuffle(segments)
+    return pd.DataFrame({
+        "Segment": [str(segment) if rng.random() > 0.05 else "" for segment in segments],
+        "Speaker": [rng.choice(SPEAKERS + [""]) for _ in range(num_rows)],
+        "Scene Marker": [f"SCÉNA {row}" if rng.random() < 0.1 else "" for row in range(num_rows)],
+    })
+
+def _query_by_scan(df: pd.DataFrame, speakers, segment_range, scene_idx) -> np.ndarray:
+    """The same filters as a boolean mask over every row."""
+    mask = np.ones(len(df), dtype=bool)
+    if speakers:
+        mask &= df["Speaker"].isin(speakers).to_numpy()
+    if segment_range is not None:
+        segments = pd.to_numeric(df["Segment"], errors="coerce")
+        mask &= segments.between(*segment_range).to_numpy()
+    if scene_idx is not None:
+        scene_starts = np.flatnonzero(df["Scene Marker"].to_numpy() != "")
+        scene_stop = scene_starts[scene_idx + 1] if scene_idx + 1 < len(scene_starts) else len(df)
+        mask &= (np.arange(len(df)) >= scene_starts[scene_idx]) & (np.arange(len(df)) < scene_stop)
+    return np.flatnonzero(mask)
+
+def test_query_matches_a_scan_of_every_row():
+    for seed in range(40):
+        rng = random.Random(seed)
+        df = _random_script(rng, in_order=seed % 4 != 0)
+        index = ScriptTableIndex(df)
+        assert index.speakers == sorted(set(df["Speaker"]) - {""})
+        for _ in range(20):
+            speakers = rng.sample(SPEAKERS + ["NIKTO"], rng.randint(0, 2)) or None
+            first_segment = rng.randint(0, 21)
+            segment_range = rng.choice([None, (first_segment, first_segment + rng.randint(0, 5))])
+            scene_idx = rng.choice([None, rng.randrange(len(index.scene_starts))]) if len(index.scene_starts) else None
+            rows = index.query(speakers, segment_range, scene_idx)
+            np.testing.assert_array_equal(rows, _query_by_scan(df, speakers, segment_range, scene_idx), err_msg=str((seed, speakers, segment_range, scene_idx)))
+
+def test_segment_bounds_and_scene_labels():
+    df = pd.DataFrame({
+        "Segment": ["", "3", "3", "4", "7"],
+        "Speaker": ["", "JANO", "MARA", "JANO", "MARA"],
+        "Scene Marker": ["INT. ŠTÚDIO", "", "", "EXT. ULICA", ""],
+    })
+    index = ScriptTableIndex(df)
+    assert index.segment_bounds == (3, 7)
+    assert index.scene_labels == ["1: INT. ŠTÚDIO", "4: EXT. ULICA"]
+    assert ScriptTableIndex(df.iloc[:0]).segment_bounds == (0, 0)
+
+def test_page_rows():
+    row_ids = np.arange(0, 230, 10)
+    assert page_rows(row_ids, 1, 10).tolist() == list(range(0, 100, 10))
+    assert page_rows(row_ids, 3, 10).tolist() == [200, 210, 220]
+    assert page_rows(row_ids, 4, 10).tolist() == []
+    # The pages put together give back every row once
+    np.testing.assert_array_equal(np.concatenate([page_rows(row_ids, page, 7) for page in range(1, 5)]), row_ids)
@@ -0,0 +1,74 @@
+import random
+
+import pandas as pd
+
+from analyzer.text_index import HIT_COLUMNS, TextIndex, normalize_text, search_episodes, tokenize
+
+def _script(texts: list[str], speakers: list[str] | None = None, segments: list[str] | None = None) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Segment": segments or ["1"] * len(texts),
+        "Speaker": speakers or ["JANO"] * len(texts),
+        "Timecode": [""] * len(texts),
+        "Text": texts,
+    })
+
+def test_normalize_text_strips_diacritics_and_case():
+    assert normalize_text("Žena ŠTÚDIO Ďakujem") == "zena studio dakujem"
+    assert tokenize("Čo? Ďalší-krát, 3 razy!") == ["co", "dalsi", "krat", "3", "razy"]
+
+def test_search_ignores_diacritics_and_case():
+    index = TextIndex(_script(["Žena prišla domov.", "ZENA odišla.", "Muž ostal."]))
+    assert index.search("žena")["Row"].tolist() == [0, 1]
+    assert index.search("ZENA")["Row"].tolist() == [0, 1]
+    assert index.search("Muz")["Text"].tolist() == ["Muž ostal."]
+    assert index.search("pes").empty and list(index.search("pes").columns) == HIT_COLUMNS
+
+def test_prefix_and_phrase_queries():
+    index = TextIndex(_script([
+        "Dobrý deň, pán doktor.", # 0
+        "Doktorka príde neskôr.", # 1
+        "Deň dobrý nebol.", # 2
+        "Dobre, doktor, dobre.", # 3
+        "Dobrodružstvo začína.", # 4
+    ]))
+    assert index.search("dok*")["Row"].tolist() == [0, 1, 3]
+    assert index.search("dobr*")["Row"].tolist() == [0, 2, 3, 4]
+    assert index.search('"dobry den"')["Row"].tolist() == [0]
+    assert index.search('"dobr* doktor"')["Row"].tolist() == [3]
+    # Clauses must all match the same row
+    assert index.search('dobr* "pan doktor"')["Row"].tolist() == [0]
+    assert index.search("dobrodr* doktor").empty
+    assert index.search("* ,").empty
+
+def test_prefix_search_matches_a_scan_of_every_row():
+    rng = random.Random(7)
+    words = ["rád", "rada", "radosť", "ráno", "rana", "šťastie", "štart", "stará", "strom", "zo"]
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randint(0, 6))) for _ in range(200)]
+    index = TextIndex(_script(texts))
+    for prefix in ["ra", "rad", "ran", "st", "št", "sta", "z", "x"]:
+        expected = [row for row, text in enumerate(texts) if any(token.startswith(normalize_text(prefix)) for token in tokenize(text))]
+        assert index.search(prefix + "*")["Row"].tolist() == expected, prefix
+
+def test_search_filters_and_timecodes():
+    df = _script(
+        ["Ahoj svet.", "Ahoj znova.", "Ahoj ešte raz.", "Ahoj naposledy."],
+        speakers=["JANO", "MARA", "JANO", "MARA"],
+        segments=["1", "2", "5", "x"],
+    )
+    df["Timecode"] = ["00:00:01", "", "00:01:00", ""]
+    df["TimeInSeconds"] = [1.0, None, 60.0, None]
+    index = TextIndex(df, "E01")
+    assert index.search("ahoj", speakers=["MARA"])["Row"].tolist() == [1, 3]
+    assert index.search("ahoj", segment_range=(2, 5))["Row"].tolist() == [1, 2]
+    # Lines without a timecode inherit the one above them
+    assert index.search("ahoj")["TimecodeMs"].tolist() == [1000, 1000, 60000, 60000]
+
+def test_search_episodes_concatenates_in_episode_order():
+    indexes = [
+        TextIndex(_script(["Dobrý deň."]), "E01"),
+        TextIndex(_script(["Nič."]), "E02"),
+        TextIndex(_script(["Deň druhý.", "Dobrú noc."]), "E03"),
+    ]
+    hits = search_episodes(indexes, "den")
+    assert hits[["Episode", "Row"]].values.tolist() == [["E01", 0], ["E03", 0]]
+    assert list(search_episodes(indexes, "pes").columns) == HIT_COLUMNS
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from analyzer.scheduler.result import DEFAULT_ROOM
+from analyzer.scheduler.validation import (
+    DROPPED_SEGMENT,
+    DUPLICATE_SEGMENT,
+    INVALID_BOOKING,
+    OUTSIDE_AVAILABILITY,
+    OUTSIDE_RECORDING_SLOTS,
+    ROOM_OVERLAP,
+    SPEAKER_DOUBLE_BOOKING,
+    UNKNOWN_SEGMENT,
+    VIOLATION_COLUMNS,
+    validate_schedule,
+)
+
+RECORDING_SLOTS = ["2026-01-05 09:00-17:00"]
+AVAILABILITY = {"A": ["2026-01-05 09:00-17:00"], "B": ["2026-01-05 09:00-17:00"]}
+
+def _script(*segments: tuple[str, list[str]]) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"Segment": segment_id, "Speaker": speaker, "SegmentDuration": 600.0}
+        for segment_id, speakers in segments
+        for speaker in speakers
+    ])
+
+def _bookings(*bookings: tuple) -> pd.DataFrame:
+    """Bookings as (segment_id, speakers, start, end[, room]) with ISO times."""
+    return pd.DataFrame([
+        {
+            "segment_id": booking[0],
+            "room": booking[4] if len(booking) > 4 else DEFAULT_ROOM,
+            "start": datetime.fromisoformat(booking[2]) if booking[2] else None,
+            "end": datetime.fromisoformat(booking[3]) if booking[3] else None,
+            "duration": 600.0,
+            "speakers": booking[1],
+        }
+        for booking in bookings
+    ])
+
+def _kinds(violations: pd.DataFrame) -> list[str]:
+    return violations["kind"].tolist()
+
+def test_valid_schedule_has_no_violations():
+    violations = validate_schedule(
+        _bookings(("1", ["A"], "2026-01-05 09:00", "2026-01-05 09:10"), ("2", ["A", "B"], "2026-01-05 09:10", "2026-01-05 09:20")),
+        _script(("1", ["A"]), ("2", ["A", "B"])),
+        AVAILABILITY,
+        RECORDING_SLOTS,
+    )
+    assert violations.empty
+    assert list(violations.columns) == VIOLATION_COLUMNS
+
+@pytest.mark.parametrize("bookings, segments, expected", [
+    (
+        [("1", ["A"], "2026-01-05 09:10", "2026-01-05 09:00")],
+        [("1", ["A"])],
+        [INVALID_BOOKING],
+    ),
+    (
+        [("1", ["A"], "2026-01-05 09:00", "2026-01-05 09:10", "S1"), ("2", ["A"], "2026-01-05 09:05", "2026-01-05 09:15", "S2")],
+        [("1", ["A"]), ("2", ["A"])],
+        [SPEAKER_DOUBLE_BOOKING],
+    ),
+    (
+        [("1", ["A"], "2026-01-05 09:00", "2026-01-05 09:10"), ("2", ["B"], "2026-01-05 09:05", "2026-01-05 09:15")],
+        [("1", ["A"]), ("2", ["B"])],
+        [ROOM_OVERLAP],
+    ),
+    (
+        [("1", ["C"], "2026-01-05 16:55", "2026-01-05 17:05")],
+        [("1", ["C"])],
+        [OUTSIDE_RECORDING_SLOTS, OUTSIDE_AVAILABILITY],
+    ),
+    (
+        [("1", ["A"], "2026-01-05 09:00", "2026-01-05 09:10")],
+        [("1", ["A"]), ("2", ["B"])],
+        [DROPPED_SEGMENT],
+    ),
+    (
+        [("1", ["A"], "2026-01-05 09:00", "2026-01-05 09:10"), ("1", ["A"], "2026-01-05 10:00", "2026-01-05 10:10")],
+        [("1", ["A"])],
+        [DUPLICATE_SEGMENT],
+    ),
+    (
+        [("1", ["A"], "2026-01-05 09:00", "2026-01-05 09:10"), ("9", ["B"], "2026-01-05 10:00", "2026-01-05 10:10")],
+        [("1", ["A"])],
+        [UNKNOWN_SEGMENT],
+    ),
+])
+def test_violation_kinds(bookings, segments, expected):
+    violations = validate_schedule(_bookings(*bookings), _script(*segments), AVAILABILITY, RECORDING_SLOTS)
+    assert _kinds(violations) == expected
+
+def test_booking_partly_outside_availability_is_reported():
+    violations = validate_schedule(
+        _bookings(("1", ["A", "B"], "2026-01-05 09:00", "2026-01-05 09:10")),
+        _script(("1", ["A", "B"])),
+        {"A": ["2026-01-05 09:00-17:00"], "B": ["2026-01-05 09:05-17:00"]},
+        RECORDING_SLOTS,
+    )
+    assert _kinds(violations) == [OUTSIDE_AVAILABILITY]
+    assert violations["speaker"].tolist() == ["B"]
@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+_log = logging.getLogger(__name__)
+
+def content_hash(data: bytes) -> str:
+    """Cache key of an uploaded file: the SHA-256 of its contents."""
+    return hashlib.sha256(data).hexdigest()
+
+def estimate_size(value, _seen: set[int] | None = None) -> int:
+    """Approximate memory footprint in bytes of DataFrames, arrays, containers and plain objects."""
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        size = value.nbytes
+        if value.dtype == object:
+            size += sum(estimate_size(item, seen) for item in value.ravel())
+        return size
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), seen)
+    return size
+
+class ArtifactCache:
+    """
+    Process-wide LRU cache of immutable script artifacts shared read-only by all sessions.
+    Entries are evicted least recently used first once their estimated size exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # key -> (value, size in bytes)
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Returns the cached value (which must not be modified) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: str, value, size: int | None = None) -> None:
+        """Stores a value, evicting least recently used entries to stay under max_bytes."""
+        size = size if size is not None else estimate_size(value)
+        if size > self.max_bytes:
+            _log.warning(f"Artifact {key[:12]} ({size / 2**20:.1f} MB) exceeds the cache ceiling, not cached.")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self._evictions += 1
+                _log.info(f"Evicted artifact {evicted_key[:12]} ({evicted_size / 2**20:.1f} MB) from the cache.")
+        _log.info(f"Cached artifact {key[:12]} ({size / 2**20:.1f} MB).")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+_artifact_cache = None
+_artifact_cache_lock = threading.Lock()
+
+def get_artifact_cache(max_bytes: int) -> ArtifactCache:
+    """Returns the process-wide artifact cache, creating it on first use."""
+    global _artifact_cache
+    with _artifact_cache_lock:
+        if _artifact_cache is None:
+            _artifact_cache = ArtifactCache(max_bytes)
+        return _artifact_cache
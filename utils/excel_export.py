@@ -1,25 +1,90 @@
 import pandas as pd
+import numpy as np
 from io import BytesIO
 import logging
+import xlsxwriter
+
+from utils.metrics import timed_stage
 
 _log = logging.getLogger(__name__)
 
-# --- Helper Function for Excel Export ---
-def to_excel(df: pd.DataFrame) -> bytes:
-    """Converts a Pandas DataFrame to an Excel file in memory, ensuring index is the first column named 'Rečník'."""
+# Excel limits sheet names to 31 characters and sheets to 16384 columns
+MAX_SHEET_NAME_LENGTH = 31
+MAX_SHEET_COLUMNS = 16384
+
+def _write_sheet(workbook: xlsxwriter.Workbook, sheet_name: str, df: pd.DataFrame, datetime_format) -> None:
+    """Writes one DataFrame row by row, as required by the constant-memory writer mode."""
+    worksheet = workbook.add_worksheet(sheet_name[:MAX_SHEET_NAME_LENGTH])
+    worksheet.write_row(0, 0, [str(column) for column in df.columns])
+
+    datetime_columns = {i for i, dtype in enumerate(df.dtypes) if pd.api.types.is_datetime64_any_dtype(dtype)}
+    columns = []
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if i in datetime_columns:
+            columns.append(list(values.dt.to_pydatetime()))
+        elif values.dtype == object:
+            # Lists (e.g. speakers of a booking) become comma separated text
+            columns.append([", ".join(map(str, value)) if isinstance(value, (list, tuple)) else value for value in values])
+        else:
+            columns.append(values.to_numpy())
+
+    for row_idx, row in enumerate(zip(*columns), start=1):
+        for col_idx, value in enumerate(row):
+            # Missing values and empty strings stay blank cells
+            if value is None or value is pd.NaT or value is pd.NA or (isinstance(value, float) and np.isnan(value)) or (isinstance(value, str) and not value):
+                continue
+            if col_idx in datetime_columns:
+                worksheet.write_datetime(row_idx, col_idx, value, datetime_format)
+            else:
+                worksheet.write(row_idx, col_idx, value.item() if isinstance(value, np.generic) else value)
+
+@timed_stage(
+    "excel_export",
+    input_size=lambda sheets: sum(len(df) for df in sheets.values()),
+    output_counts=lambda workbook_bytes: {"bytes": len(workbook_bytes)}
+)
+def to_excel_workbook(sheets: dict[str, pd.DataFrame]) -> bytes:
+    """
+    Writes several DataFrames as separate sheets of one workbook using xlsxwriter's
+    constant-memory mode, which flushes every row as soon as the next one starts.
+
+    Args:
+        sheets: Sheet name -> DataFrame, written in the given order. The index is not written.
+
+    Returns:
+        The .xlsx file contents.
+    """
     output = BytesIO()
-    df_reset = df.reset_index()
-    if not df_reset.empty:
-        original_first_col_name = df_reset.columns[0]
-        df_reset = df_reset.rename(columns={original_first_col_name: 'Rečník'})
-        _log.info(f"Excel Export: Renamed first column '{original_first_col_name}' to 'Rečník'.")
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+    for sheet_name, df in sheets.items():
+        _write_sheet(workbook, sheet_name, df, datetime_format)
+        _log.info(f"Excel Export: Wrote sheet '{sheet_name}' with {len(df)} rows.")
+    workbook.close()
+    return output.getvalue()
+
+def build_workbook_sheets(
+    df_processed: pd.DataFrame,
+    speaker_matrix: pd.DataFrame,
+    segment_table: pd.DataFrame,
+    calendar_df: pd.DataFrame | None = None,
+    schedule_bookings: pd.DataFrame | None = None
+) -> dict[str, pd.DataFrame]:
+    """Assembles the sheets of the full export workbook, with the index written as the first column."""
+    if speaker_matrix.shape[1] + 1 > MAX_SHEET_COLUMNS:
+        _log.warning("Excel Export: Speaker-segment matrix is too wide for one sheet, writing it as segment x speaker.")
+        matrix_sheet = speaker_matrix.T.rename_axis('Segment').reset_index()
     else:
-        _log.warning("Excel Export: DataFrame is empty, cannot rename index column.")
-        if df.index.name:
-             df_reset[df.index.name] = []
-             df_reset = df_reset.rename(columns={df.index.name: 'Rečník'})
-
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df_reset.to_excel(writer, index=False, sheet_name='Matica_Rečník_Segment')
-    processed_data = output.getvalue()
-    return processed_data
+        matrix_sheet = speaker_matrix.rename_axis('Rečník').reset_index()
+
+    sheets = {
+        'Scenár': df_processed,
+        'Matica_Rečník_Segment': matrix_sheet,
+        'Segmenty': segment_table,
+    }
+    if calendar_df is not None:
+        sheets['Kalendár'] = calendar_df.rename_axis('Čas').reset_index()
+    if schedule_bookings is not None:
+        sheets['Plán'] = schedule_bookings
+    return sheets
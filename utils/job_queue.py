@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable
+
+_log = logging.getLogger(__name__)
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds the maximum number of unfinished jobs."""
+
+class Job:
+    """State of one background job, polled by the UI."""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued" # queued -> running -> done | failed | cancelled
+        self.stage = "Čaká v poradí"
+        self.progress = 0.0
+        self.result = None
+        self.partial = None # Latest partial result of a running job, replaced as a whole on every publish
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._holds_conversion_slot = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def report(self, stage: str, progress: float) -> None:
+        """Records the current stage and progress (0-1); raises JobCancelled if cancellation was requested."""
+        self.check_cancelled()
+        self.stage = stage
+        self.progress = max(0.0, min(1.0, progress))
+        _log.debug(f"Job {self.id} ({self.kind}): {stage} {self.progress:.0%}")
+
+    def publish(self, partial: dict) -> None:
+        """Publishes a partial result for pollers; the dictionary must not be modified afterwards."""
+        self.partial = partial
+
+    def check_cancelled(self) -> None:
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled.")
+
+class JobQueue:
+    """
+    Local job subsystem: a thread pool runs jobs off the Streamlit script thread, a
+    semaphore bounds the number of concurrent document conversions, and the number of
+    unfinished jobs is capped so that bursts of uploads are rejected instead of piling up.
+    Jobs that convert a document wait for a conversion slot before they are handed to a
+    worker, so queued uploads never occupy the workers other jobs need.
+    """
+
+    def __init__(self, max_workers: int = 4, max_concurrent_conversions: int = 1, max_pending_jobs: int = 20, max_finished_jobs: int = 200):
+        self.max_pending_jobs = max_pending_jobs
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._conversion_semaphore = threading.BoundedSemaphore(max_concurrent_conversions)
+        self._jobs = {}
+        self._jobs_by_key = {}
+        self._queued = deque() # Jobs waiting for a worker
+        self._conversion_waiters = deque() # (job, func, args, kwargs) of jobs waiting for a conversion slot
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable, *args, dedup_key: str | None = None, conversion: bool = False, **kwargs) -> Job:
+        """
+        Queues func(job, *args, **kwargs) and returns its Job; raises QueueFullError under overload.
+        While a job submitted with the same dedup_key is unfinished, that job is returned instead.
+        A conversion job is handed to a worker only once it holds a conversion slot, which it
+        keeps until it leaves conversion_slot or finishes.
+        """
+        with self._lock:
+            if dedup_key is not None:
+                existing_job = self._jobs.get(self._jobs_by_key.get(dedup_key))
+                if existing_job is not None and not existing_job.finished and not existing_job.cancel_requested:
+                    _log.info(f"Job {existing_job.id} ({kind}) reused for an identical submission.")
+                    return existing_job
+            unfinished_jobs = sum(1 for job in self._jobs.values() if not job.finished)
+            if unfinished_jobs >= self.max_pending_jobs:
+                raise QueueFullError(f"Too many unfinished jobs ({unfinished_jobs}).")
+            job = Job(kind)
+            self._jobs[job.id] = job
+            if dedup_key is not None:
+                self._jobs_by_key[dedup_key] = job.id
+            if conversion:
+                job.stage = "Čaká na voľný konverzný slot"
+                self._conversion_waiters.append((job, func, args, kwargs))
+            else:
+                self._queued.append(job.id)
+            self._prune_finished_jobs()
+        _log.info(f"Job {job.id} ({kind}) submitted.")
+        if conversion:
+            self._dispatch_conversions()
+        else:
+            self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _dispatch_conversions(self) -> None:
+        """Hands waiting conversion jobs to the workers while conversion slots are free."""
+        while True:
+            with self._lock:
+                if not self._conversion_waiters or not self._conversion_semaphore.acquire(blocking=False):
+                    return
+                job, func, args, kwargs = self._conversion_waiters.popleft()
+                job._holds_conversion_slot = True
+                self._queued.append(job.id)
+            self._executor.submit(self._run, job, func, args, kwargs)
+
+    def _release_conversion_slot(self, job: Job) -> None:
+        with self._lock:
+            if not job._holds_conversion_slot:
+                return
+            job._holds_conversion_slot = False
+            self._conversion_semaphore.release()
+        self._dispatch_conversions()
+
+    def _run(self, job: Job, func: Callable, args: tuple, kwargs: dict) -> None:
+        with self._lock:
+            if job.id in self._queued:
+                self._queued.remove(job.id)
+        if job.cancel_requested:
+            self._finish(job, "cancelled")
+            return
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = func(job, *args, **kwargs)
+            self._finish(job, "done")
+        except JobCancelled:
+            self._finish(job, "cancelled")
+        except Exception as e:
+            job.error = str(e)
+            _log.exception(f"Job {job.id} ({job.kind}) failed:")
+            self._finish(job, "failed")
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        job.partial = None
+        if status == "done":
+            job.progress = 1.0
+        _log.info(f"Job {job.id} ({job.kind}) finished with status '{status}'.")
+        # A job that finished without converting (e.g. an artifact cache hit) frees its slot here
+        self._release_conversion_slot(job)
+
+    def _prune_finished_jobs(self) -> None:
+        finished_jobs = [job for job in self._jobs.values() if job.finished]
+        for job in sorted(finished_jobs, key=lambda job: job.finished_at)[:max(0, len(finished_jobs) - self.max_finished_jobs)]:
+            del self._jobs[job.id]
+
+    @contextmanager
+    def conversion_slot(self, job: Job):
+        """Runs the conversion in the slot the job was dispatched with and frees the slot afterwards."""
+        if not job._holds_conversion_slot:
+            raise RuntimeError(f"Job {job.id} ({job.kind}) holds no conversion slot, submit it with conversion=True.")
+        try:
+            yield
+        finally:
+            self._release_conversion_slot(job)
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> None:
+        """Requests cancellation; a job waiting for a conversion slot is cancelled at once, a running one at its next progress report."""
+        job = self.get(job_id)
+        if job and not job.finished:
+            job._cancel_event.set()
+            _log.info(f"Cancellation requested for job {job_id}.")
+            with self._lock:
+                waiting = [waiter for waiter in self._conversion_waiters if waiter[0] is job]
+                for waiter in waiting:
+                    self._conversion_waiters.remove(waiter)
+            if waiting:
+                self._finish(job, "cancelled")
+
+    def queue_position(self, job_id: str) -> int | None:
+        """1-based position among waiting jobs (conversion slot waiters first, then jobs waiting for a worker), None if not waiting."""
+        with self._lock:
+            waiting = [job.id for job, *_ in self._conversion_waiters] + list(self._queued)
+        return waiting.index(job_id) + 1 if job_id in waiting else None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                "queued": len(self._queued),
+                "waiting_for_conversion": len(self._conversion_waiters),
+                "running": statuses.count("running"),
+                "finished": sum(1 for status in statuses if status in ("done", "failed", "cancelled")),
+            }
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue(**queue_options) -> JobQueue:
+    """Returns the process-wide job queue, creating it with queue_options on first use."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(**queue_options)
+        return _job_queue
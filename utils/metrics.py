@@ -0,0 +1,244 @@
+import bisect
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+_log = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+METRIC_HELP = {
+    "analyzer_stage_duration_seconds": "Wall time of a processing stage.",
+    "analyzer_stage_input_size": "Input size of a processing stage (bytes, chunks or rows).",
+    "analyzer_stage_output_items": "Items produced by a processing stage, by kind (rows, segments, ...).",
+    "analyzer_stage_errors_total": "Processing stage calls that raised an exception.",
+}
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        bucket_idx = bisect.bisect_left(self.buckets, value)
+        if bucket_idx < len(self.buckets):
+            self.bucket_counts[bucket_idx] += 1
+        self.count += 1
+        self.sum += value
+
+class MetricsRegistry:
+    """Process-wide store of stage histograms and error counters."""
+
+    def __init__(self):
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], Histogram] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...], **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def render_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for metric_name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# HELP {metric_name} {METRIC_HELP.get(metric_name, '')}")
+                lines.append(f"# TYPE {metric_name} histogram")
+                for (name, labels), histogram in sorted(self._histograms.items()):
+                    if name != metric_name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+            for metric_name in sorted({name for name, _ in self._counters}):
+                lines.append(f"# HELP {metric_name} {METRIC_HELP.get(metric_name, '')}")
+                lines.append(f"# TYPE {metric_name} counter")
+                for (name, labels), value in sorted(self._counters.items()):
+                    if name == metric_name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+REGISTRY = MetricsRegistry()
+
+# Stage timings of the pipeline run in the current context (e.g. one upload job), if collected
+_current_timings: ContextVar[list[dict] | None] = ContextVar("current_stage_timings", default=None)
+# Seconds excluded from the innermost running stage_timer of the current context
+_excluded_seconds: ContextVar[list[float] | None] = ContextVar("excluded_stage_seconds", default=None)
+
+@contextmanager
+def collect_stage_timings():
+    """Collects every stage recorded in this context into the yielded list of {stage, seconds, ...} records."""
+    timings = []
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+def _record_stage(stage: str, seconds: float, input_size: int | None, output_counts: dict[str, int]) -> None:
+    REGISTRY.observe("analyzer_stage_duration_seconds", seconds, DURATION_BUCKETS, stage=stage)
+    if input_size is not None:
+        REGISTRY.observe("analyzer_stage_input_size", input_size, SIZE_BUCKETS, stage=stage)
+    for kind, count in output_counts.items():
+        REGISTRY.observe("analyzer_stage_output_items", count, SIZE_BUCKETS, stage=stage, kind=kind)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.append({"stage": stage, "seconds": seconds, "input_size": input_size, **output_counts})
+
+@contextmanager
+def stage_timer(stage: str, input_size: int | None = None):
+    """
+    Times a block as one stage. The yielded dictionary may be filled with output counts
+    (e.g. counts["rows"] = 120) before the block ends. Time spent in excluded_from_stage
+    blocks is not counted.
+    """
+    output_counts = {}
+    excluded = [0.0]
+    token = _excluded_seconds.set(excluded)
+    start = time.perf_counter()
+    try:
+        yield output_counts
+    except Exception:
+        REGISTRY.increment("analyzer_stage_errors_total", stage=stage)
+        raise
+    finally:
+        seconds = time.perf_counter() - start - excluded[0]
+        _excluded_seconds.reset(token)
+        _record_stage(stage, seconds, input_size, output_counts)
+
+@contextmanager
+def excluded_from_stage():
+    """Leaves the block out of the wall time of the enclosing stage_timer, e.g. for progress previews."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        excluded = _excluded_seconds.get()
+        if excluded is not None:
+            excluded[0] += time.perf_counter() - start
+
+def timed_stage(stage: str, input_size: Callable | None = None, output_counts: Callable | None = None):
+    """
+    Decorator recording the wall time of every call as the given stage.
+
+    Args:
+        stage: Stage label of the metrics.
+        input_size: Optional function of the call arguments returning the input size.
+        output_counts: Optional function of the return value returning {kind: count}.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            size = None
+            if input_size is not None:
+                try:
+                    size = input_size(*args, **kwargs)
+                except Exception as e:
+                    _log.debug(f"Could not measure input size of stage '{stage}': {e}")
+            with stage_timer(stage, size) as counts:
+                result = func(*args, **kwargs)
+                if output_counts is not None and result is not None:
+                    counts.update(output_counts(result))
+            return result
+        return wrapper
+    return decorator
+
+def write_metrics_file(path: Path) -> None:
+    """Writes the current metrics atomically, e.g. for the node exporter textfile collector."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(REGISTRY.render_prometheus(), encoding="utf-8")
+    tmp_path.replace(path)
+
+_metrics_file_writer = None
+_metrics_file_writer_lock = threading.Lock()
+
+def _write_metrics_file_periodically(path: Path, interval_seconds: float) -> None:
+    while True:
+        try:
+            write_metrics_file(path)
+        except OSError as e:
+            _log.error(f"Could not write metrics file {path}: {e}")
+        time.sleep(interval_seconds)
+
+def start_metrics_file_writer(path: Path, interval_seconds: float = 15.0) -> None:
+    """
+    Rewrites the metrics file every interval_seconds from a daemon thread, so stages of background
+    jobs reach it without a page rerun; later calls are no-ops.
+    """
+    global _metrics_file_writer
+    with _metrics_file_writer_lock:
+        if _metrics_file_writer is not None:
+            return
+        _metrics_file_writer = threading.Thread(
+            target=_write_metrics_file_periodically, args=(path, interval_seconds), name="metrics-file-writer", daemon=True
+        )
+        _metrics_file_writer.start()
+        _log.info(f"Writing metrics to {path} every {interval_seconds:g} s")
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        _log.debug(f"Metrics endpoint: {format % args}")
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> None:
+    """Serves /metrics on a local port from a daemon thread; later calls are no-ops."""
+    global _metrics_server
+    with _metrics_server_lock:
+        if _metrics_server is not None:
+            return
+        try:
+            _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            _log.error(f"Could not start metrics endpoint on {host}:{port}: {e}")
+            return
+        threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+        _log.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
@@ -0,0 +1,109 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+_log = logging.getLogger(__name__)
+
+TOP_ALLOCATIONS_PER_STAGE = 25
+TOP_FUNCTIONS = 60
+
+class ProfileCapture:
+    """
+    Runs a block of work under cProfile and tracemalloc and snapshots memory at each stage.
+
+    cProfile only sees the thread that calls start(). tracemalloc is process-wide, so
+    allocations of other work running at the same time show up in the snapshots too.
+    """
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+        self._owns_tracemalloc = False
+        self._previous_snapshot = None
+        self._stage_started_at = None
+        self.stage_allocations: list[dict] = []
+
+    def start(self) -> None:
+        if tracemalloc.is_tracing():
+            _log.warning("tracemalloc is already running, stage allocations are shared with its owner.")
+        else:
+            tracemalloc.start(10)
+            self._owns_tracemalloc = True
+        self._previous_snapshot = tracemalloc.take_snapshot()
+        self._stage_started_at = time.perf_counter()
+        self._profiler.enable()
+
+    def snapshot(self, stage: str) -> None:
+        """Records the allocations made since the previous snapshot as the given stage."""
+        self._profiler.disable()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        top_stats = snapshot.compare_to(self._previous_snapshot, "lineno")[:TOP_ALLOCATIONS_PER_STAGE]
+        self.stage_allocations.append({
+            "stage": stage,
+            "seconds": time.perf_counter() - self._stage_started_at,
+            "traced_bytes": current_bytes,
+            "peak_traced_bytes": peak_bytes,
+            "top_allocations": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in top_stats
+            ],
+        })
+        self._previous_snapshot = snapshot
+        self._stage_started_at = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self) -> None:
+        self._profiler.disable()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def _format_allocations(self) -> str:
+        lines = []
+        for stage in self.stage_allocations:
+            lines.append(
+                f"== {stage['stage']}: {stage['seconds']:.3f} s, traced {stage['traced_bytes'] / 2**20:.1f} MB, "
+                f"peak {stage['peak_traced_bytes'] / 2**20:.1f} MB"
+            )
+            for allocation in stage["top_allocations"]:
+                lines.append(f"  {allocation['size_diff_bytes'] / 1024:+10.1f} KiB  {allocation['count_diff']:+8d} blocks  {allocation['location']}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def build_bundle(self, extra_files: dict[str, object] | None = None) -> bytes:
+        """
+        Packs the capture into a zip: profile.pstats (load with pstats.Stats), profile_summary.txt,
+        allocations.txt / allocations.json and every extra file (dicts and lists are written as JSON).
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pstats_path = Path(tmp_dir) / "profile.pstats"
+            self._profiler.dump_stats(pstats_path)
+            pstats_bytes = pstats_path.read_bytes()
+
+        summary = io.StringIO()
+        pstats.Stats(self._profiler, stream=summary).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr("profile.pstats", pstats_bytes)
+            bundle.writestr("profile_summary.txt", summary.getvalue())
+            bundle.writestr("allocations.txt", self._format_allocations())
+            bundle.writestr("allocations.json", json.dumps(self.stage_allocations, indent=2))
+            for file_name, content in (extra_files or {}).items():
+                bundle.writestr(file_name, content if isinstance(content, (str, bytes)) else json.dumps(content, indent=2, ensure_ascii=False, default=str))
+        return output.getvalue()
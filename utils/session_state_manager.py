@@ -18,6 +18,15 @@ def initialize_session_state():
     if "speaker_availability_slots" not in st.session_state:
         st.session_state.speaker_availability_slots = {}
     
+    if "availability_grid_extra_days" not in st.session_state:
+        st.session_state.availability_grid_extra_days = []
+
+    if "availability_grid_version" not in st.session_state:
+        st.session_state.availability_grid_version = 0
+
+    if "availability_rules" not in st.session_state:
+        st.session_state.availability_rules = []
+
     if "recording_slots" not in st.session_state:
         st.session_state.recording_slots = []
         for i in range(6): # For today and next 5 days (total 6 days)
@@ -26,3 +35,42 @@ def initialize_session_state():
 
     if "show_apply_button" not in st.session_state:
         st.session_state.show_apply_button = False
+
+    if "last_schedule" not in st.session_state:
+        st.session_state.last_schedule = None
+
+    if "last_schedule_inputs" not in st.session_state:
+        st.session_state.last_schedule_inputs = None
+
+    if "upload_job" not in st.session_state:
+        st.session_state.upload_job = None
+
+    if "upload_result" not in st.session_state:
+        st.session_state.upload_result = None
+
+    if "season_text_indexes" not in st.session_state:
+        st.session_state.season_text_indexes = {}
+
+    if "profile_next_upload" not in st.session_state:
+        st.session_state.profile_next_upload = False
+
+    if "profile_bundle" not in st.session_state:
+        st.session_state.profile_bundle = None
+
+    if "schedule_job" not in st.session_state:
+        st.session_state.schedule_job = None
+
+    if "schedule_editor_base" not in st.session_state:
+        st.session_state.schedule_editor_base = None
+
+    if "schedule_editor_version" not in st.session_state:
+        st.session_state.schedule_editor_version = 0
+
+    if "feasibility_matrix" not in st.session_state:
+        st.session_state.feasibility_matrix = None
+
+    if "scenario_job" not in st.session_state:
+        st.session_state.scenario_job = None
+
+    if "scenario_results" not in st.session_state:
+        st.session_state.scenario_results = None